@@ -0,0 +1,57 @@
+"""Runs the benchmark suite.
+
+Usage, from the repository root:
+    python -m benchmarks [--sizes 1000,10000] [--filter NAME] [--memory]
+                         [--save PATH] [--compare PATH]
+"""
+import argparse
+import sys
+
+from . import bench_aio, bench_fieldtools, bench_jobtools  # noqa
+from . import bench_ruletools  # noqa
+from . import bench_sources, bench_streams, bench_streamtools  # noqa
+from .harness import DEFAULT_SIZES, compare, load, run_benchmarks, save
+
+
+def _sizes(value):
+    return tuple(int(float(s)) for s in value.split(','))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--sizes', type=_sizes, default=DEFAULT_SIZES,
+                        help="comma-separated record counts, e.g. 1e3,1e7")
+    parser.add_argument('--filter', default=None,
+                        help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of timed runs, the best one is kept")
+    parser.add_argument('--memory', action='store_true',
+                        help="also measure the peak memory with tracemalloc")
+    parser.add_argument('--save', metavar='PATH',
+                        help="save the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="compare the results with a JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="throughput drop flagged as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.filter, args.repeat,
+                             args.memory)
+    if args.save:
+        save(results, args.save)
+
+    if args.compare:
+        print(f"\nCompared with {args.compare}:")
+        regressions = compare(results, load(args.compare), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond "
+                  f"{args.tolerance:.0%}:")
+            for name, size in regressions:
+                print(f"  {name} ({size:,d} records)")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
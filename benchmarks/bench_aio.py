@@ -0,0 +1,36 @@
+import asyncio
+
+from src.pyetllib.etllib.aio import acollect, amap, apipeline, to_async, \
+    to_sync
+
+from .harness import benchmark, consume, records
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _fetch(record):
+    await asyncio.sleep(0)  # stands for an I/O wait
+    return record
+
+
+@benchmark('to_async_to_sync')
+def bench_adapters(n):
+    return lambda: consume(to_sync(to_async(records(n))))
+
+
+@benchmark('amap')
+def bench_amap(n):
+    chain = apipeline(amap(_fetch, concurrency=64))
+    return lambda: _run(acollect(chain(records(n))))
+
+
+@benchmark('amap_unordered')
+def bench_amap_unordered(n):
+    chain = apipeline(amap(_fetch, concurrency=64, ordered=False))
+    return lambda: _run(acollect(chain(records(n))))
@@ -0,0 +1,109 @@
+import functools
+
+from src.pyetllib.etllib import (
+    fextract,
+    flookup,
+    fmap,
+    fremove,
+    frename,
+    freverse_lookup,
+    fsplit,
+    cextract,
+    clookup,
+    cmap,
+    cremove,
+    crename,
+    columns_to_stream,
+    stream_to_columns,
+    ReverseLookupIndex,
+)
+
+from .harness import benchmark, consume, records
+
+
+KEYS = ('id', 'name')
+RENAMING = {'id': 'identifier', 'name': 'label'}
+FUNCS = (str, str.upper)
+NAMES = {'foo': 'FOO', 'bar': 'BAR', 'spam': 'SPAM'}
+FAMILIES = {
+    f'family {i}': tuple(range(i * 100, (i + 1) * 100)) for i in range(200)
+}
+
+
+def _per_record(func):
+    def factory(n):
+        def run():
+            consume(map(func, records(n)))
+        return run
+    return factory
+
+
+def _per_batch(func, batch_size=10000):
+    def factory(n):
+        batches = list(stream_to_columns(records(n), batch_size=batch_size))
+
+        def run():
+            consume(map(func, batches))
+        return run
+    return factory
+
+
+bench_fextract = benchmark('fextract')(
+    _per_record(functools.partial(fextract, KEYS))
+)
+bench_fremove = benchmark('fremove')(
+    _per_record(functools.partial(fremove, KEYS))
+)
+bench_frename = benchmark('frename')(
+    _per_record(functools.partial(frename, RENAMING))
+)
+bench_fmap = benchmark('fmap')(
+    _per_record(functools.partial(fmap, KEYS, FUNCS))
+)
+bench_flookup = benchmark('flookup')(
+    _per_record(functools.partial(flookup, NAMES, ('name', )))
+)
+bench_fsplit = benchmark('fsplit')(
+    _per_record(functools.partial(fsplit, KEYS))
+)
+bench_freverse_lookup = benchmark('freverse_lookup', max_size=10000)(
+    _per_record(functools.partial(freverse_lookup, FAMILIES, ('id', )))
+)
+bench_freverse_lookup_index = benchmark('freverse_lookup_index')(
+    _per_record(
+        functools.partial(freverse_lookup, ReverseLookupIndex(FAMILIES),
+                          ('id', ))
+    )
+)
+
+bench_cextract = benchmark('cextract', max_size=1000000)(
+    _per_batch(functools.partial(cextract, KEYS))
+)
+bench_cremove = benchmark('cremove', max_size=1000000)(
+    _per_batch(functools.partial(cremove, KEYS))
+)
+bench_crename = benchmark('crename', max_size=1000000)(
+    _per_batch(functools.partial(crename, RENAMING))
+)
+bench_cmap = benchmark('cmap', max_size=1000000)(
+    _per_batch(functools.partial(cmap, KEYS, FUNCS))
+)
+bench_clookup = benchmark('clookup', max_size=1000000)(
+    _per_batch(functools.partial(clookup, NAMES, ('name', )))
+)
+
+
+@benchmark('stream_to_columns')
+def bench_stream_to_columns(n):
+    def run():
+        consume(stream_to_columns(records(n)))
+    return run
+
+
+@benchmark('columns_to_stream', max_size=1000000)
+def bench_columns_to_stream(n):
+    batches = list(stream_to_columns(records(n)))
+
+    def run():
+        consume(columns_to_stream(batches))
+    return run
@@ -0,0 +1,91 @@
+import copy
+import inspect
+import io
+import logging
+import os
+
+from src.pyetllib.jobtools import Job, JobReport
+from src.pyetllib.jobtools.report import COLORS, ColoredFormatter
+
+from .harness import benchmark
+
+
+def _legacy_info(msg):
+    """Class-level logging as it was before the current job was held in
+    a context variable"""
+    name = inspect.stack()[1].function
+    Job._report_helper(name, logging.INFO, msg)
+
+
+def job_class_info(n):
+    for _ in range(n):
+        Job.info('progress')
+
+
+def job_instance_info(n, job):
+    for _ in range(n):
+        job.info('progress')
+
+
+def job_legacy_info(n):
+    for _ in range(n):
+        _legacy_info('progress')
+
+
+def _run_job(func, use_job=False, queued=False):
+    job = Job(func.__name__, func=func, use_job=use_job, color_output=False,
+              queued=queued)
+
+    def bench(n):
+        def run():
+            with io.open(os.devnull, mode='w') as stream:
+                job.run(n, stream=stream)
+        return run
+    return bench
+
+
+benchmark('job_class_info')(_run_job(job_class_info))
+benchmark('job_instance_info')(_run_job(job_instance_info, use_job=True))
+benchmark('job_queued_info')(_run_job(job_class_info, queued=True))
+benchmark('job_legacy_info', max_size=10000)(_run_job(job_legacy_info))
+
+
+class _LegacyColoredFormatter(ColoredFormatter):
+    """Colored formatting as it was before the records were formatted
+    without a deep copy"""
+    def formatMessage(self, record):
+        return logging.Formatter.formatMessage(self, record)
+
+    def format(self, record):
+        levelno = record.levelno
+        if self.color_output and levelno in COLORS:
+            color = COLORS[levelno]
+
+            color_record = copy.deepcopy(record)
+            color_record.levelname = self.set_str_color(record.levelname,
+                                                        color, bright=True)
+            color_record.msg = self.set_str_color(record.msg, color)
+        else:
+            color_record = record
+        return logging.Formatter.format(self, color_record)
+
+
+def _format_records(formatter_class):
+    formatter = formatter_class(JobReport.COLOR_FORMAT)
+
+    def bench(n):
+        records = [logging.LogRecord('progress', logging.INFO, __file__, 0,
+                                     'batch %d: %d records', (i, 1000), None)
+                   for i in range(n)]
+
+        def run():
+            for record in records:
+                formatter.format(record)
+        return run
+    return bench
+
+
+benchmark('colored_formatter')(_format_records(ColoredFormatter))
+benchmark('colored_formatter_legacy')(
+    _format_records(_LegacyColoredFormatter)
+)
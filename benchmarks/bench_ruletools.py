@@ -0,0 +1,35 @@
+from src.pyetllib.etllib import mapping_rule, set_field
+from src.pyetllib.etllib import default_if_none, default_if_equal
+
+from .harness import benchmark, consume, records
+
+
+@set_field('')
+def _concat(_, items):
+    return '-'.join(str(v) for k, v in items if k in ('id', 'category'))
+
+
+RULES = (
+    mapping_rule('name', str.upper),
+    mapping_rule('code', default_if_none('N/A')),
+    mapping_rule('category', default_if_equal(0, -1)),
+    mapping_rule('label', _concat),
+)
+
+
+@benchmark('mapping_rule.apply')
+def bench_apply(n):
+    func = mapping_rule.get_apply_func(RULES)
+
+    def run():
+        consume(map(func, records(n)))
+    return run
+
+
+@benchmark('mapping_rule.compile')
+def bench_compile(n):
+    func = mapping_rule.compile(RULES)
+
+    def run():
+        consume(map(func, records(n)))
+    return run
@@ -0,0 +1,73 @@
+import atexit
+import csv
+import os
+import shutil
+import tempfile
+
+from src.pyetllib.etllib.sources import read_csv, read_lines, \
+    read_partitioned
+
+from .harness import benchmark, consume, records
+
+
+_tmpdir = None
+
+
+def _csv_file(n):
+    """Writes `n` records to a CSV file once per size"""
+    global _tmpdir
+    if _tmpdir is None:
+        _tmpdir = tempfile.mkdtemp(prefix='bench_sources_')
+        atexit.register(shutil.rmtree, _tmpdir, True)
+    path = os.path.join(_tmpdir, f'{n}.csv')
+    if not os.path.exists(path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerows(r.values() for r in records(n))
+    return path
+
+
+@benchmark('open_lines')
+def bench_open_lines(n):
+    path = _csv_file(n)
+
+    def run():
+        with open(path) as f:
+            consume(line.rstrip('\n') for line in f)
+    return run
+
+
+@benchmark('read_lines')
+def bench_read_lines(n):
+    path = _csv_file(n)
+    return lambda: consume(read_lines(path))
+
+
+@benchmark('read_lines_memoryview')
+def bench_read_lines_memoryview(n):
+    path = _csv_file(n)
+    return lambda: consume(read_lines(path, as_memoryview=True))
+
+
+@benchmark('open_csv_reader')
+def bench_open_csv_reader(n):
+    path = _csv_file(n)
+
+    def run():
+        with open(path, newline='') as f:
+            consume(csv.reader(f))
+    return run
+
+
+@benchmark('read_csv')
+def bench_read_csv(n):
+    path = _csv_file(n)
+    return lambda: consume(read_csv(path))
+
+
+@benchmark('read_partitioned_csv')
+def bench_read_partitioned_csv(n):
+    path = _csv_file(n)
+    return lambda: consume(
+        read_partitioned(path, reader=read_csv, workers=4, partitions=8)
+    )
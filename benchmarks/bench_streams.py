@@ -0,0 +1,42 @@
+import io
+import os
+
+from src.pyetllib.etllib import publish_to_stream
+
+from .harness import benchmark, records
+
+
+def _publish(n, **ctx):
+    def run():
+        with io.open(os.devnull, mode='w') as stream:
+            publish_to_stream(records(n), stream=stream, **ctx)
+    return run
+
+
+@benchmark('publish_to_stream_per_record')
+def bench_publish_per_record(n):
+    return _publish(n, record_converter=str, batch_size=1)
+
+
+@benchmark('publish_to_stream')
+def bench_publish(n):
+    return _publish(n, record_converter=str)
+
+
+@benchmark('publish_to_stream_csv')
+def bench_publish_csv(n):
+    return _publish(n, serializer='csv')
+
+
+@benchmark('publish_to_stream_jsonl')
+def bench_publish_jsonl(n):
+    return _publish(n, serializer='jsonl')
+
+
+@benchmark('publish_to_stream_binary')
+def bench_publish_binary(n):
+    def run():
+        with io.open(os.devnull, mode='wb', buffering=0) as stream:
+            publish_to_stream(records(n), stream=stream, serializer='csv',
+                              buffer_size=1 << 20)
+    return run
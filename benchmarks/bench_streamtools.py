@@ -0,0 +1,266 @@
+import functools
+from collections import namedtuple
+from operator import itemgetter
+
+from src.pyetllib.etllib import (
+    aggregate,
+    batched_lookup,
+    external_sort,
+    groupby,
+    groupby_sorted,
+    hash_join,
+    join,
+    lookup,
+    pipeline,
+    record,
+    replicate,
+    select,
+    split,
+    stage_profiler,
+    stream_converter,
+    stream_generator,
+    call_next,
+    block_generator,
+    gen_choices,
+    gen_count,
+    gen_uniform,
+    agg_sum,
+    agg_count,
+    streaming_aggregate,
+)
+
+from .harness import benchmark, consume, records
+
+
+category = itemgetter('category')
+CATEGORIES = {i: f'category {i}' for i in range(0, 50, 2)}
+
+
+@benchmark('replicate')
+def bench_replicate(n):
+    def run():
+        it1, it2 = replicate(records(n))
+        for _ in zip(it1, it2):
+            pass
+    return run
+
+
+@benchmark('split')
+def bench_split(n):
+    def run():
+        it1, it2 = split(lambda d: (d['id'], d['name']), records(n),
+                         expected_length=2)
+        for _ in zip(it1, it2):
+            pass
+    return run
+
+
+@benchmark('select')
+def bench_select(n):
+    predicates = (lambda d: d['price'] > 100, lambda d: d['category'] < 10)
+
+    def run():
+        high, low, other = select(predicates, records(n), strict=True)
+        for _ in zip(high, low, other):
+            pass
+    return run
+
+
+@benchmark('lookup')
+def bench_lookup(n):
+    def run():
+        accepted, rejected = lookup(records(n), key=category,
+                                    lookup_map=CATEGORIES, merge=True,
+                                    enable_rejects=True)
+        for _ in zip(accepted, rejected):
+            pass
+    return run
+
+
+@benchmark('batched_lookup')
+def bench_batched_lookup(n):
+    def resolver(keys):
+        return {k: CATEGORIES[k] for k in keys if k in CATEGORIES}
+
+    def run():
+        consume(batched_lookup(resolver, key=category, merge=True)(
+            records(n)
+        ))
+    return run
+
+
+@benchmark('join')
+def bench_join(n):
+    def run():
+        consume(join(records(n), records(n)))
+    return run
+
+
+@benchmark('hash_join')
+def bench_hash_join(n):
+    dimension = [{'category': k, 'label': v} for k, v in CATEGORIES.items()]
+
+    def run():
+        consume(hash_join(records(n), dimension, category, category,
+                          how='left'))
+    return run
+
+
+@benchmark('groupby', max_size=1000000)
+def bench_groupby(n):
+    def run():
+        groupby(category, records(n))
+    return run
+
+
+@benchmark('aggregate', max_size=1000000)
+def bench_aggregate(n):
+    def run():
+        consume(aggregate(len, groupby(category, records(n))))
+    return run
+
+
+@benchmark('external_sort', max_size=1000000)
+def bench_external_sort(n):
+    def run():
+        consume(external_sort(records(n), key=category,
+                              memory_limit=100000))
+    return run
+
+
+@benchmark('groupby_sorted', max_size=1000000)
+def bench_groupby_sorted(n):
+    data = sorted(records(n), key=category)
+
+    def run():
+        consume(aggregate(len, groupby_sorted(category, data)))
+    return run
+
+
+@benchmark('streaming_aggregate')
+def bench_streaming_aggregate(n):
+    aggregators = {'count': agg_count(), 'total': agg_sum(itemgetter('price'))}
+
+    def run():
+        consume(streaming_aggregate(category, aggregators, records(n)))
+    return run
+
+
+@benchmark('stream_converter_dict_tuple')
+def bench_stream_converter_dict_tuple(n):
+    converter = stream_converter(dict, tuple)
+
+    def run():
+        consume(map(converter, records(n)))
+    return run
+
+
+@benchmark('stream_converter_dict_namedtuple')
+def bench_stream_converter_dict_namedtuple(n):
+    converter = stream_converter(dict, namedtuple)
+
+    def run():
+        consume(map(converter, records(n)))
+    return run
+
+
+@benchmark('stream_converter_dict_record')
+def bench_stream_converter_dict_record(n):
+    converter = stream_converter(dict, record)
+
+    def run():
+        consume(map(converter, records(n)))
+    return run
+
+
+@benchmark('groupby_dicts', max_size=1000000)
+def bench_groupby_dicts(n):
+    def run():
+        groupby(category, map(dict, records(n)))
+    return run
+
+
+@benchmark('groupby_records', max_size=1000000)
+def bench_groupby_records(n):
+    converter = stream_converter(dict, record)
+
+    def run():
+        groupby(category, map(converter, records(n)))
+    return run
+
+
+@benchmark('stream_converter_tuple_dict')
+def bench_stream_converter_tuple_dict(n):
+    keys = ('id', 'name', 'category', 'price')
+    converter = stream_converter(tuple, dict, keys=keys, key_type=str)
+    to_tuple = stream_converter(dict, tuple)
+
+    def run():
+        consume(map(converter, map(to_tuple, records(n))))
+    return run
+
+
+@benchmark('stream_generator')
+def bench_stream_generator(n):
+    def run():
+        consume(
+            stream_generator(
+                ('id', 'name', 'constant'),
+                (call_next(range(n)), str, 42),
+                n
+            )
+        )
+    return run
+
+
+@benchmark('block_generator')
+def bench_block_generator(n):
+    def run():
+        consume(
+            block_generator(
+                ('id', 'name', 'price', 'constant'),
+                (gen_count(), gen_choices(('foo', 'bar')),
+                 gen_uniform(0.0, 100.0), 42),
+                n
+            )
+        )
+    return run
+
+
+@benchmark('block_generator_columns')
+def bench_block_generator_columns(n):
+    def run():
+        consume(
+            block_generator(
+                ('id', 'name', 'price', 'constant'),
+                (gen_count(), gen_choices(('foo', 'bar')),
+                 gen_uniform(0.0, 100.0), 42),
+                n, as_columns=True
+            )
+        )
+    return run
+
+
+def _pipeline_stages():
+    return (functools.partial(filter, lambda r: r['price'] > 10.0),
+            functools.partial(map, category),
+            functools.partial(map, str))
+
+
+@benchmark('pipeline')
+def bench_pipeline(n):
+    chain = pipeline(*_pipeline_stages())
+
+    def run():
+        consume(chain(records(n)))
+    return run
+
+
+@benchmark('pipeline_profiled')
+def bench_pipeline_profiled(n):
+    chain = pipeline(*_pipeline_stages(),
+                     profiler=stage_profiler(publish=lambda stats: None))
+
+    def run():
+        consume(chain(records(n)))
+    return run
@@ -0,0 +1,144 @@
+"""A minimal benchmark harness with no dependency outside the standard
+library.
+
+A benchmark is a function decorated with `benchmark` that accepts a
+number of records `n` and returns a callable processing `n` records.
+The harness times this callable, optionally measures its peak memory
+with `tracemalloc`, and reports the throughput in records per second.
+Results can be saved as a baseline and later runs compared against it.
+"""
+import gc
+import itertools
+import json
+import time
+import tracemalloc
+from collections import deque
+
+from src.pyetllib.etllib import stream_generator, call_next
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+_registry = {}
+
+
+def benchmark(name=None, max_size=None):
+    """Registers a benchmark. `max_size` caps the number of records for
+    benchmarks whose memory grows with their input"""
+    def decorator(func):
+        _registry[name or func.__name__] = (func, max_size)
+        return func
+    return decorator
+
+
+def registered(pattern=None):
+    return {
+        name: entry for name, entry in sorted(_registry.items())
+        if pattern is None or pattern in name
+    }
+
+
+def consume(iterable):
+    deque(iterable, maxlen=0)
+
+
+_POOL_SIZE = 1000
+
+
+def _make_pool():
+    return list(
+        stream_generator(
+            ('id', 'name', 'category', 'price'),
+            (
+                call_next(itertools.count()),
+                call_next(itertools.cycle(('foo', 'bar', 'spam', 'eggs'))),
+                call_next(itertools.cycle(range(50))),
+                call_next(i * 0.25 for i in itertools.count()),
+            ),
+            _POOL_SIZE
+        )
+    )
+
+
+_pool = _make_pool()
+
+
+def records(n):
+    """Yields `n` synthetic data dictionaries cycling over a pool built
+    once with `stream_generator`, so that large sizes neither cost
+    generation time nor memory"""
+    return itertools.islice(itertools.cycle(_pool), n)
+
+
+def _time(run, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _peak_memory(run):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, pattern=None, repeat=3,
+                   memory=False, report=print):
+    results = {}
+    for name, (func, max_size) in registered(pattern).items():
+        results[name] = {}
+        for n in sizes:
+            if max_size is not None and n > max_size:
+                continue
+            elapsed = _time(func(n), repeat)
+            result = {'seconds': elapsed, 'rate': n / elapsed}
+            if memory:
+                result['peak'] = _peak_memory(func(n))
+            results[name][str(n)] = result
+            report(_format_line(name, n, result))
+    return results
+
+
+def _format_line(name, n, result, baseline=None):
+    line = f"{name:32s} {n:>10,d} {result['rate']:>14,.0f} rec/s"
+    if 'peak' in result:
+        line += f" {result['peak'] / 1024:>12,.1f} KiB"
+    if baseline is not None:
+        line += f" {result['rate'] / baseline['rate']:>8.2f}x"
+    return line
+
+
+def save(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=0.2, report=print):
+    """Reports the throughput ratio against a baseline and returns the
+    list of (name, size) whose throughput dropped by more than
+    `tolerance`"""
+    regressions = []
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                continue
+            report(_format_line(name, int(size), result, reference))
+            if result['rate'] < reference['rate'] * (1.0 - tolerance):
+                regressions.append((name, int(size)))
+    return regressions
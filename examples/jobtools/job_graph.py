@@ -0,0 +1,33 @@
+import time
+
+from pyetllib.jobtools import Job, JobGraph
+
+
+@Job.declare()
+def extract(idle):
+    time.sleep(idle)
+
+
+@Job.declare()
+def clean(idle):
+    time.sleep(idle)
+
+
+@Job.declare()
+def enrich(idle):
+    time.sleep(idle)
+
+
+@Job.declare()
+def load(idle):
+    time.sleep(idle)
+
+
+graph = JobGraph()
+graph.add(extract, 1.0)
+graph.add(clean, 1.0, depends_on=extract)
+graph.add(enrich, 2.0, depends_on=extract)
+graph.add(load, 1.0, depends_on=(clean, enrich))
+
+result = graph.run(max_workers=4)
+print(result)  # expected critical path: extract > enrich > load (4.0s)
@@ -0,0 +1,21 @@
+import time
+
+from pyetllib.jobtools import Job
+
+
+@Job.declare()
+def north(idle):
+    Job.info("Loading the northern region")
+    time.sleep(idle)
+
+
+@Job.declare()
+def south(idle):
+    Job.info("Loading the southern region")
+    time.sleep(idle)
+
+
+pool = Job.execute_many((north, south), 2.0, max_workers=2)
+for report in pool:
+    print(report.name, 'succeeded' if report.success else 'failed')
+print(pool.summary)  # expected wall time 2.0s, summed job time 4.0s
@@ -1,7 +1,11 @@
 # flake8: noqa
 from .context import create_exec_context, ExecContext
 from .streams import publish_to_stream
+from .sources import byte_ranges, read_csv, read_fixed_width, read_lines, \
+    read_partitioned
 from .tools.j2 import render_template
 from .tools.fieldtools import *
 from .tools.streamtools import *
 from .tools.ruletools import *
+from .tools.aggtools import *
+from .tools.gentools import *
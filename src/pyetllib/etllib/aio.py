@@ -0,0 +1,399 @@
+# -*- coding:utf-8 -*-
+
+__all__ = [
+    'acollect',
+    'ajoin',
+    'alookup',
+    'amap',
+    'apipeline',
+    'apublish_to_stream',
+    'areplicate',
+    'aselect',
+    'asplit',
+    'async_lookup',
+    'to_async',
+    'to_sync',
+]
+
+import abc
+import asyncio
+import collections
+import inspect
+
+from .streams import _open_publisher, publish_stats
+from .tools.streamtools import lookup_cache, pipable, _lookup_merge, \
+    _lookup_window, _merge_window, _select_clauses, _store_resolved, \
+    _unresolved
+
+
+"""
+ designing asynchronous streams.
+ - every function accepts async iterables as well as plain iterables,
+   the latter being adapted with `to_async`
+ - every function returns async iterators, so that stages can be
+   chained with `apipeline` and consumed with `async for`
+ - the functions mapped or called on each record may be either plain
+   functions or coroutine functions
+"""
+
+
+async def _resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def _aiter(iterable):
+    if hasattr(iterable, '__aiter__'):
+        return iterable.__aiter__()
+    return to_async(iterable).__aiter__()
+
+
+async def to_async(iterable, in_thread=False):
+    """Adapts an iterable to an async iterator. If `in_thread` is `True`,
+    items are drawn in the default executor of the event loop, so that
+    a blocking iterable, e.g. a file, does not block the loop"""
+    it = iter(iterable)
+    if not in_thread:
+        for item in it:
+            yield item
+        return
+
+    loop = asyncio.get_event_loop()
+    sentinel = object()
+    while True:
+        item = await loop.run_in_executor(None, next, it, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
+
+def to_sync(iterable):
+    """Adapts an async iterable to an iterator by running a dedicated
+    event loop. Must not be called from a running event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        it = _aiter(iterable)
+        while True:
+            try:
+                yield loop.run_until_complete(it.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def acollect(iterable):
+    """Exhausts an async iterable into a list"""
+    return [item async for item in _aiter(iterable)]
+
+
+async def _afilter(predicate, iterable):
+    async for item in iterable:
+        if predicate(item):
+            yield item
+
+
+async def _afilterfalse(predicate, iterable):
+    async for item in iterable:
+        if not predicate(item):
+            yield item
+
+
+async def _anext(it, default):
+    try:
+        return await it.__anext__(), False
+    except StopAsyncIteration:
+        return default, True
+
+
+class _async_controlled_iterator:
+    def __init__(self, controller):
+        self._controller = controller
+        self._buffer = collections.deque()
+
+    def send(self, item):
+        self._buffer.append(item)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._buffer:
+            if not await self._controller.draw(self):
+                raise StopAsyncIteration
+        return self._buffer.popleft()
+
+
+class _async_iterators_controller(object):
+    def __new__(cls, iterable, *args, **kwargs):
+        new_instance = super().__new__(cls)
+        new_instance.__init__(iterable, *args, **kwargs)
+        return tuple(new_instance._iterators)
+
+    def __init__(self, iterable, *args, **kwargs):
+        self._it = _aiter(iterable)
+        self._lock = None  # bound to the running loop on first use
+        self._exhausted = False
+        self._iterators = self.create_controlled_iterators(*args, **kwargs)
+
+    async def draw(self, requester):
+        """Draws an item from the source and dispatches it. Returns
+        `False` once the source is exhausted"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if requester._buffer:  # served while waiting for the lock
+                return True
+            if self._exhausted:
+                return False
+            try:
+                item = await self._it.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+                return False
+            self.dispatch_item(item)
+            return True
+
+    @abc.abstractmethod
+    def create_controlled_iterators(self, *args, **kwargs):  # pragma: no cover
+        pass
+
+    @abc.abstractmethod
+    def dispatch_item(self, item):  # pragma: no cover
+        pass
+
+
+class areplicate(_async_iterators_controller):
+
+    def create_controlled_iterators(self, n=2):
+        return tuple(
+            _async_controlled_iterator(self) for _ in range(n)
+        )
+
+    def dispatch_item(self, item):
+        for it in self._iterators:
+            it.send(item)
+
+
+class asplit(_async_iterators_controller):
+
+    def create_controlled_iterators(self, expected_length):
+        return tuple(
+            _async_controlled_iterator(self)
+            for _ in range(expected_length)
+        )
+
+    def __init__(self, func, iterable, expected_length):
+        if expected_length < 1:
+            raise ValueError("'expected_length' must be a positive integer")
+        self._splitter_func = func
+        assert callable(self._splitter_func)
+        super().__init__(iterable, expected_length)
+
+    def dispatch_item(self, item):
+        try:
+            split_item = self._splitter_func(item)
+        except Exception:
+            raise RuntimeError("Exception in the splitting function")
+
+        if len(split_item) > len(self._iterators):
+            raise ValueError(
+                "Encountered a tuple with length "
+                "exceeding the number of output "
+                "iterators: " +
+                f"{len(split_item)} > "
+                f"{len(self._iterators)}"
+            )
+        for it, t in zip(self._iterators, split_item):
+            it.send(t)
+
+
+def aselect(predicates, iterable, strict=False):
+    clauses = _select_clauses(predicates, strict)
+    iterators = areplicate(iterable, len(clauses))
+    return tuple(
+        _afilter(clause, it) for clause, it in zip(clauses, iterators)
+    )
+
+
+def alookup(iterable, key=lambda x: x, lookup_map=None,
+            merge=False, enable_rejects=False):
+
+    if lookup_map is None:
+        lookup_map = {}
+
+    func_merge = _lookup_merge(merge)
+
+    async def lookup_(it):
+        async for e in it:
+            k = key(e)
+            if k in lookup_map:
+                yield func_merge(e, lookup_map[k])
+
+    if enable_rejects:
+        src1, src2 = areplicate(iterable)
+        return lookup_(src1), \
+            _afilterfalse(lambda x: key(x) in lookup_map, src2)
+    else:
+        return lookup_(_aiter(iterable))
+
+
+async def ajoin(*iterables, fill_value=None):
+    """Draws the next item of every iterable concurrently"""
+    iterators = [_aiter(it) for it in iterables]
+    stopped = [False] * len(iterators)
+    while True:
+        results = await asyncio.gather(*(
+            _anext(it, fill_value) for it, stop in zip(iterators, stopped)
+            if not stop
+        ))
+        results = iter(results)
+        items = []
+        for index, stop in enumerate(stopped):
+            if stop:
+                items.append(fill_value)
+            else:
+                item, stopped[index] = next(results)
+                items.append(item)
+
+        if all(stopped):
+            return
+        yield tuple(items)
+
+
+def amap(func, concurrency=64, ordered=True):
+    """Maps `func` over an async iterable with at most `concurrency`
+    calls in flight. Results follow the input order unless `ordered`
+    is `False`"""
+    if concurrency < 1:
+        raise ValueError("'concurrency' must be a positive integer")
+
+    async def call(item):
+        return await _resolve(func(item))
+
+    async def amap_(iterable):
+        it = _aiter(iterable)
+        pending = collections.deque() if ordered else set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        item = await it.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(call(item))
+                    if ordered:
+                        pending.append(task)
+                    else:
+                        pending.add(task)
+
+                if not pending:
+                    return
+
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return pipable(amap_)
+
+
+async def _awindows(iterable, window):
+    records = []
+    async for item in _aiter(iterable):
+        records.append(item)
+        if len(records) >= window:
+            yield records
+            records = []
+    if records:
+        yield records
+
+
+def async_lookup(resolver, key=lambda x: x, window=1000, merge=False,
+                 default=_unresolved, cache=None, concurrency=1):
+    """The counterpart of `batched_lookup`. `resolver` may be a
+    coroutine function and up to `concurrency` windows are resolved
+    at the same time"""
+    if window < 1:
+        raise ValueError("'window' must be a positive integer")
+
+    func_merge = _lookup_merge(merge)
+    if cache is None:
+        cache = lookup_cache()
+
+    async def resolve(records):
+        keys, values, pending = _lookup_window(records, key, cache)
+        if pending:
+            resolved = await _resolve(resolver(pending))
+            _store_resolved(cache, values, pending, resolved)
+        return list(_merge_window(records, keys, values, func_merge,
+                                  default))
+
+    resolve_windows = amap(resolve, concurrency)
+
+    async def async_lookup_(iterable):
+        async for records in resolve_windows(_awindows(iterable, window)):
+            for item in records:
+                yield item
+
+    return pipable(async_lookup_)
+
+
+def apipeline(*funcs):
+    """Chains stages accepting and returning async iterables. The input
+    may be a plain iterable"""
+    def apipeline_(iterable):
+        result = _aiter(iterable)
+        for func in funcs:
+            result = func(result)
+        return result
+    return pipable(apipeline_)
+
+
+async def apublish_to_stream(*iterators, **ctx):
+    """The counterpart of `publish_to_stream` for async iterables. The
+    `write` method of the stream may be a coroutine function. The
+    records received before an exception or a cancellation are written
+    before it propagates"""
+    serialize, out, close, batch_size = _open_publisher(ctx)
+
+    records = 0
+    size = 0
+    batch = []
+
+    async def write(batch_):
+        chunk = serialize(batch_)
+        await _resolve(out.write(chunk))
+        return len(chunk)
+
+    try:
+        try:
+            for iterable in iterators:
+                async for item in _aiter(iterable):
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        pending, batch = batch, []
+                        size += await write(pending)
+                        records += len(pending)
+        finally:
+            # the records received before the end, a failure of a source
+            # or a cancellation
+            if batch:
+                pending, batch = batch, []
+                size += await write(pending)
+                records += len(pending)
+    finally:
+        close()
+
+    return publish_stats(records, size)
@@ -0,0 +1,311 @@
+# -*- coding:utf-8 -*-
+
+__all__ = [
+    'byte_ranges',
+    'read_csv',
+    'read_fixed_width',
+    'read_lines',
+    'read_partitioned',
+]
+
+import csv
+import mmap
+import os
+from itertools import chain, islice
+
+from .streams import publish_to_stream
+from .tools._executors import _bounded_futures, _executor_class
+
+
+"""
+ designing memory-mapped extract sources.
+ - a file is mapped in memory and records are located by searching
+   their delimiter, no read buffer is involved
+ - decoded records are produced by blocks of whole records which are
+   sliced, decoded and split at once, memoryview slices are located
+   one record at a time
+ - a reader may be restricted to the byte range [start, end) of a file:
+   it reads the records whose first byte is within this range, so that
+   adjacent ranges never share nor miss a record whatever their bounds
+ - a partitioned read runs a reader and its transformation per range in
+   a pool of workers, the number of ranges in flight being bounded
+"""
+
+
+def _open_mmap(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None  # empty files cannot be mapped
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close_mmap(mm):
+    try:
+        mm.close()
+    except BufferError:  # memoryview slices are still alive
+        pass
+
+
+def _first_record_at(mm, offset, delimiter):
+    """Offset of the first record starting at or after `offset`"""
+    if offset <= 0:
+        return 0
+    index = mm.find(delimiter, offset - len(delimiter))
+    return len(mm) if index < 0 else index + len(delimiter)
+
+
+def _delimited_spans(mm, start, end, delimiter):
+    size = len(mm)
+    end = size if end is None else min(end, size)
+    pos = _first_record_at(mm, start, delimiter)
+    while pos < end:
+        index = mm.find(delimiter, pos)
+        if index < 0:  # last record without a trailing delimiter
+            yield pos, size
+            return
+        yield pos, index
+        pos = index + len(delimiter)
+
+
+_BLOCK_SIZE = 1 << 20
+
+
+def _delimited_blocks(mm, start, end, delimiter):
+    """Yields (a, b) spans of about `_BLOCK_SIZE` bytes holding the whole
+    records of the range, each one followed by its delimiter but the
+    last record of a file missing its trailing delimiter"""
+    size = len(mm)
+    end = size if end is None else min(end, size)
+    pos = _first_record_at(mm, start, delimiter)
+    stop = _first_record_at(mm, end, delimiter)
+    while pos < stop:
+        limit = pos + _BLOCK_SIZE
+        if limit >= stop:
+            bound = stop
+        else:
+            index = mm.rfind(delimiter, pos, limit)
+            if index < 0:  # a record longer than a block
+                index = mm.find(delimiter, limit)
+            bound = stop if index < 0 else index + len(delimiter)
+        yield pos, bound
+        pos = bound
+
+
+def _split_block(block, delimiter):
+    if block.endswith(delimiter):
+        block = block[:-len(delimiter)]
+    return block.split(delimiter)
+
+
+def _fixed_spans(mm, start, end, record_length):
+    size = len(mm)
+    end = size if end is None else min(end, size)
+    first = -(-start // record_length) * record_length
+    for pos in range(first, end, record_length):
+        yield pos, min(pos + record_length, size)
+
+
+def _chunks(iterable, chunk_size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def byte_ranges(path, n, delimiter=b'\n', record_length=None):
+    """Splits a file into at most `n` byte ranges starting on record
+    boundaries, as a list of (start, end) tuples"""
+    if n < 1:
+        raise ValueError("'n' must be a positive integer")
+
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    if record_length is not None:
+        nb_records = -(-size // record_length)
+        bounds = [record_length * (nb_records * i // n) for i in range(n)]
+    else:
+        mm = _open_mmap(path)
+        try:
+            bounds = [
+                _first_record_at(mm, size * i // n, delimiter)
+                for i in range(n)
+            ]
+        finally:
+            _close_mmap(mm)
+
+    bounds = sorted(set(b for b in bounds if b < size)) + [size]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def read_lines(path, start=0, end=None, delimiter=b'\n', encoding='utf-8',
+               as_memoryview=False, chunk_size=None):
+    """Yields the records of a delimited file found in the byte range
+    [start, end), without their delimiter. Records are strings decoded
+    with `encoding`, `bytes` if `encoding` is `None`, or zero-copy
+    `memoryview` slices of the mapped file if `as_memoryview` is `True`.
+    If `chunk_size` is set, lists of at most `chunk_size` records are
+    yielded instead"""
+    mm = _open_mmap(path)
+    if mm is None:
+        return
+
+    view = memoryview(mm) if as_memoryview else None
+    try:
+        if as_memoryview:
+            spans = _delimited_spans(mm, start, end, delimiter)
+            records = (view[a:b] for a, b in spans)
+        else:
+            blocks = _delimited_blocks(mm, start, end, delimiter)
+            if encoding is None:
+                split = (_split_block(mm[a:b], delimiter) for a, b in blocks)
+            else:
+                text_delimiter = delimiter.decode(encoding)
+                split = (
+                    _split_block(mm[a:b].decode(encoding), text_delimiter)
+                    for a, b in blocks
+                )
+            records = chain.from_iterable(split)
+
+        if chunk_size:
+            yield from _chunks(records, chunk_size)
+        else:
+            yield from records
+    finally:
+        if view is not None:
+            view.release()
+        _close_mmap(mm)
+
+
+def read_csv(path, start=0, end=None, header=False, fieldnames=None,
+             encoding='utf-8', chunk_size=None, **fmtparams):
+    """Yields the rows of a CSV file found in the byte range [start, end)
+    as lists, or as dictionaries when `header` is `True` or `fieldnames`
+    is provided. `fmtparams` are passed to `csv.reader`. Quoted values
+    must not contain line breaks"""
+    if header:
+        first_line = next(read_lines(path, 0, 1, encoding=encoding), '')
+        names = next(csv.reader([first_line], **fmtparams), [])
+        fieldnames = fieldnames or names
+        if start <= 0:
+            start = 1  # skip the header line
+
+    rows = csv.reader(read_lines(path, start, end, encoding=encoding),
+                      **fmtparams)
+    if fieldnames:
+        fieldnames = tuple(fieldnames)
+        rows = (dict(zip(fieldnames, row)) for row in rows)
+
+    if chunk_size:
+        yield from _chunks(rows, chunk_size)
+    else:
+        yield from rows
+
+
+def read_fixed_width(path, fields, start=0, end=None, delimiter=b'\n',
+                     encoding='utf-8', strip=True, chunk_size=None):
+    """Yields data dictionaries from a fixed-width file found in the byte
+    range [start, end). `fields` is a sequence of (name, width) pairs,
+    widths being expressed in bytes. Records are separated by
+    `delimiter` or, if `delimiter` is `None`, are exactly as long as
+    the sum of the widths"""
+    offsets = []
+    offset = 0
+    for name, width in fields:
+        offsets.append((name, offset, offset + width))
+        offset += width
+    record_length = offset
+
+    mm = _open_mmap(path)
+    if mm is None:
+        return
+
+    try:
+        if delimiter is None:
+            spans = _fixed_spans(mm, start, end, record_length)
+        else:
+            spans = _delimited_spans(mm, start, end, delimiter)
+
+        def parse(span):
+            a, b = span
+            record = {}
+            for name, first, last in offsets:
+                value = mm[a + first:min(a + last, b)].decode(encoding)
+                record[name] = value.strip() if strip else value
+            return record
+
+        records = map(parse, spans)
+        if chunk_size:
+            yield from _chunks(records, chunk_size)
+        else:
+            yield from records
+    finally:
+        _close_mmap(mm)
+
+
+_PARTITION_SIZE = 1 << 25
+
+
+def _read_partition(index, path, start, end, reader, transform,
+                    reader_kwargs, output, publish_ctx):
+    records = reader(path, start=start, end=end, **reader_kwargs)
+    if transform is not None:
+        records = transform(records)
+    if output is None:
+        return list(records)
+
+    target = output.format(index=index)
+    with open(target, 'w', newline='') as stream:
+        stats = publish_to_stream(records, stream=stream, **publish_ctx)
+    return target, stats
+
+
+def read_partitioned(path, reader=read_lines, transform=None,
+                     partitions=None, workers=None, ordered=True,
+                     mode='process', output=None, publish_ctx=None,
+                     record_delimiter=b'\n', record_length=None,
+                     **reader_kwargs):
+    """Splits a file into byte ranges aligned on record boundaries and
+    reads each one with `reader`, then `transform`, in a pool of
+    workers. Yields the transformed records or, if `output` is set,
+    writes each partition to `output.format(index=index)` and yields
+    (path, publish_stats) tuples"""
+    executor_class = _executor_class(mode)
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers  # bounds the number of partitions in memory
+
+    if partitions is None:
+        size = os.path.getsize(path)
+        partitions = max(workers, -(-size // _PARTITION_SIZE))
+    ranges = iter(enumerate(byte_ranges(path, partitions, record_delimiter,
+                                        record_length)))
+    publish_ctx = publish_ctx or {}
+
+    def submit(executor):
+        partition = next(ranges, None)
+        if partition is None:
+            return None
+        index, (start, end) = partition
+        return executor.submit(
+            _read_partition, index, path, start, end, reader,
+            transform, reader_kwargs, output, publish_ctx
+        )
+
+    def results(future):
+        result = future.result()
+        return [result] if output is not None else result
+
+    def read_partitioned_():
+        with executor_class(max_workers=workers) as executor:
+            futures = _bounded_futures(executor, submit, max_pending,
+                                       ordered)
+            try:
+                for future in futures:
+                    yield from results(future)
+            finally:
+                futures.close()
+
+    return read_partitioned_()
@@ -1,16 +1,141 @@
 # -*- coding:utf-8 -*-
 
 __all__ = [
-    'publish_to_stream'
+    'publish_to_stream',
+    'publish_stats',
 ]
 
+import csv
+import io
+import json
 import sys
+from collections import namedtuple
+from collections.abc import Mapping
+from itertools import chain
 
 
-def publish_to_stream(*iterators, **ctx):
+publish_stats = namedtuple('publish_stats', ('records', 'size'))
+
+
+def _json_default(obj):
+    if hasattr(obj, '_asdict'):  # records
+        return obj._asdict()
+    raise TypeError(f"Object of type {type(obj).__name__} "
+                    f"is not JSON serializable")
+
+
+def _csv_serializer(record_delimiter, dialect='excel'):
+    def serialize(batch):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, dialect=dialect,
+                            lineterminator=record_delimiter)
+        writer.writerows(
+            r.values() if isinstance(r, Mapping) else r for r in batch
+        )
+        return buffer.getvalue()
+    return serialize
+
+
+def _tsv_serializer(record_delimiter):
+    return _csv_serializer(record_delimiter, dialect='excel-tab')
+
+
+def _jsonl_serializer(record_delimiter):
+    dumps = json.JSONEncoder(default=_json_default).encode
+
+    def serialize(batch):
+        return record_delimiter.join(map(dumps, batch)) + record_delimiter
+    return serialize
+
+
+_serializers = {
+    'csv': _csv_serializer,
+    'tsv': _tsv_serializer,
+    'jsonl': _jsonl_serializer,
+}
+
+
+def _open_publisher(ctx):
+    """Consumes the publication parameters of `ctx` and returns a
+    function serializing a batch of records to a chunk, the stream to
+    write the chunks to, a function to call once done and the number of
+    records per batch"""
     stream = ctx.pop('stream', sys.stdout)
     record_delimiter = ctx.pop('record_delimiter', '\n')
-    record_converter = ctx.pop('record_converter', lambda s: s)
-    for iterator in iterators:
-        for record in iterator:
-            stream.write(record_converter(record) + record_delimiter)
+    record_converter = ctx.pop('record_converter', None)
+    serializer = ctx.pop('serializer', None)
+    batch_size = ctx.pop('batch_size', 1000)
+    buffer_size = ctx.pop('buffer_size', None)
+    encoding = ctx.pop('encoding', 'utf-8')
+
+    if batch_size < 1:
+        raise ValueError("'batch_size' must be a positive integer")
+
+    if isinstance(serializer, str):
+        try:
+            serializer = _serializers[serializer](record_delimiter)
+        except KeyError:
+            raise ValueError(f"Unknown serializer '{serializer}'")
+
+    if serializer is None:
+        converter = record_converter or (lambda s: s)
+
+        def serializer(batch):
+            return record_delimiter.join(map(converter, batch)) \
+                + record_delimiter
+    elif record_converter is not None:
+        serialize_ = serializer
+
+        def serializer(batch):
+            return serialize_(list(map(record_converter, batch)))
+
+    binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase))
+    if buffer_size is not None and isinstance(stream, io.RawIOBase):
+        out = io.BufferedWriter(stream, buffer_size=buffer_size)
+    else:
+        out = stream
+
+    def serialize(batch):
+        chunk = serializer(batch)
+        if binary and isinstance(chunk, str):
+            chunk = chunk.encode(encoding)
+        return chunk
+
+    def close():
+        if out is not stream:
+            out.flush()
+            out.detach()  # leave the caller's stream open
+
+    return serialize, out, close, batch_size
+
+
+def publish_to_stream(*iterators, **ctx):
+    serialize, out, close, batch_size = _open_publisher(ctx)
+
+    records = 0
+    size = 0
+    batch = []
+    it = chain.from_iterable(iterators)
+    append = batch.append
+    try:
+        try:
+            for item in it:
+                append(item)
+                if len(batch) == batch_size:
+                    chunk = serialize(batch)
+                    records += len(batch)
+                    batch.clear()
+                    out.write(chunk)
+                    size += len(chunk)
+        finally:
+            # the records read before the end or a failure of upstream
+            if batch:
+                chunk = serialize(batch)
+                records += len(batch)
+                batch.clear()
+                out.write(chunk)
+                size += len(chunk)
+    finally:
+        close()
+
+    return publish_stats(records, size)
@@ -1,9 +1,15 @@
 # flake8: noqa
 from .streamtools import (
     aggregate,
+    batched_lookup,
+    external_sort,
     filtertruefalse,
     groupby,
+    groupby_sorted,
+    hash_join,
     lookup,
+    lookup_cache,
+    record,
     reduce,
     replicate,
     select,
@@ -15,13 +21,43 @@ from .streamtools import (
     compose,
     call_next,
     mcompose,
+    parallel_map,
+    ParallelMapError,
     pipable,
     pipeline,
     pipe_data_through,
+    stage_profiler,
+    stage_stats,
     call_next_starred,
     xargs,
 )
 
+from .aggtools import (
+    aggregator,
+    agg_count,
+    agg_distinct,
+    agg_first,
+    agg_last,
+    agg_max,
+    agg_mean,
+    agg_min,
+    agg_sum,
+    agg_top_k,
+    agg_variance,
+    merge_aggregates,
+    streaming_aggregate,
+)
+
+from .gentools import (
+    block_generator,
+    gen_choices,
+    gen_count,
+    gen_numpy,
+    gen_randint,
+    gen_uniform,
+    write_blocks,
+)
+
 from .fieldtools import (
     fextract,
     flookup,
@@ -30,6 +66,14 @@ from .fieldtools import (
     freverse_lookup,
     fmap,
     fsplit,
+    ReverseLookupIndex,
+    cextract,
+    clookup,
+    cmap,
+    cremove,
+    crename,
+    columns_to_stream,
+    stream_to_columns,
 )
 
 from .ruletools import (
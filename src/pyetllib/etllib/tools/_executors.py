@@ -0,0 +1,46 @@
+import collections
+import concurrent.futures
+
+
+def _executor_class(mode):
+    """The `concurrent.futures` executor class of an execution mode,
+    either 'process' or 'thread'"""
+    if mode == 'process':
+        return concurrent.futures.ProcessPoolExecutor
+    elif mode == 'thread':
+        return concurrent.futures.ThreadPoolExecutor
+    raise ValueError(f"Unsupported execution mode '{mode}'")
+
+
+def _bounded_futures(executor, submit, max_pending, ordered=True):
+    """Calls `submit(executor)` until it returns None, keeping at most
+    `max_pending` of the futures it returns in flight. Yields them in
+    the submission order if `ordered`, the caller waiting for their
+    result, otherwise as they complete. The pending futures are
+    cancelled when the generator is closed"""
+    pending = collections.deque() if ordered else set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                future = submit(executor)
+                if future is None:
+                    exhausted = True
+                elif ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+
+            if not pending:
+                return
+
+            if ordered:
+                yield pending.popleft()
+            else:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                yield from done
+    finally:
+        for future in pending:
+            future.cancel()
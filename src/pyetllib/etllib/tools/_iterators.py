@@ -1,6 +1,11 @@
 import collections
 import abc
 
+from ._spill import _spill_file
+
+
+_buffer_policies = ('raise', 'spill', 'drop')
+
 
 class _controlled_iterator:
     """A chimera class, an iterator with the interface of a generator"""
@@ -9,13 +14,61 @@ class _controlled_iterator:
         self._buffer = collections.deque()
         self._should_stop = False
         self._exception = StopIteration
+        self._max_buffer = None
+        self._policy = None
+        self._spill = None
+        self._high_water_mark = 0
+        self._dropped = 0
+
+    def set_buffer_policy(self, max_buffer, policy):
+        """Bounds the number of items held in memory by this iterator.
+        When the bound is reached, the incoming items are either written
+        to a temporary file ('spill'), discarded ('drop') or rejected
+        with a `BufferError` ('raise')"""
+        self._max_buffer = max_buffer
+        self._policy = policy
+        if policy == 'spill':
+            self._spill = _spill_file()
+
+    @property
+    def buffered(self):
+        """Number of items waiting to be consumed"""
+        return len(self._buffer) + (len(self._spill) if self._spill else 0)
+
+    @property
+    def high_water_mark(self):
+        """Largest number of items ever waiting to be consumed"""
+        return self._high_water_mark
+
+    @property
+    def dropped(self):
+        """Number of items discarded by the 'drop' policy"""
+        return self._dropped
 
     def send(self, item):
-        self._buffer.append(item)
+        if self._max_buffer is None:
+            self._buffer.append(item)
+        elif self._spill is not None and \
+                (self._spill or len(self._buffer) >= self._max_buffer):
+            self._spill.append(item)  # keep the FIFO order
+        elif len(self._buffer) < self._max_buffer:
+            self._buffer.append(item)
+        elif self._policy == 'drop':
+            self._dropped += 1
+            return
+        else:
+            raise BufferError(f"Buffer size limit of {self._max_buffer} "
+                              f"items exceeded by a controlled iterator")
+
+        size = self.buffered
+        if size > self._high_water_mark:
+            self._high_water_mark = size
 
     def throw(self, exc):
         self._should_stop = True
         self._exception = exc
+        if self._spill is not None:
+            self._spill.close()
 
     def __iter__(self):
         return self
@@ -27,7 +80,11 @@ class _controlled_iterator:
     def __next__(self):
         if not self._should_stop:
             if len(self._buffer) == 0:
-                self._callback(self)  # draw a new value
+                if self._spill:  # reload a batch of spilled items
+                    for _ in range(min(len(self._spill), self._max_buffer)):
+                        self._buffer.append(self._spill.popleft())
+                else:
+                    self._callback(self)  # draw a new value
 
             if len(self._buffer) == 0:  # nothing was sent
                 self._should_stop = True
@@ -45,9 +102,18 @@ class _iterators_controller(object):
         new_instance.__init__(iterable, *args, **kwargs)
         return tuple(new_instance._iterators)
 
-    def __init__(self, iterable, *args, **kwargs):
+    def __init__(self, iterable, *args, max_buffer=None,
+                 buffer_policy='raise', **kwargs):
+        if buffer_policy not in _buffer_policies:
+            raise ValueError(f"Unsupported buffer policy '{buffer_policy}'")
+        if max_buffer is not None and max_buffer < 1:
+            raise ValueError("'max_buffer' must be a positive integer")
+
         self._it = iter(iterable)
         self._iterators = self.create_controlled_iterators(*args, **kwargs)
+        if max_buffer is not None:
+            for it in self._iterators:
+                it.set_buffer_policy(max_buffer, buffer_policy)
 
     @abc.abstractmethod
     def create_controlled_iterators(self, *args, **kwargs):  # pragma: no cover
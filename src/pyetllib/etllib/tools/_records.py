@@ -0,0 +1,106 @@
+import functools
+import keyword
+from collections import namedtuple
+from collections.abc import Mapping
+
+
+_RECORD_CLASS_CACHE_SIZE = 256
+
+
+class record(Mapping):
+    """Base class of compact records. A subclass is generated for each
+    schema by `_make_record_class` with a slot per field, so that a record
+    takes roughly the memory of a tuple while offering attribute access
+    (`r.name`) and the read-only `Mapping` protocol (`r['name']`,
+    `'name' in r`, `r.get`, `r.keys()`, `r.items()`, `r.values()`)"""
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+
+    __hash__ = None  # mutable, as a dict
+
+    @classmethod
+    def _make(cls, iterable):
+        return cls(*iterable)
+
+    def _asdict(self):  # pragma: no cover
+        return {}
+
+    def _astuple(self):  # pragma: no cover
+        return ()
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._field_set
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, record):
+            return self._fields == other._fields \
+                and self._astuple() == other._astuple()
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ', '.join(
+            f'{k}={v!r}' for k, v in zip(self._fields, self._astuple())
+        )
+        return f'{type(self).__name__}({fields})'
+
+    def __reduce__(self):
+        return _rebuild_record, (type(self).__name__, self._fields,
+                                 self._astuple())
+
+
+def _make_record_class(typename, keys):
+    keys = tuple(keys)
+    for key in keys:
+        if not isinstance(key, str) or not key.isidentifier() \
+                or keyword.iskeyword(key) or key.startswith('_'):
+            raise ValueError(f"Invalid field name for a record: {key!r}")
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"Duplicate field names for a record: {keys}")
+
+    # the receiver is named `_self` as a field may be named `self`, while
+    # field names cannot start with an underscore
+    args = ''.join(f', {k}' for k in keys)
+    source = '\n'.join(
+        [f'def __init__(_self{args}):']
+        + [f'    _self.{k} = {k}' for k in keys]
+        + ['    pass',
+           'def _astuple(_self):',
+           f"    return ({''.join(f'_self.{k}, ' for k in keys)})",
+           'def _asdict(_self):',
+           f"    return {{{', '.join(f'{k!r}: _self.{k}' for k in keys)}}}"]
+    )
+    namespace = {}
+    exec(compile(source, f'<record {typename}>', 'exec'), namespace)
+    return type(typename, (record, ), {
+        '__slots__': keys,
+        '_fields': keys,
+        '_field_set': frozenset(keys),
+        '__init__': namespace['__init__'],
+        '_astuple': namespace['_astuple'],
+        '_asdict': namespace['_asdict'],
+    })
+
+
+@functools.lru_cache(maxsize=_RECORD_CLASS_CACHE_SIZE)
+def _record_class(base, typename, keys):
+    """Returns the class of `base` kind, either `namedtuple` or `record`,
+    for a schema. Classes are shared by all the converters"""
+    if base is namedtuple:
+        return namedtuple(typename, keys)
+    return _make_record_class(typename, keys)
+
+
+def _rebuild_record(typename, keys, values):
+    return _record_class(record, typename, keys)(*values)
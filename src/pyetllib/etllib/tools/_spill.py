@@ -0,0 +1,64 @@
+import pickle
+import tempfile
+
+
+class _spill_file:
+    """A FIFO of pickled items backed by an anonymous temporary file.
+
+    Items are appended at the tail and popped from the head, both
+    operations may be interleaved. The file is created on the first
+    append and is removed from the disk when closed."""
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._file = None
+        self._reading = False
+        self._read_pos = 0
+        self._write_pos = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """Consumes the items in the order they were appended"""
+        while self._count:
+            yield self.popleft()
+
+    def append(self, item):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self._directory)
+        if self._reading:
+            self._file.seek(self._write_pos)
+            self._reading = False
+        pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._write_pos = self._file.tell()
+        self._count += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def popleft(self):
+        if self._count == 0:
+            raise IndexError("pop from an empty spill file")
+        if not self._reading:
+            self._file.seek(self._read_pos)
+            self._reading = True
+        item = pickle.load(self._file)
+        self._read_pos = self._file.tell()
+        self._count -= 1
+
+        if self._count == 0:  # reclaim the disk space
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_pos = self._write_pos = 0
+
+        return item
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._reading = False
+        self._read_pos = self._write_pos = 0
+        self._count = 0
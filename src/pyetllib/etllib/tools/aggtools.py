@@ -0,0 +1,320 @@
+__all__ = [
+    'aggregator',
+    'agg_count',
+    'agg_distinct',
+    'agg_first',
+    'agg_last',
+    'agg_max',
+    'agg_mean',
+    'agg_min',
+    'agg_sum',
+    'agg_top_k',
+    'agg_variance',
+    'merge_aggregates',
+    'streaming_aggregate',
+]
+
+import hashlib
+import heapq
+import math
+from collections.abc import Mapping
+
+import toolz
+
+
+_empty = object()
+
+
+class aggregator:
+    """Base class of incremental aggregators.
+    An aggregator does not hold any state by itself, it defines how an
+    accumulator is initialized, updated with a row, merged with another
+    accumulator and finally turned into a result. `func` extracts the
+    aggregated value from a row and defaults to the identity.
+    An aggregator may also be called on a whole group of rows which
+    makes it usable with `aggregate`"""
+    def __init__(self, func=None):
+        self.func = func if func is not None else toolz.identity
+
+    def __call__(self, rows):
+        acc = self.init()
+        for row in rows:
+            acc = self.update(acc, row)
+        return self.finalize(acc)
+
+    def init(self):  # pragma: no cover
+        raise NotImplementedError
+
+    def update(self, acc, row):  # pragma: no cover
+        raise NotImplementedError
+
+    def merge(self, acc, other):  # pragma: no cover
+        raise NotImplementedError
+
+    def finalize(self, acc):
+        return acc
+
+
+class agg_count(aggregator):
+    def init(self):
+        return 0
+
+    def update(self, acc, row):
+        return acc + 1
+
+    def merge(self, acc, other):
+        return acc + other
+
+
+class agg_sum(aggregator):
+    def init(self):
+        return 0
+
+    def update(self, acc, row):
+        return acc + self.func(row)
+
+    def merge(self, acc, other):
+        return acc + other
+
+
+class agg_min(aggregator):
+    def init(self):
+        return _empty
+
+    def update(self, acc, row):
+        value = self.func(row)
+        return value if acc is _empty or value < acc else acc
+
+    def merge(self, acc, other):
+        if acc is _empty:
+            return other
+        if other is _empty:
+            return acc
+        return min(acc, other)
+
+    def finalize(self, acc):
+        return None if acc is _empty else acc
+
+
+class agg_max(agg_min):
+    def update(self, acc, row):
+        value = self.func(row)
+        return value if acc is _empty or value > acc else acc
+
+    def merge(self, acc, other):
+        if acc is _empty:
+            return other
+        if other is _empty:
+            return acc
+        return max(acc, other)
+
+
+class agg_first(aggregator):
+    def init(self):
+        return _empty
+
+    def update(self, acc, row):
+        return self.func(row) if acc is _empty else acc
+
+    def merge(self, acc, other):
+        """`acc` is expected to come from rows preceding those of `other`"""
+        return other if acc is _empty else acc
+
+    def finalize(self, acc):
+        return None if acc is _empty else acc
+
+
+class agg_last(agg_first):
+    def update(self, acc, row):
+        return self.func(row)
+
+    def merge(self, acc, other):
+        return acc if other is _empty else other
+
+
+class agg_mean(aggregator):
+    def init(self):
+        return 0, 0
+
+    def update(self, acc, row):
+        n, total = acc
+        return n + 1, total + self.func(row)
+
+    def merge(self, acc, other):
+        return acc[0] + other[0], acc[1] + other[1]
+
+    def finalize(self, acc):
+        n, total = acc
+        return total / n if n else None
+
+
+class agg_variance(aggregator):
+    """Welford's online variance, `ddof=1` gives the sample variance
+    and `ddof=0` the population variance"""
+    def __init__(self, func=None, ddof=1):
+        super().__init__(func)
+        self.ddof = ddof
+
+    def init(self):
+        return 0, 0.0, 0.0
+
+    def update(self, acc, row):
+        n, mean, m2 = acc
+        value = self.func(row)
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+        return n, mean, m2
+
+    def merge(self, acc, other):
+        n_a, mean_a, m2_a = acc
+        n_b, mean_b, m2_b = other
+        n = n_a + n_b
+        if n == 0:
+            return acc
+        delta = mean_b - mean_a
+        mean = mean_a + delta * n_b / n
+        m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+        return n, mean, m2
+
+    def finalize(self, acc):
+        n, _, m2 = acc
+        return m2 / (n - self.ddof) if n > self.ddof else None
+
+
+class agg_distinct(aggregator):
+    """Approximate count of distinct values using a HyperLogLog sketch
+    of 2 ** `precision` registers. The relative error is about
+    1.04 / sqrt(2 ** `precision`). Values are hashed from their `repr`
+    so that sketches built in different processes can be merged"""
+    def __init__(self, func=None, precision=12):
+        super().__init__(func)
+        if not 4 <= precision <= 16:
+            raise ValueError("'precision' must be between 4 and 16")
+        self.precision = precision
+        self._m = 1 << precision
+        self._alpha = 0.7213 / (1.0 + 1.079 / self._m)
+
+    def init(self):
+        return bytearray(self._m)
+
+    def update(self, acc, row):
+        h = int.from_bytes(
+            hashlib.blake2b(repr(self.func(row)).encode(),
+                            digest_size=8).digest(),
+            'big'
+        )
+        index = h & (self._m - 1)
+        w = h >> self.precision
+        rank = 64 - self.precision - w.bit_length() + 1
+        if rank > acc[index]:
+            acc[index] = rank
+        return acc
+
+    def merge(self, acc, other):
+        return bytearray(map(max, acc, other))
+
+    def finalize(self, acc):
+        m = self._m
+        estimate = self._alpha * m * m / sum(2.0 ** -r for r in acc)
+        zeros = acc.count(0)
+        if estimate <= 2.5 * m and zeros:  # small range correction
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class agg_top_k(aggregator):
+    """Keeps the `k` largest values in descending order"""
+    def __init__(self, k, func=None):
+        super().__init__(func)
+        self.k = k
+
+    def init(self):
+        return []
+
+    def update(self, acc, row):
+        value = self.func(row)
+        if len(acc) < self.k:
+            heapq.heappush(acc, value)
+        elif acc and value > acc[0]:
+            heapq.heapreplace(acc, value)
+        return acc
+
+    def merge(self, acc, other):
+        merged = heapq.nlargest(self.k, acc + other)
+        heapq.heapify(merged)
+        return merged
+
+    def finalize(self, acc):
+        return sorted(acc, reverse=True)
+
+
+class _aggregator_map(aggregator):
+    """Applies a mapping of named aggregators to the same rows"""
+    def __init__(self, aggregators):
+        super().__init__()
+        self._names = tuple(aggregators.keys())
+        self._aggregators = tuple(aggregators.values())
+
+    def init(self):
+        return [a.init() for a in self._aggregators]
+
+    def update(self, acc, row):
+        for i, a in enumerate(self._aggregators):
+            acc[i] = a.update(acc[i], row)
+        return acc
+
+    def merge(self, acc, other):
+        return [
+            a.merge(x, y) for a, x, y in zip(self._aggregators, acc, other)
+        ]
+
+    def finalize(self, acc):
+        return {
+            name: a.finalize(x)
+            for name, a, x in zip(self._names, self._aggregators, acc)
+        }
+
+
+def _as_aggregator(aggregators):
+    if isinstance(aggregators, Mapping):
+        return _aggregator_map(aggregators)
+    return aggregators
+
+
+def merge_aggregates(aggregators, *partials, finalize=True):
+    """Merges iterables of (key, accumulator) pairs produced by
+    `streaming_aggregate` with `finalize` set to `False`, for instance
+    by different workers"""
+    agg = _as_aggregator(aggregators)
+    accs = {}
+    for partial in partials:
+        for k, acc in partial:
+            if k in accs:
+                accs[k] = agg.merge(accs[k], acc)
+            else:
+                accs[k] = acc
+
+    for k, acc in accs.items():
+        yield k, agg.finalize(acc) if finalize else acc
+
+
+def streaming_aggregate(key, aggregators, iterable, finalize=True):
+    """Folds each row of `iterable` in the accumulator of its key and
+    yields (key, result) pairs once `iterable` is exhausted. `aggregators`
+    is either an aggregator or a mapping of aggregators in which case the
+    result is a dictionary with the same keys"""
+    agg = _as_aggregator(aggregators)
+    init, update = agg.init, agg.update
+    accs = {}
+    for row in iterable:
+        k = key(row)
+        try:
+            acc = accs[k]
+        except KeyError:
+            acc = init()
+        accs[k] = update(acc, row)
+
+    for k, acc in accs.items():
+        yield k, agg.finalize(acc) if finalize else acc
@@ -6,5 +6,15 @@ from .core import (
     freverse_lookup,
     flookup,
     fmap,
-    fsplit
+    fsplit,
+    ReverseLookupIndex
+)
+from .columnar import (
+    cextract,
+    clookup,
+    cmap,
+    cremove,
+    crename,
+    columns_to_stream,
+    stream_to_columns
 )
@@ -0,0 +1,143 @@
+from itertools import chain, islice, starmap, zip_longest
+from typing import Callable, Collection, Dict, Iterable, Iterator
+
+
+"""
+ A column batch is a dictionary of sequences of the same length keyed
+ by field names: the columnar counterpart of a list of data dictionaries.
+ Column batch functions work on whole columns, so that their cost grows
+ with the number of columns instead of rows times columns.
+"""
+
+
+def stream_to_columns(iterable: Iterable[Dict], batch_size: int = 10000,
+                      column_factory: Callable = None) -> Iterator[Dict]:
+    """
+    Groups a stream of data dictionaries into column batches. The
+    columns of a batch are the union of the keys of its rows, missing
+    values are set to `None`
+    :param iterable: a stream of data dictionaries
+    :param batch_size: maximum number of rows in a batch
+    :param column_factory: a callable turning a list of values into a
+                           column, e.g. `numpy.asarray`
+    :return: an iterator of column batches
+    """
+    if batch_size < 1:
+        raise ValueError("'batch_size' must be a positive integer")
+
+    it = iter(iterable)
+    while True:
+        rows = list(islice(it, batch_size))
+        if not rows:
+            return
+
+        keys = dict.fromkeys(chain.from_iterable(rows))  # ordered union
+        batch = {k: [row.get(k) for row in rows] for k in keys}
+        if column_factory is not None:
+            batch = {k: column_factory(v) for k, v in batch.items()}
+        yield batch
+
+
+def columns_to_stream(batches: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Turns column batches back into a stream of data dictionaries
+    :param batches: an iterable of column batches
+    :return: an iterator of data dictionaries
+    """
+    for batch in batches:
+        keys = tuple(batch.keys())
+        for values in zip(*batch.values()):
+            yield dict(zip(keys, values))
+
+
+def cextract(keys: Collection, batch: Dict) -> Dict:
+    """
+    Extracts the columns of `batch` named in `keys`
+    :param keys: a collection, should support __contains__
+    :param batch: a column batch
+    :return: a column batch
+    """
+    return {k: v for k, v in batch.items() if k in keys}
+
+
+def clookup(lookup_map: Dict, keys: Collection, batch: Dict,
+            column_factory: Callable = None) -> Dict:
+    """
+    Replaces the values of the columns named in `keys` by their value
+    in `lookup_map`, or `None` if they are not found
+    :param lookup_map: a mapping
+    :param keys: a collection, should support __contains__
+    :param batch: a column batch
+    :param column_factory: a callable turning a list of values into a
+                           column, e.g. `numpy.asarray`
+    :return: a column batch
+    """
+    get = lookup_map.get
+
+    def _lookup(col):
+        col = [get(v) for v in col]
+        return col if column_factory is None else column_factory(col)
+
+    return {
+        k: _lookup(col) if k in keys else col
+        for k, col in batch.items()
+    }
+
+
+def cmap(keys: Collection, funcs: Collection[Callable], batch: Dict,
+         val_as_args: bool = False, vectorized: bool = False,
+         column_factory: Callable = None) -> Dict:
+    """
+    Applies each function of `funcs` to the column with the same index
+    in `keys`
+    :param keys: a collection, should support __contains__
+                 and __getitem__
+    :param funcs: a iterable of callables
+    :param batch: a column batch
+    :param val_as_args: bool, values are unpacked as arguments
+    :param vectorized: bool, functions are called once with the whole
+                       column, e.g. NumPy universal functions
+    :param column_factory: a callable turning the list of mapped values
+                           into a column, e.g. `numpy.asarray`. Unused
+                           if `vectorized`
+    :return: a column batch
+    """
+    func_map = dict(
+        zip_longest(
+            keys, funcs,
+            fillvalue=lambda x: x
+        )
+    )
+
+    def _apply_func(func, col):
+        if vectorized:
+            return func(col)
+        col = list(starmap(func, col) if val_as_args else map(func, col))
+        return col if column_factory is None else column_factory(col)
+
+    return {
+        k: _apply_func(func_map[k], col) if k in func_map else col
+        for k, col in batch.items()
+    }
+
+
+def cremove(keys: Collection, batch: Dict) -> Dict:
+    """
+    Removes the columns of `batch` named in `keys`
+    :param keys: a collection, should support __contains__
+    :param batch: a column batch
+    :return: a column batch
+    """
+    return {k: v for k, v in batch.items() if k not in keys}
+
+
+def crename(keys: Dict, batch: Dict) -> Dict:
+    """
+    Renames columns according to a mapping
+    :param keys: a mapping of old names to new names
+    :param batch: a column batch
+    :return: a column batch
+    """
+    return {
+        keys[k] if k in keys else k: v for k, v in batch.items()
+    }
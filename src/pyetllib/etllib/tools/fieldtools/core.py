@@ -1,5 +1,6 @@
 from toolz import keyfilter, itemmap
 from itertools import zip_longest
+from collections.abc import Mapping
 from typing import Callable, Collection, Dict, Tuple
 
 
@@ -29,9 +30,54 @@ def flookup(lookup_map: Dict, keys: Collection, data_dict: Dict) -> Dict:
     return result
 
 
+class ReverseLookupIndex(Mapping):
+    """
+    A read-only mapping of each value found in the collections of
+    `lookup_map` to its key in `lookup_map`, built once for use with
+    `freverse_lookup`.
+    `on_collision` tells which key is kept when a value appears under
+    several keys: 'first' (as a linear scan of `lookup_map` would do),
+    'last' or 'raise' to reject such a mapping with a `ValueError`
+    """
+    def __init__(self, lookup_map: Dict, on_collision: str = 'first'):
+        if on_collision not in ('first', 'last', 'raise'):
+            raise ValueError(f"Unsupported collision policy "
+                             f"'{on_collision}'")
+
+        index = {}
+        for item, values in lookup_map.items():
+            for value in values:
+                if value in index and index[value] != item:
+                    if on_collision == 'first':
+                        continue
+                    elif on_collision == 'raise':
+                        raise ValueError(
+                            f"Value {value!r} is shared by keys "
+                            f"{index[value]!r} and {item!r}"
+                        )
+                index[value] = item
+        self._index = index
+
+    def __getitem__(self, value):
+        return self._index[value]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+
 def freverse_lookup(lookup_map: Dict, keys: Collection,
                     data_dict: Dict) -> Dict:
     result = keyfilter(lambda k: k not in keys, data_dict)
+    if isinstance(lookup_map, ReverseLookupIndex):
+        get = lookup_map.get
+        for key in keys:
+            if key in data_dict:
+                result[key] = get(data_dict[key])
+        return result
+
     for key in keys:
         if key in data_dict:
             for item in lookup_map:
@@ -10,6 +10,13 @@ from .core import (
     fmap as fmap_,
     fsplit as fsplit_
 )
+from .columnar import (
+    cextract as cextract_,
+    clookup as clookup_,
+    cmap as cmap_,
+    cremove as cremove_,
+    crename as crename_
+)
 
 
 fremove = curry(fremove_)
@@ -19,3 +26,9 @@ freverse_lookup = curry(freverse_lookup_)
 flookup = curry(flookup_)
 fmap = curry(fmap_)
 fsplit = curry(fsplit_)
+
+cextract = curry(cextract_)
+clookup = curry(clookup_)
+cmap = curry(cmap_)
+cremove = curry(cremove_)
+crename = curry(crename_)
@@ -0,0 +1,134 @@
+__all__ = [
+    'block_generator',
+    'gen_choices',
+    'gen_count',
+    'gen_numpy',
+    'gen_randint',
+    'gen_uniform',
+    'write_blocks',
+]
+
+import csv
+import random
+from collections.abc import Mapping
+from itertools import count, repeat, zip_longest
+
+
+"""
+ A column factory is a callable `factory(start, n, rng)` returning a
+ sequence of `n` values for the records numbered from `start`. `rng` is
+ a `random.Random` instance dedicated to the column.
+"""
+
+
+def gen_choices(population, weights=None):
+    population = tuple(population)
+
+    def factory(start, n, rng):
+        return rng.choices(population, weights, k=n)
+    return factory
+
+
+def gen_count(first=0, step=1):
+    def factory(start, n, rng):
+        begin = first + start * step
+        return range(begin, begin + n * step, step)
+    return factory
+
+
+def gen_numpy(distribution, *args, **kwargs):
+    """Draws values from a distribution of `numpy.random.Generator`,
+    e.g. `gen_numpy('normal', 0.0, 1.0)`. Requires NumPy"""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        raise ImportError("gen_numpy requires NumPy to be installed")
+
+    def factory(start, n, rng):
+        generator = numpy.random.default_rng(rng.getrandbits(64))
+        return getattr(generator, distribution)(*args, size=n, **kwargs)
+    return factory
+
+
+def gen_randint(a, b):
+    population = range(a, b + 1)
+
+    def factory(start, n, rng):
+        return rng.choices(population, k=n)
+    return factory
+
+
+def gen_uniform(a, b):
+    width = b - a
+
+    def factory(start, n, rng):
+        random_ = rng.random
+        return [a + width * random_() for _ in repeat(None, n)]
+    return factory
+
+
+def _constant(value):
+    def factory(start, n, rng):
+        return [value] * n
+    return factory
+
+
+def _column_rng(seed, key):
+    if isinstance(seed, Mapping):
+        return random.Random(seed.get(key))
+    elif seed is None:
+        return random.Random()
+    else:  # a column does not depend on the other columns
+        return random.Random(f'{seed}:{key}')
+
+
+def block_generator(keys, factories, nb_items, block_size=10000,
+                    as_columns=False, seed=None):
+    """Yields `nb_items` synthetic records by blocks of `block_size`,
+    each column being produced by a single call to its factory per block.
+    Non callable factories are constant values. Blocks are lists of data
+    dictionaries or, if `as_columns` is `True`, column batches. If
+    `nb_items` is negative, blocks are yielded endlessly"""
+    if block_size < 1:
+        raise ValueError("'block_size' must be a positive integer")
+
+    columns = []
+    for key, factory in zip_longest(keys, factories):
+        if not callable(factory):
+            factory = _constant(factory)
+        columns.append((key, factory, _column_rng(seed, key)))
+    keys = tuple(key for key, _, _ in columns)
+
+    starts = count(0, block_size) if nb_items < 0 \
+        else range(0, nb_items, block_size)
+    for start in starts:
+        n = block_size if nb_items < 0 else min(block_size, nb_items - start)
+        values = [factory(start, n, rng) for _, factory, rng in columns]
+        if as_columns:
+            yield dict(zip(keys, values))
+        else:
+            yield [dict(zip(keys, row)) for row in zip(*values)]
+
+
+def write_blocks(blocks, stream, header=True, delimiter=','):
+    """Writes blocks of records from `block_generator` to a text stream
+    as CSV with one `writerows` call per block and returns the number
+    of records written"""
+    writer = csv.writer(stream, delimiter=delimiter, lineterminator='\n')
+    written = 0
+    for block in blocks:
+        if isinstance(block, Mapping):  # column batch
+            keys, rows = tuple(block.keys()), list(zip(*block.values()))
+        elif block:
+            keys, rows = tuple(block[0].keys()), [
+                tuple(record.values()) for record in block
+            ]
+        else:
+            continue
+
+        if header:
+            writer.writerow(keys)
+            header = False
+        writer.writerows(rows)
+        written += len(rows)
+    return written
@@ -130,3 +130,46 @@ class mapping_rule:
     @classmethod
     def get_apply_func(cls, rules):
         return pipable(partial(cls.apply, rules))
+
+    @classmethod
+    def compile(cls, rules):
+        """Returns a pipable function equivalent to `apply` with `rules`.
+        The rules are analysed once and the source code of a function
+        dedicated to them is generated, so that applying the rules to a
+        data dictionary involves no set operations or intermediate
+        dictionaries"""
+        rules = tuple(rules)
+        involved_keys = frozenset(r.field_name for r in rules)
+
+        params = ['_involved']
+        values = [involved_keys]
+        body = ['get = ddict.get']
+        if involved_keys:
+            body.append('result = {k: v for k, v in ddict.items() '
+                        'if k not in _involved}')
+        else:
+            body.append('result = dict(ddict)')
+        if any(r.provide_all_values for r in rules):
+            body.append('all_values = tuple(ddict.items())')
+
+        for index, rule in enumerate(rules):
+            key, func = f'_k{index}', f'_f{index}'
+            params.extend((key, func))
+            values.extend((rule.field_name, rule.func))
+            if rule.provide_all_values:
+                body.append(f'result[{key}] = {func}(get({key}), all_values)')
+            else:
+                body.append(f'result[{key}] = {func}(get({key}))')
+        body.append('return result')
+
+        source = '\n'.join(
+            [f"def _make_apply_func({', '.join(params)}):",
+             '    def apply_rules(ddict):']
+            + [f'        {line}' for line in body]
+            + ['    return apply_rules']
+        )
+        namespace = {}
+        exec(compile(source, '<mapping_rule.compile>', 'exec'), namespace)
+        func = namespace['_make_apply_func'](*values)
+        func.__source__ = source
+        return pipable(func)
@@ -1,27 +1,68 @@
 from itertools import starmap, filterfalse, zip_longest
-from itertools import chain
+from itertools import chain, islice
+import itertools
 
+import collections
 import functools
+import heapq
+import logging
+import os
 from functools import reduce as reduce_
 
 import operator
+import time
 from collections import namedtuple
+from collections.abc import Iterator, Mapping, Sized
 
 import toolz
 from toolz import pipe as pipe_, compose as compose_
 
 
+from ._executors import _bounded_futures, _executor_class
 from ._iterators import _iterators_controller, _controlled_iterator
+from ._spill import _spill_file
+from ._records import record, _record_class
+
+
+_unresolved = object()  # a lookup key without value
 
 
 def aggregate(aggregator, groupings):
     if aggregator is None:
         aggregator = lambda x: x  # noqa: E731
 
-    for k, g in dict(groupings).items():
+    if isinstance(groupings, Mapping):
+        groupings = groupings.items()
+
+    for k, g in groupings:
         yield k, aggregator(g)
 
 
+def batched_lookup(resolver, key=lambda x: x, window=1000, merge=False,
+                   default=_unresolved, cache=None):
+
+    if window < 1:
+        raise ValueError("'window' must be a positive integer")
+
+    func_merge = _lookup_merge(merge)
+    if cache is None:
+        cache = lookup_cache()
+
+    def batched_lookup_(iterable):
+        it = iter(iterable)
+        while True:
+            records = list(islice(it, window))
+            if not records:
+                return
+            keys, values, pending = _lookup_window(records, key, cache)
+            if pending:
+                _store_resolved(cache, values, pending, resolver(pending))
+            yield from _merge_window(records, keys, values, func_merge,
+                                     default)
+
+    return pipable(batched_lookup_)
+
+
 def call_next(iterable):
     it = iter(iterable)
 
@@ -42,6 +83,37 @@ def compose(*funcs):
     return compose_(*funcs)
 
 
+def external_sort(iterable, key=None, memory_limit=None, reverse=False):
+    if memory_limit is None:
+        yield from sorted(iterable, key=key, reverse=reverse)
+        return
+
+    if memory_limit < 1:
+        raise ValueError("'memory_limit' must be a positive integer")
+
+    it = iter(iterable)
+    runs = []
+    try:
+        while True:
+            chunk = sorted(islice(it, memory_limit), key=key,
+                           reverse=reverse)
+            if not runs and len(chunk) < memory_limit:
+                yield from chunk  # fits in memory, no run written
+                return
+            if not chunk:
+                break
+
+            run = _spill_file()
+            runs.append(run)
+            run.extend(chunk)
+            del chunk
+
+        yield from heapq.merge(*runs, key=key, reverse=reverse)
+    finally:
+        for run in runs:
+            run.close()
+
+
 def filtertruefalse(predicate, iterable):
     src_1, src_2 = replicate(iterable)
     return filter(predicate, src_1), filterfalse(predicate, src_2)
@@ -51,6 +123,110 @@ def groupby(key, iterable):
     return toolz.groupby(key, iterable)
 
 
+def groupby_sorted(key, iterable):
+    for k, g in itertools.groupby(iterable, key):
+        yield k, list(g)
+
+
+"""
+ designing a hash join scheme.
+ - the build side is loaded in a hash table keyed by the join key
+ - the probe side is streamed and each item is matched against the table
+ if the build side exceeds memory_limit items:
+    - both sides are partitioned on the hash of their key into temporary
+      files (Grace hash join)
+    - each pair of partitions is joined the same way, partitioning again
+      with a different salt if a partition still does not fit
+"""
+
+_HASH_JOIN_MAX_DEPTH = 4
+
+
+def _hash_partition(iterable, key, partitions, depth):
+    parts = tuple(_spill_file() for _ in range(partitions))
+    for item in iterable:
+        parts[hash((depth, key(item))) % partitions].append(item)
+    return parts
+
+
+def _grace_hash_join(build, build_key, probe, probe_key, build_outer,
+                     probe_outer, memory_limit, partitions, fill_value,
+                     depth=0):
+    build = iter(build)
+    table = {}
+    size = 0
+    for item in build:
+        table.setdefault(build_key(item), []).append(item)
+        size += 1
+        if memory_limit is not None and size > memory_limit \
+                and depth < _HASH_JOIN_MAX_DEPTH:
+            build_parts = _hash_partition(
+                chain(chain.from_iterable(table.values()), build),
+                build_key, partitions, depth
+            )
+            table = None
+            probe_parts = _hash_partition(
+                probe, probe_key, partitions, depth
+            )
+            try:
+                for build_part, probe_part in zip(build_parts, probe_parts):
+                    yield from _grace_hash_join(
+                        build_part, build_key, probe_part, probe_key,
+                        build_outer, probe_outer, memory_limit, partitions,
+                        fill_value, depth + 1
+                    )
+            finally:
+                for part in build_parts + probe_parts:
+                    part.close()
+            return
+
+    matched = set()
+    for item in probe:
+        k = probe_key(item)
+        if k in table:
+            if build_outer:
+                matched.add(k)
+            for build_item in table[k]:
+                yield build_item, item
+        elif probe_outer:
+            yield fill_value, item
+
+    if build_outer:
+        for k, items in table.items():
+            if k not in matched:
+                for build_item in items:
+                    yield build_item, fill_value
+
+
+def hash_join(left, right, left_key=lambda x: x, right_key=lambda x: x,
+              how='inner', build=None, memory_limit=None, partitions=16,
+              fill_value=None):
+
+    if how not in ('inner', 'left', 'right', 'full'):
+        raise ValueError(f"Unsupported join type '{how}'")
+
+    if build is None:
+        try:
+            build = 'left' if len(left) < len(right) else 'right'
+        except TypeError:  # unsized, assume a dimension on the right
+            build = 'right'
+
+    left_outer = how in ('left', 'full')
+    right_outer = how in ('right', 'full')
+
+    if build == 'right':
+        joined = _grace_hash_join(right, right_key, left, left_key,
+                                  right_outer, left_outer, memory_limit,
+                                  partitions, fill_value)
+        return ((l_, r_) for r_, l_ in joined)
+    elif build == 'left':
+        return _grace_hash_join(left, left_key, right, right_key,
+                                left_outer, right_outer, memory_limit,
+                                partitions, fill_value)
+    else:
+        raise ValueError(f"Unsupported build side '{build}'")
+
+
 def join(*iterables, fill_value=None):
     iterators = [iter(it) for it in iterables]
     stopped_iterators = {it: False for it in iterators}
@@ -86,20 +262,109 @@ def join(*iterables, fill_value=None):
 """
 
 
-def lookup(iterable, key=lambda x: x, lookup_map=None,
-           merge=False, enable_rejects=False):
+class lookup_cache:
+    """A LRU cache of the values resolved for lookup keys. Entries
+    expire after `ttl` seconds if set. Keys that could not be resolved
+    are also cached (negative caching) for `negative_ttl` seconds,
+    which defaults to `ttl`, unless `negative_ttl` is 0"""
+    unresolved = _unresolved
+
+    def __init__(self, maxsize=100000, ttl=None, negative_ttl=None):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("'maxsize' must be a non negative integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        """Returns the value cached for `key`, `lookup_cache.unresolved`
+        for a key known as unresolved, or raises a `KeyError`"""
+        try:
+            value, expiry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        if expiry is not None and expiry <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            raise KeyError(key)
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value=_unresolved):
+        ttl = self.negative_ttl if value is _unresolved else self.ttl
+        if self.maxsize == 0 or ttl == 0:
+            return
+        expiry = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, expiry)
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _lookup_window(records, key, cache):
+    """Computes the keys of a window of records and gets their values
+    from the cache. Returns the keys, the values found and the list of
+    distinct keys left to resolve"""
+    keys = [key(r) for r in records]
+    values = {}
+    pending = []
+    for k in dict.fromkeys(keys):
+        try:
+            values[k] = cache.get(k)
+        except KeyError:
+            pending.append(k)
+    return keys, values, pending
+
+
+def _store_resolved(cache, values, pending, resolved):
+    for k in pending:
+        value = resolved.get(k, _unresolved)
+        values[k] = value
+        cache.put(k, value)
 
-    if lookup_map is None:
-        lookup_map = {}
 
+def _merge_window(records, keys, values, func_merge, default):
+    for r, k in zip(records, keys):
+        value = values[k]
+        if value is _unresolved:
+            if default is _unresolved:
+                continue
+            value = default
+        yield func_merge(r, value)
+
+
+def _lookup_merge(merge):
     if merge and callable(merge):
-        func_merge = merge
+        return merge
     elif merge:
         def func_merge(a, b):
             return a, b
     else:
         def func_merge(a, _):
             return a
+    return func_merge
+
+
+def lookup(iterable, key=lambda x: x, lookup_map=None,
+           merge=False, enable_rejects=False):
+
+    if lookup_map is None:
+        lookup_map = {}
+
+    func_merge = _lookup_merge(merge)
 
     def lookup_(it):
 
@@ -137,10 +402,73 @@ def mcompose(*funcs):
     )
 
 
+class ParallelMapError(RuntimeError):
+    """Raised by `parallel_map` when `func` fails on a record"""
+    def __init__(self, index, item, *args):
+        self.index = index
+        self.record = item
+        super().__init__(*args)
+
+
+def _map_chunk(func, start, chunk):
+    results = []
+    for index, item in enumerate(chunk, start):
+        try:
+            results.append(func(item))
+        except Exception as exc:
+            return None, (index, item, exc)
+    return results, None
+
+
+def _chunk_results(future):
+    results, error = future.result()
+    if error is not None:
+        index, item, exc = error
+        raise ParallelMapError(
+            index, item,
+            f"Exception in the mapped function on record #{index}: "
+            f"{type(exc).__name__}: {exc}"
+        ) from exc
+    return results
+
+
+def parallel_map(func, workers=None, chunksize=1000, ordered=True,
+                 mode='process'):
+
+    executor_class = _executor_class(mode)
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers  # bounds the number of records in flight
+
+    def parallel_map_(iterable):
+        it = iter(iterable)
+        position = 0
+
+        def submit(executor):
+            nonlocal position
+            chunk = list(islice(it, chunksize))
+            if not chunk:
+                return None
+            future = executor.submit(_map_chunk, func, position, chunk)
+            position += len(chunk)
+            return future
+
+        with executor_class(max_workers=workers) as executor:
+            futures = _bounded_futures(executor, submit, max_pending,
+                                       ordered)
+            try:
+                for future in futures:
+                    yield from _chunk_results(future)
+            finally:
+                futures.close()
+
+    return pipable(parallel_map_)
+
+
 class pipable(object):
     def __init__(self, callable_):
         self._callable = callable_
         assert callable(self._callable)
+        self._stages = (callable_, )
 
     def __call__(self, *args, **kwargs):
         result = self._callable(*args, **kwargs)
@@ -150,13 +478,173 @@ class pipable(object):
             return result
 
     def __or__(self, other):
-        return pipable(pipeline(self, other))
+        chain = pipable(pipeline(self, other))
+        chain._stages = self._stages + getattr(other, '_stages', (other, ))
+        return chain
 
 
-def pipeline(*funcs):
+def pipeline(*funcs, profiler=None):
+    """Left-composes `funcs`. With a `stage_profiler`, each function,
+    or each stage of a `pipable` chain, is instrumented"""
+    if profiler is not None:
+        return profiler.instrument(*funcs)
     return compose_(*reversed(funcs))
 
 
+stage_stats = namedtuple('stage_stats', ('name', 'records_in', 'records_out',
+                                         'self_time', 'items_per_sec'))
+
+
+class _stage_counters:
+    __slots__ = ('name', 'counted', 'records_out', 'call_time', 'next_time')
+
+    def __init__(self, name):
+        self.name = name
+        self.counted = False  # the source of a pipeline may not be
+        self.records_out = 0
+        self.call_time = 0.0
+        self.next_time = 0.0
+
+
+class _timed_iterator:
+    """Counts the items of the output iterator of a stage and times the
+    calls to its `__next__`, which include the pulls from upstream"""
+    __slots__ = ('_iterator', '_counters', '_profiler', '_last')
+
+    def __init__(self, iterator, counters, profiler, last=False):
+        self._iterator = iterator
+        self._counters = counters
+        self._profiler = profiler
+        self._last = last
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        counters = self._counters
+        started = time.perf_counter()
+        try:
+            item = next(self._iterator)
+        except StopIteration:
+            counters.next_time += time.perf_counter() - started
+            if self._last:
+                self._profiler._end()
+            raise
+        ended = time.perf_counter()
+        counters.next_time += ended - started
+        counters.records_out += 1
+        if ended >= self._profiler._deadline:
+            self._profiler._tick(ended)
+        return item
+
+
+def _stage_name(func):
+    func = getattr(func, '_callable', func)  # pipable
+    while isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, '__name__', type(func).__name__)
+
+
+def _publish_to_job(stats):
+    from ...jobtools.report import JobReport  # jobtools is optional here
+
+    report = JobReport.current()
+    if report is not None:
+        for stage in stats:
+            report.report(logging.INFO, _format_stage(stage))
+
+
+def _format_stage(stage):
+    records_in = '?' if stage.records_in is None else stage.records_in
+    return f"{stage.name}: {records_in} in, {stage.records_out} out, " \
+           f"{stage.self_time:.3f}s, {stage.items_per_sec:.0f} items/s"
+
+
+class stage_profiler:
+    """Counts the records in and out of each stage of the pipelines it
+    instruments, and the time spent in each stage excluding the time
+    spent pulling records from upstream. The statistics are published
+    to `publish`, by default to the current `JobReport`, when the
+    output of the pipeline is exhausted and every `interval` seconds if
+    set. A profiler instruments one pipeline at a time, its statistics
+    accumulate over the calls of this pipeline"""
+    def __init__(self, publish=None, interval=None):
+        self._publish = publish or _publish_to_job
+        self._interval = interval
+        self._deadline = float('inf')
+        self._running = False
+        self._source = _stage_counters('source')
+        self._stages = []
+
+    def instrument(self, *funcs):
+        """Returns the instrumented pipeline of `funcs`"""
+        funcs = [stage for func in funcs
+                 for stage in getattr(func, '_stages', (func, ))]
+        stages = [_stage_counters(f"{i}:{_stage_name(func)}")
+                  for i, func in enumerate(funcs, 1)]
+        source = self._source = _stage_counters('source')
+        self._stages = stages
+
+        def instrumented(data):
+            self._start()
+            data = self._count(data, source, last=not funcs)
+            for i, (func, counters) in enumerate(zip(funcs, stages), 1):
+                started = time.perf_counter()
+                data = func(data)
+                counters.call_time += time.perf_counter() - started
+                data = self._count(data, counters, last=i == len(funcs))
+            return data
+
+        return instrumented
+
+    def _count(self, data, counters, last):
+        if isinstance(data, Iterator):
+            counters.counted = True
+            return _timed_iterator(data, counters, self, last=last)
+        if isinstance(data, Sized) and \
+                not isinstance(data, (str, bytes)):
+            counters.counted = True
+            counters.records_out += len(data)
+        elif counters is not self._source:
+            counters.counted = True
+            counters.records_out += 1  # a single value, e.g. a sum
+        if last:
+            self._end()
+        return data
+
+    def _start(self):
+        self._running = True
+        if self._interval is not None:
+            self._deadline = time.perf_counter() + self._interval
+
+    def _tick(self, now):
+        self._deadline = now + self._interval
+        self._publish(self.stats())
+
+    def _end(self):
+        if self._running:
+            self._running = False
+            self._deadline = float('inf')
+            self._publish(self.stats())
+
+    def stats(self):
+        """Returns a list of `stage_stats`, one per stage"""
+        result = []
+        upstream = self._source
+        for counters in self._stages:
+            self_time = max(counters.call_time + counters.next_time -
+                            upstream.next_time, 0.0)
+            records_in = upstream.records_out if upstream.counted else None
+            processed = counters.records_out if records_in is None \
+                else records_in
+            result.append(stage_stats(
+                counters.name, records_in, counters.records_out, self_time,
+                processed / self_time if self_time else 0.0
+            ))
+            upstream = counters
+        return result
+
+
 def pipe_data_through(data, *steps):
     return pipe_(data, *steps)
 
@@ -179,7 +667,7 @@ class replicate(_iterators_controller):
             it.send(item)
 
 
-def select(predicates, iterable, strict=False):
+def _select_clauses(predicates, strict):
     if predicates is None or len(predicates) == 0:
         clauses = (
             lambda x: bool(x),
@@ -226,10 +714,18 @@ def select(predicates, iterable, strict=False):
             )
         )
         clauses = tuple(clauses) + (else_, )
+    return clauses
+
+
+def select(predicates, iterable, strict=False, max_buffer=None,
+           buffer_policy='raise'):
+    clauses = _select_clauses(predicates, strict)
 
     iterators = replicate(
                     iter(iterable),
-                    len(clauses)
+                    len(clauses),
+                    max_buffer=max_buffer,
+                    buffer_policy=buffer_policy
                 )
 
     return tuple(
@@ -315,6 +811,18 @@ class stream_converter:
         assert callable(other)
         return pipable(pipeline(self, other))
 
+    @staticmethod
+    def schema_switch_info():
+        """Statistics of the cache of record classes shared by all the
+        converters, see `functools.lru_cache`. A converter only queries
+        the cache when the schema changes from one record to the next:
+        the hits and misses count schema switches, not records"""
+        return _record_class.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        _record_class.cache_clear()
+
     @classmethod
     def dispatch(cls, from_, to_, key_type=None):
         def decorator(func):
@@ -335,6 +843,7 @@ class stream_converter:
 @stream_converter.dispatch(tuple, tuple)
 @stream_converter.dispatch(dict, dict)
 @stream_converter.dispatch(namedtuple, namedtuple)
+@stream_converter.dispatch(record, record)
 def _identity():
     return toolz.identity
 
@@ -367,7 +876,17 @@ def _convert_dict_to_tuple():
 
 @stream_converter.dispatch(dict, namedtuple)
 def _convert_dict_to_namedtuple(typename='DataStructure'):
-    return lambda d: namedtuple(typename, d.keys())._make(d.values())
+    last_keys, last_make = None, None
+
+    def convert(d):
+        nonlocal last_keys, last_make
+        keys = tuple(d)
+        if keys != last_keys:  # schema change, ask the shared cache
+            last_keys = keys
+            last_make = _record_class(namedtuple, typename, keys)._make
+        return last_make(d.values())
+
+    return convert
 
 
 @stream_converter.dispatch(namedtuple, dict)
@@ -380,6 +899,67 @@ def _convert_namedtuple_to_tuple():
     return lambda nt: tuple(nt)
 
 
+@stream_converter.dispatch(dict, record)
+def _convert_dict_to_record(typename='Record'):
+    last_keys, last_class = None, None
+
+    def convert(d):
+        nonlocal last_keys, last_class
+        keys = tuple(d)
+        if keys != last_keys:
+            last_keys = keys
+            last_class = _record_class(record, typename, keys)
+        return last_class(*d.values())
+
+    return convert
+
+
+@stream_converter.dispatch(tuple, record)
+def _convert_tuple_to_record(keys, typename='Record'):
+    if keys and len(keys):
+        return _record_class(record, typename, tuple(keys))._make
+    else:
+        raise ValueError("Converter requires non-empty 'keys' argument")
+
+
+@stream_converter.dispatch(namedtuple, record)
+def _convert_namedtuple_to_record(typename='Record'):
+    last_fields, last_class = None, None
+
+    def convert(nt):
+        nonlocal last_fields, last_class
+        if nt._fields is not last_fields:
+            last_fields = nt._fields
+            last_class = _record_class(record, typename, nt._fields)
+        return last_class(*nt)
+
+    return convert
+
+
+@stream_converter.dispatch(record, dict)
+def _convert_record_to_dict():
+    return lambda r: r._asdict()
+
+
+@stream_converter.dispatch(record, tuple)
+def _convert_record_to_tuple():
+    return lambda r: r._astuple()
+
+
+@stream_converter.dispatch(record, namedtuple)
+def _convert_record_to_namedtuple(typename='DataStructure'):
+    last_fields, last_make = None, None
+
+    def convert(r):
+        nonlocal last_fields, last_make
+        if r._fields is not last_fields:
+            last_fields = r._fields
+            last_make = _record_class(namedtuple, typename, r._fields)._make
+        return last_make(r._astuple())
+
+    return convert
+
+
 def stream_generator(keys, funcs, nb_items):
 
     key_func = {}
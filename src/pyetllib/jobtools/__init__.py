@@ -1,4 +1,6 @@
 # flake8: noqa
 from .core import Job
+from .pool import JobPool, JobPoolSummary
+from .dag import JobGraph, JobGraphResult
 from .report import JobReport, get_report
 from .exceptions import *
@@ -1,9 +1,32 @@
 import functools
+import threading
 
 
 from ._config import log_levels
 
 
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover, Python 3.6
+    class ContextVar:
+        """Minimal thread-local stand-in for `contextvars.ContextVar`"""
+        def __init__(self, name, default=None):
+            self.name = name
+            self._default = default
+            self._local = threading.local()
+
+        def get(self):
+            return getattr(self._local, 'value', self._default)
+
+        def set(self, value):
+            token = self.get()
+            self._local.value = value
+            return token
+
+        def reset(self, token):
+            self._local.value = token
+
+
 import platform
 if platform.system().lower() == 'windows':
     from ctypes import windll, c_int, byref
@@ -27,6 +50,10 @@ _dynamic_methods = {
 }
 
 
+"""Name of the job being run by `Job.run` in the current thread or task"""
+_current_job = ContextVar('current_job', default=None)
+
+
 def _dispatch_dynamic_methods(obj, helper, *args, descriptor=None):
     """Helper to avoid repeating the same pattern when defining
     the reporting methods"""
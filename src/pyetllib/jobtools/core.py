@@ -6,27 +6,34 @@ import functools
 import time
 import datetime as dt
 import os
+import pathlib
+import sys
 
+from .metrics import JobMetrics, format_metrics
+from .profiling import PROFILERS
 from .report import JobReport, get_report
 from .exceptions import JobAttributeError
 from .exceptions import JobImportError, JobNotCallable
 from .exceptions import BadJobRefError, BaseJobException
 
 from ._internals import _init_dynamic_methods, _dispatch_dynamic_methods
-from ._internals import _InternalExceptionWrapper
+from ._internals import _InternalExceptionWrapper, _current_job
 
 
 @_init_dynamic_methods
 class Job:
     """Defines a job either as a regular functions wrapped with
     a decorator or as a subclass"""
+    profile_top = 10  # number of hot functions logged by a profiled run
+
     def __new__(cls, *args, **kwargs):
         _dispatch_dynamic_methods(cls, cls._report_helper_default,
                                   descriptor=staticmethod)
         return super().__new__(cls)
 
     def __init__(self, name=None, func=None, use_job=False,
-                 color_output=True, use_stream=False, logfile=None):
+                 color_output=True, use_stream=False, logfile=None,
+                 queued=False, log_metrics=False):
         self.func = func
 
         if self.func:
@@ -39,12 +46,17 @@ class Job:
         self._logfile = logfile
         self._use_stream = use_stream
         self._stream = None
+        self._queued = queued
+        self._log_metrics = log_metrics
 
         # prologue and epilogue statistics/information
         self.started_at = None
         self.pid = None
         self.ended_at = None
         self.elapsed = None
+        self.metrics = None
+        self._metrics = None
+        self._profiler = None
 
     @property
     def color_output(self):
@@ -58,12 +70,22 @@ class Job:
     def stream(self):
         return self._stream
 
+    @property
+    def queued(self):
+        return self._queued
+
+    @property
+    def log_metrics(self):
+        return self._log_metrics
+
     @classmethod
     def declare(cls, name=None, use_job=False,
-                color_output=True, use_stream=False, logfile=None):
+                color_output=True, use_stream=False, logfile=None,
+                queued=False, log_metrics=False):
 
         job = Job(name=name, use_job=use_job, use_stream=use_stream,
-                  color_output=color_output, logfile=logfile)
+                  color_output=color_output, logfile=logfile, queued=queued,
+                  log_metrics=log_metrics)
 
         def decorator(f):
             assert job.func is None, "You're attempting to redefine the " \
@@ -134,10 +156,26 @@ class Job:
 
     @classmethod
     def execute(cls, job_ref, *args, module_name='', color_output=None,
-                logfile=None, stream=None, **kwargs):
+                logfile=None, stream=None, profile=None, **kwargs):
         job = cls.load(job_ref, module_name=module_name)
         return job.run(*args, color_output=color_output, logfile=logfile,
-                       stream=stream, **kwargs)
+                       stream=stream, profile=profile, **kwargs)
+
+    @classmethod
+    def execute_many(cls, jobs, *args, max_workers=None, mode='thread',
+                     module_name='', color_output=None, stream=None,
+                     buffer_output=True, **kwargs):
+        """Runs independent jobs concurrently and returns their
+        `JobPool`, which yields the reports as the jobs complete"""
+        from .pool import JobPool  # the pool module depends on this one
+
+        pool = JobPool(max_workers=max_workers, mode=mode, stream=stream,
+                       buffer_output=buffer_output)
+        for job_ref in jobs:
+            pool.submit(job_ref, *args, module_name=module_name,
+                        color_output=color_output, **kwargs)
+        pool.shutdown(wait=False)  # the submitted jobs keep running
+        return pool
 
     def prepare(self, color_output, logfile, stream):
         _dispatch_dynamic_methods(self, Job._report_helper, self.name)
@@ -145,7 +183,8 @@ class Job:
         JobReport.register(self.name,
                            color_output=self.color_output,
                            logfile=self.logfile,
-                           stream=self.stream)
+                           stream=self.stream,
+                           queued=self.queued)
 
         if color_output is not None:
             self.reset_color_output(color_output)
@@ -155,8 +194,10 @@ class Job:
             self.reset_stream(stream)
 
     def run(self, *args, color_output=None, logfile=None, stream=None,
-            **kwargs):
+            profile=None, **kwargs):
 
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"Unsupported profiler '{profile}'")
         self.prepare(color_output, logfile, stream)
 
         _report = None
@@ -168,9 +209,15 @@ class Job:
 
         outcome = False
         result = None
+        token = _current_job.set(self.name)
         try:
             self.__prologue__()
-            result = self._run(*args, **kwargs)
+            if profile is None:
+                result = self._run(*args, **kwargs)
+            else:
+                self._profiler = PROFILERS[profile]()
+                with self._profiler:
+                    result = self._run(*args, **kwargs)
             outcome = True
         except BaseJobException:
             raise
@@ -179,9 +226,12 @@ class Job:
             outcome = False
         finally:
             self.__epilogue__(outcome)
+            self._profiler = None
+            _current_job.reset(token)
             _report = JobReport.get_report(self.name)
             _report.set_pid(self.pid)
             _report.set_result(result)
+            _report.set_metrics(self.metrics)
             _report = JobReport.detach(_report)
 
         return _report
@@ -190,8 +240,10 @@ class Job:
         self.started_at = (dt.datetime.now(), time.perf_counter())
         self.pid = os.getpid()
         self.prologue(f"Started at {self.started_at[0].strftime('%H:%M:%S')}")
+        self._metrics = JobMetrics().start()
 
     def __epilogue__(self, success):
+        self.metrics = self._metrics.stop()
         self.ended_at = (dt.datetime.now(), time.perf_counter())
         self.elapsed = self.ended_at[1] - self.started_at[1]
         unit = 's'  # for seconds
@@ -205,12 +257,33 @@ class Job:
 
         self.epilogue(f"Finished at {self.ended_at[0].strftime('%H:%M:%S')}")
         self.epilogue(f"Total elapsed time: {self.elapsed}{unit}")
+        if self._log_metrics:
+            for line in format_metrics(self.metrics):
+                self.epilogue(line)
+        if self._profiler is not None:
+            self.__profile_epilogue__()
 
         if success:
             self.ok("Outcome is a success")
         else:
             self.fail("Outcome is a failure")
 
+    def __profile_epilogue__(self):
+        """Writes the profile next to the log file, or to the current
+        directory, and logs the hottest functions"""
+        suffix = self._profiler.suffix
+        if self._logfile is not None:
+            path = pathlib.Path(self._logfile).with_suffix(suffix)
+        else:
+            path = pathlib.Path(f"{self.name}{suffix}")
+        try:
+            self._profiler.save(path)
+            self.epilogue(f"Profile written to {path}")
+        except OSError as exc:
+            self.warning(f"Could not write the profile to {path}: {exc}")
+        for line in self._profiler.top(self.profile_top):
+            self.epilogue(line)
+
     @abstractmethod
     def __run__(self, *args, **kwargs):  # pragma: no cover
         raise NotImplementedError
@@ -221,6 +294,7 @@ class Job:
                            color_output=value,
                            logfile=self._logfile,
                            stream=self._stream,
+                           queued=self._queued,
                            force=True)
 
     def reset_logfile(self, value):
@@ -229,6 +303,7 @@ class Job:
                            color_output=value,
                            logfile=self._logfile,
                            stream=self._stream,
+                           queued=self._queued,
                            force=True)
 
     def reset_stream(self, value):
@@ -237,6 +312,7 @@ class Job:
                            color_output=self._color_output,
                            logfile=self._logfile,
                            stream=value,
+                           queued=self._queued,
                            force=True)
 
     def _run(self, *args, **kwargs):
@@ -266,6 +342,7 @@ class Job:
 
     @staticmethod
     def _report_helper_default(level, msg, *args, **kwargs):
-        frame = inspect.stack()
-        name = frame[1].function
+        name = _current_job.get()
+        if name is None:  # outside of Job.run, the caller names the job
+            name = sys._getframe(1).f_code.co_name
         Job._report_helper(name, level, msg, *args, **kwargs)
@@ -0,0 +1,187 @@
+import inspect
+from collections import namedtuple
+
+from .core import Job
+from .exceptions import JobAlreadyRegistered, JobDependencyError
+from .pool import JobPool
+
+
+_node = namedtuple('_node', ('job_ref', 'args', 'kwargs', 'module_name',
+                             'dependencies'))
+
+
+def _job_name(job_ref):
+    if isinstance(job_ref, str):
+        return job_ref
+    elif isinstance(job_ref, Job):
+        return job_ref.name
+    elif inspect.isclass(job_ref) and issubclass(job_ref, Job):
+        return job_ref.__name__
+    raise JobDependencyError(f"Unexpected type <{type(job_ref).__name__}> "
+                             f"for a job dependency")
+
+
+class JobGraph:
+    """Declares jobs and their dependencies, then runs them on a pool of
+    workers as soon as their dependencies succeed. The jobs depending
+    on a failed job are skipped"""
+    def __init__(self):
+        self._nodes = {}
+
+    def add(self, job_ref, *args, depends_on=(), module_name='', **kwargs):
+        """Adds a job that runs with `args` and `kwargs` once the jobs of
+        `depends_on`, referred to by name or `Job`, have succeeded.
+        Returns the name of the job"""
+        name = Job.load(job_ref, module_name=module_name).name
+        if name in self._nodes:
+            raise JobAlreadyRegistered(f"A job with name '{name}' was "
+                                       f"already added to the graph")
+        if isinstance(depends_on, (str, Job)) or inspect.isclass(depends_on):
+            depends_on = (depends_on, )
+        dependencies = tuple(dict.fromkeys(map(_job_name, depends_on)))
+        self._nodes[name] = _node(job_ref, args, kwargs, module_name,
+                                  dependencies)
+        return name
+
+    def dependencies(self, name):
+        return self._nodes[name].dependencies
+
+    def order(self):
+        """Returns the job names in a topological order, or raises a
+        `JobDependencyError` if a dependency is unknown or circular"""
+        for name, node in self._nodes.items():
+            for dependency in node.dependencies:
+                if dependency not in self._nodes:
+                    raise JobDependencyError(
+                        f"Job '{name}' depends on the unknown job "
+                        f"'{dependency}'"
+                    )
+
+        remaining = {name: len(node.dependencies)
+                     for name, node in self._nodes.items()}
+        dependents = self._dependents()
+        order = [name for name, count in remaining.items() if count == 0]
+        for name in order:  # the list grows while iterating
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+
+        if len(order) < len(self._nodes):
+            cycle = sorted(name for name, count in remaining.items()
+                           if count > 0)
+            raise JobDependencyError(f"Circular dependencies between the "
+                                     f"jobs {', '.join(cycle)}")
+        return order
+
+    def _dependents(self):
+        dependents = {name: [] for name in self._nodes}
+        for name, node in self._nodes.items():
+            for dependency in node.dependencies:
+                dependents[dependency].append(name)
+        return dependents
+
+    def run(self, max_workers=None, mode='thread', color_output=None,
+            stream=None, buffer_output=True):
+        """Runs the jobs with maximum parallelism and returns a
+        `JobGraphResult`"""
+        self.order()  # validates the graph before running anything
+        dependents = self._dependents()
+        remaining = {name: len(node.dependencies)
+                     for name, node in self._nodes.items()}
+        skipped = {}
+
+        def submit(name):
+            node = self._nodes[name]
+            try:
+                pool.submit(node.job_ref, *node.args,
+                            module_name=node.module_name,
+                            color_output=color_output, **node.kwargs)
+            except Exception as e:
+                pool._set_failed(name, e)
+                settle(name)
+
+        def settle(name):
+            """Schedules or skips the dependents of a settled job"""
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] > 0:
+                    continue
+                upstream = [d for d in self._nodes[dependent].dependencies
+                            if d in skipped or d not in pool.reports
+                            or pool.reports[d].failure]
+                if upstream:
+                    skipped[dependent] = tuple(upstream)
+                    settle(dependent)
+                else:
+                    submit(dependent)
+
+        with JobPool(max_workers=max_workers, mode=mode, stream=stream,
+                     buffer_output=buffer_output) as pool:
+            for name, count in remaining.items():
+                if count == 0:
+                    submit(name)
+            for report in pool:
+                settle(report.name)
+
+        return JobGraphResult(self, pool.reports, skipped, pool.timings,
+                              pool.summary)
+
+
+class JobGraphResult:
+    """Outcome of a `JobGraph` run"""
+    def __init__(self, graph, reports, skipped, timings, summary):
+        self.reports = dict(reports)
+        self.skipped = dict(skipped)
+        self.timings = dict(timings)
+        self.summary = summary
+        self._order = [name for name in graph.order()
+                       if name in self.reports]
+        self.critical_path, self.critical_time = \
+            self._critical_path(graph)
+
+    @property
+    def success(self):
+        return not self.skipped and \
+            not any(r.failure for r in self.reports.values())
+
+    @property
+    def failures(self):
+        return [name for name in self._order
+                if self.reports[name].failure]
+
+    def _critical_path(self, graph):
+        """The chain of dependent jobs with the longest summed time"""
+        finish = {}
+        previous = {}
+        for name in self._order:
+            start, before = 0.0, None
+            for dependency in graph.dependencies(name):
+                if dependency in finish and \
+                        (before is None or finish[dependency] > start):
+                    start, before = finish[dependency], dependency
+            finish[name] = start + self.timings[name]
+            previous[name] = before
+
+        if not finish:
+            return [], 0.0
+        name = max(finish, key=finish.get)
+        total = finish[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
+
+    def __str__(self):
+        lines = [str(self.summary),
+                 f"Critical path: {' > '.join(self.critical_path)} "
+                 f"({self.critical_time:.2f}s)"]
+        for name in self._order:
+            outcome = 'failure' if self.reports[name].failure else 'success'
+            lines.append(f"  {name:20s} {self.timings[name]:>10.2f}s "
+                         f"{outcome}")
+        for name, upstream in self.skipped.items():
+            lines.append(f"  {name:20s} {'':>11s} skipped "
+                         f"(upstream failure: {', '.join(upstream)})")
+        return '\n'.join(lines)
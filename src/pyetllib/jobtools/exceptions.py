@@ -24,3 +24,7 @@ class JobNotCallable(BaseJobException, TypeError):
 
 class BadJobRefError(BaseJobException, TypeError):
     ...
+
+
+class JobDependencyError(BaseJobException, ValueError):
+    ...
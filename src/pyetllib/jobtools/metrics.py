@@ -0,0 +1,120 @@
+import gc
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # not available on Windows
+
+
+_PROC_IO = '/proc/self/io'
+
+_IO_FIELDS = {
+    'rchar': 'read_bytes',
+    'wchar': 'write_bytes',
+    'read_bytes': 'disk_read_bytes',
+    'write_bytes': 'disk_write_bytes',
+}
+
+
+def _read_proc_io():
+    """The I/O counters of the process, or None where /proc is missing"""
+    try:
+        with open(_PROC_IO) as proc_io:
+            lines = proc_io.read().splitlines()
+    except OSError:
+        return None
+    counters = {}
+    for line in lines:
+        field, _, value = line.partition(':')
+        if field in _IO_FIELDS:
+            counters[_IO_FIELDS[field]] = int(value)
+    return counters
+
+
+def _max_rss(usage):
+    # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+    if sys.platform == 'darwin':  # pragma: no cover
+        return usage.ru_maxrss
+    return usage.ru_maxrss * 1024
+
+
+class JobMetrics:
+    """Measures the resources used by the process between `start` and
+    `stop`. CPU times, I/O counters and GC statistics are process-wide:
+    they include the work of the jobs running concurrently in threads.
+    The peak RSS is the peak of the process since it started"""
+    def __init__(self):
+        self._started = None
+        self._usage = None
+        self._io = None
+        self._gc_started = {}
+        self.gc_collections = 0
+        self.gc_time = 0.0
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_started[info['generation']] = time.perf_counter()
+        else:
+            started = self._gc_started.pop(info['generation'], None)
+            if started is not None:
+                self.gc_collections += 1
+                self.gc_time += time.perf_counter() - started
+
+    def start(self):
+        gc.callbacks.append(self._on_gc)
+        self._io = _read_proc_io()
+        if resource is not None:
+            self._usage = resource.getrusage(resource.RUSAGE_SELF)
+        self._started = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Stops measuring and returns the metrics as a `dict`"""
+        wall_time = time.perf_counter() - self._started
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+        metrics = {'wall_time': wall_time,
+                   'user_time': None,
+                   'system_time': None,
+                   'max_rss': None}
+        if self._usage is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            metrics['user_time'] = usage.ru_utime - self._usage.ru_utime
+            metrics['system_time'] = usage.ru_stime - self._usage.ru_stime
+            metrics['max_rss'] = _max_rss(usage)
+
+        io = _read_proc_io()
+        for field in _IO_FIELDS.values():
+            metrics[field] = None
+            if io is not None and self._io is not None and field in io:
+                metrics[field] = io[field] - self._io.get(field, 0)
+
+        metrics['gc_collections'] = self.gc_collections
+        metrics['gc_time'] = self.gc_time
+        return metrics
+
+
+def _size(value):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            break
+        value /= 1024
+    return f"{value:.0f}{unit}" if unit == 'B' else f"{value:.1f}{unit}"
+
+
+def format_metrics(metrics):
+    """Human readable lines describing a `dict` of metrics"""
+    lines = []
+    if metrics.get('user_time') is not None:
+        lines.append(f"CPU time: user {metrics['user_time']:.2f}s, "
+                     f"system {metrics['system_time']:.2f}s")
+        lines.append(f"Peak RSS: {_size(metrics['max_rss'])}")
+    if metrics.get('read_bytes') is not None:
+        lines.append(f"I/O: read {_size(metrics['read_bytes'])}, "
+                     f"written {_size(metrics['write_bytes'])}")
+    lines.append(f"GC: {metrics['gc_collections']} collections, "
+                 f"{metrics['gc_time'] * 1000.0:.1f}ms")
+    return lines
@@ -0,0 +1,156 @@
+import concurrent.futures
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+
+from ..etllib.tools._executors import _executor_class
+from .core import Job
+from .exceptions import JobAlreadyRegistered
+from .report import JobReport, _restore_report
+
+
+def _run_isolated(job_ref, args, kwargs, module_name, color_output,
+                  logfile, stream, buffer_output):
+    """Runs a job in a worker and returns its report, its buffered
+    output and its duration"""
+    if buffer_output:
+        stream = io.StringIO()
+    started = time.perf_counter()
+    report = Job.execute(job_ref, *args, module_name=module_name,
+                         color_output=color_output, logfile=logfile,
+                         stream=stream, **kwargs)
+    elapsed = time.perf_counter() - started
+    return report, stream.getvalue() if buffer_output else '', elapsed
+
+
+class JobPoolSummary(namedtuple('JobPoolSummary',
+                                ('jobs', 'failures', 'wall_time',
+                                 'job_time'))):
+    """Outcome of a pool: the number of jobs and failed jobs, the wall
+    time of the pool and the summed time of its jobs, in seconds"""
+    __slots__ = ()
+
+    @property
+    def speedup(self):
+        return self.job_time / self.wall_time if self.wall_time else 0.0
+
+    def __str__(self):
+        return f"{self.jobs} jobs, {self.failures} failures, " \
+               f"wall time {self.wall_time:.2f}s, " \
+               f"summed job time {self.job_time:.2f}s " \
+               f"(x{self.speedup:.2f})"
+
+
+class JobPool:
+    """Runs independent jobs concurrently in a pool of threads or
+    processes. Iterating over a pool yields the reports of its jobs as
+    they complete"""
+    def __init__(self, max_workers=None, mode='thread', stream=None,
+                 buffer_output=True):
+        executor_class = _executor_class(mode)
+        self._mode = mode
+        self._executor = executor_class(
+            max_workers=max_workers or os.cpu_count() or 1
+        )
+        self._stream = stream
+        self._buffer_output = buffer_output
+        self._futures = {}
+        self._started_at = None
+        self._ended_at = None
+        self.timings = {}
+        self.reports = {}
+
+    def submit(self, job_ref, *args, module_name='', color_output=None,
+               logfile=None, **kwargs):
+        """Schedules a job and returns a future of its report. In
+        'process' mode, jobs must be referred to by name or by `Job`
+        subclass"""
+        job = Job.load(job_ref, module_name=module_name)
+        if job.name in self._futures.values():
+            raise JobAlreadyRegistered(f"A job with name '{job.name}' "
+                                       f"was already submitted to the pool")
+        stream = None
+        if self._mode == 'thread':
+            job_ref = job
+            stream = self._stream  # streams cannot be sent to processes
+
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        future = self._executor.submit(
+            _run_isolated, job_ref, args, kwargs, module_name,
+            color_output, logfile, stream, self._buffer_output
+        )
+        report_future = concurrent.futures.Future()
+
+        def on_done(f):
+            self._ended_at = time.perf_counter()
+            if f.exception() is not None:
+                report_future.set_exception(f.exception())
+            else:
+                report_future.set_result(f.result()[0])
+
+        future.add_done_callback(on_done)
+        self._futures[future] = job.name
+        return report_future
+
+    def as_completed(self):
+        """Yields the reports of the submitted jobs as they complete,
+        including the jobs submitted during the iteration, and writes
+        their buffered output. A job that could not run, its report
+        failing to register or its arguments failing to be sent to a
+        worker, yields a failed report holding the exception"""
+        stream = self._stream or sys.stdout
+        while True:
+            pending = [f for f, name in self._futures.items()
+                       if name not in self.reports]
+            if not pending:
+                return
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                try:
+                    report, output, elapsed = future.result()
+                except Exception as e:
+                    yield self._set_failed(self._futures[future], e)
+                    continue
+                if output:
+                    stream.write(output)
+                self.timings[report.name] = elapsed
+                self.reports[report.name] = report
+                yield report
+
+    def _set_failed(self, name, exception):
+        """Records and returns a failed report for a job that could not
+        run"""
+        report = _restore_report(JobReport, name, None, exception)
+        self.timings[name] = 0.0
+        self.reports[name] = report
+        return report
+
+    def __iter__(self):
+        return self.as_completed()
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    @property
+    def summary(self):
+        """A `JobPoolSummary` of the completed jobs"""
+        wall_time = 0.0
+        if self._started_at is not None and self._ended_at is not None:
+            wall_time = self._ended_at - self._started_at
+        return JobPoolSummary(
+            len(self.reports),
+            sum(1 for r in self.reports.values() if r.failure),
+            wall_time,
+            sum(self.timings.values())
+        )
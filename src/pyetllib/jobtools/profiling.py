@@ -0,0 +1,120 @@
+import cProfile
+import collections
+import pstats
+import signal
+import sys
+import threading
+
+
+class _cprofile_profiler:
+    """Profiles the calls of the thread running the job with cProfile"""
+    suffix = '.prof'
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def __enter__(self):
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profile.disable()
+
+    def save(self, path):
+        self._profile.dump_stats(str(path))
+
+    def top(self, n):
+        """The `n` functions with the longest own time"""
+        stats = pstats.Stats(self._profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][2],
+                      reverse=True)[:n]
+        return [f"{own_time:.3f}s in {calls} calls of "
+                f"{pstats.func_std_string(func)}"
+                for func, (_, calls, own_time, _, _) in rows]
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class _sampling_profiler:
+    """Samples the stack of the thread running the job every `interval`
+    seconds. In the main thread, the samples are taken by a SIGPROF
+    handler every `interval` seconds of CPU time. Elsewhere, signals
+    cannot be handled, and a thread samples every `interval` seconds of
+    wall time instead"""
+    suffix = '.collapsed'
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = collections.Counter()
+        self._root = None
+        self._handler = None
+        self._sampler = None
+        self._stop = threading.Event()
+
+    def _sample(self, frame):
+        stack = []
+        while frame is not None and frame is not self._root:
+            stack.append(_frame_name(frame))
+            frame = frame.f_back
+        if stack:
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def _on_signal(self, signum, frame):
+        self._sample(frame)
+
+    def _sample_thread(self, thread_id):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self._sample(frame)
+
+    def __enter__(self):
+        self._root = sys._getframe(1)  # the frame running the job
+        if hasattr(signal, 'SIGPROF') and \
+                threading.current_thread() is threading.main_thread():
+            self._handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval,
+                             self.interval)
+        else:
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_thread, args=(threading.get_ident(), ),
+                daemon=True
+            )
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        else:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._handler)
+        self._root = None
+
+    def save(self, path):
+        """Writes the samples as collapsed stacks, the input format of
+        flame graph tools"""
+        with open(path, 'w', encoding='utf-8') as collapsed:
+            for stack, count in self.samples.most_common():
+                collapsed.write(f"{stack} {count}\n")
+
+    def top(self, n):
+        """The `n` functions found the most often on top of the stack"""
+        total = sum(self.samples.values())
+        leaves = collections.Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rpartition(';')[2]] += count
+        return [f"{100.0 * count / total:.1f}% of {total} samples in "
+                f"{name}" for name, count in leaves.most_common(n)]
+
+
+PROFILERS = {
+    'cprofile': _cprofile_profiler,
+    'sampling': _sampling_profiler,
+}
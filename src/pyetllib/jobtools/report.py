@@ -1,11 +1,15 @@
+import json
 import logging
-import copy
+import logging.handlers
+import queue
 import sys
+import threading
 
 from .exceptions import JobAlreadyRegistered, JobReportNotFound
 
 from ._config import log_levels
 from ._internals import _init_dynamic_methods, _dispatch_dynamic_methods
+from ._internals import _current_job
 
 logging.addLevelName(log_levels.OK, 'OK')
 logging.addLevelName(log_levels.FAIL, 'FAIL')
@@ -52,9 +56,31 @@ COLORS = {
 
 
 class ColoredFormatter(logging.Formatter):
+    """Colors the level name and the message of the records whose level
+    has a color. The records are not copied: the colored values are only
+    substituted in the mapping the format is applied to"""
+
+    _level_names = {}  # colored level names per color mode
+
     def __init__(self, fmt, color_output=True):
         logging.Formatter.__init__(self, fmt)
         self.color_output = color_output
+        if color_output not in self._level_names:
+            self._level_names[color_output] = self._color_levels(color_output)
+        self._colors = self._level_names[color_output]
+
+    @classmethod
+    def _color_levels(cls, color_output):
+        """Maps each colored level to its colored name and the sequence
+        starting the color of its messages"""
+        if not color_output:
+            return {}
+        return {
+            levelno: (cls.set_str_color(logging.getLevelName(levelno),
+                                        color, bright=True),
+                      COLOR_SEQ % (30 + color))
+            for levelno, color in COLORS.items()
+        }
 
     @staticmethod
     def set_str_color(s, color, bright=False):
@@ -63,18 +89,66 @@ class ColoredFormatter(logging.Formatter):
         else:
             return COLOR_SEQ % (30 + color) + s + RESET_SEQ
 
-    def format(self, record):
-        levelno = record.levelno
-        if self.color_output and levelno in COLORS:
-            color = COLORS[levelno]
+    def formatMessage(self, record):
+        colors = self._colors.get(record.levelno)
+        if colors is None:
+            return logging.Formatter.formatMessage(self, record)
+        levelname, color_seq = colors
+        values = dict(record.__dict__, levelname=levelname,
+                      message=color_seq + record.message + RESET_SEQ)
+        return self._fmt % values
 
-            color_record = copy.deepcopy(record)
-            color_record.levelname = self.set_str_color(record.levelname,
-                                                        color, bright=True)
-            color_record.msg = self.set_str_color(record.msg, color)
-        else:
-            color_record = record
-        return logging.Formatter.format(self, color_record)
+
+class _flush_marker:
+    """Queued after the records of a report, it is handled once they
+    all have been"""
+    __slots__ = ('flushed', )
+
+    def __init__(self):
+        self.flushed = threading.Event()
+
+
+class _SharedListener:
+    """Handles the records queued by all the reports using the shared
+    listener, each with the handlers of its own report"""
+    def __init__(self):
+        self.queue = queue.Queue()
+        self._handlers = {}
+        self._listener = logging.handlers.QueueListener(self.queue, self)
+        self._listener.start()
+
+    def attach(self, name, handlers):
+        self._handlers[name] = handlers
+
+    def detach(self, name, handlers):
+        """Waits for the records already queued by a report to be
+        handled, then forgets its handlers. The records queued later by
+        other reports are not waited for"""
+        marker = _flush_marker()
+        self.queue.put(marker)
+        marker.flushed.wait()
+        if self._handlers.get(name) is handlers:
+            del self._handlers[name]
+
+    def handle(self, record):
+        if isinstance(record, _flush_marker):
+            record.flushed.set()
+            return
+        for handler in self._handlers.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_shared_listener = None
+_shared_listener_lock = threading.Lock()
+
+
+def _get_shared_listener():
+    global _shared_listener
+    with _shared_listener_lock:
+        if _shared_listener is None:
+            _shared_listener = _SharedListener()
+    return _shared_listener
 
 
 @_init_dynamic_methods
@@ -93,10 +167,17 @@ class JobReport(logging.Logger):
         _dispatch_dynamic_methods(cls, cls.report)
         return super().__new__(cls)
 
-    def __init__(self, job_name, color_output=True, logfile=None, stream=None):
+    def __init__(self, job_name, color_output=True, logfile=None, stream=None,
+                 queued=False):
+
+        if queued not in (False, True, 'shared'):
+            raise ValueError(f"Unsupported queue mode '{queued}'")
 
         self.name = job_name
         self._on_finalize = None
+        self._listener = None
+        self._queued = queued
+        self._queued_handlers = None
         stream = stream or sys.stdout
         super().__init__(job_name, level=logging.INFO)
 
@@ -110,18 +191,34 @@ class JobReport(logging.Logger):
 
         console = logging.StreamHandler(stream=stream)
         console.setFormatter(formatter)
-
-        self.addHandler(console)
+        handlers = [console]
 
         if logfile is not None:
             logfile = logging.FileHandler(logfile, encoding='utf-8')
             logfile.setFormatter(ColoredFormatter(self.PLAIN_FORMAT,
                                                   color_output=False))
             self._on_finalize = logfile.close
-            self.addHandler(logfile)
+            handlers.append(logfile)
+
+        if queued == 'shared':
+            listener = _get_shared_listener()
+            listener.attach(job_name, handlers)
+            self._queued_handlers = handlers
+            self.addHandler(logging.handlers.QueueHandler(listener.queue))
+        elif queued:
+            records = queue.Queue()
+            self._listener = logging.handlers.QueueListener(
+                records, *handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            self.addHandler(logging.handlers.QueueHandler(records))
+        else:
+            for handler in handlers:
+                self.addHandler(handler)
 
         self._pid = None
         self._result = None
+        self._metrics = {}
 
     def set_result(self, result):
         self._result = result
@@ -135,6 +232,16 @@ class JobReport(logging.Logger):
     def get_pid(self):
         return self._pid
 
+    def set_metrics(self, metrics):
+        self._metrics = dict(metrics)
+
+    def get_metrics(self):
+        """The resources used by the job, see `JobMetrics`"""
+        return dict(self._metrics)
+
+    def metrics_to_json(self, **kwargs):
+        return json.dumps(self._metrics, **kwargs)
+
     @property
     def success(self):
         return not isinstance(self._result, Exception)
@@ -143,7 +250,18 @@ class JobReport(logging.Logger):
     def failure(self):
         return isinstance(self._result, Exception)
 
+    @property
+    def queued(self):
+        return self._queued
+
     def finalize(self):
+        """Flushes the queued records, if any, and closes the log file.
+        A report can be finalized more than once"""
+        if self._listener is not None:
+            self._listener.stop()  # handles the queued records first
+            self._listener = None
+        elif self._queued == 'shared':
+            _get_shared_listener().detach(self.name, self._queued_handlers)
         if self._on_finalize:
             self._on_finalize()
 
@@ -156,6 +274,13 @@ class JobReport(logging.Logger):
                                     f"could not be found "
                                     f"in the registry")
 
+    @classmethod
+    def current(cls):
+        """The report of the job being run in the current thread or task,
+        or None"""
+        name = _current_job.get()
+        return cls.reports.get(name) if name is not None else None
+
     @classmethod
     def detach(cls, report):
         report.finalize()
@@ -165,7 +290,7 @@ class JobReport(logging.Logger):
 
     @classmethod
     def register(cls, job_name, color_output=True, logfile=None,
-                 stream=None, force=False):
+                 stream=None, force=False, queued=False):
 
         if job_name in cls.reports:
             if force:
@@ -179,10 +304,28 @@ class JobReport(logging.Logger):
         cls.reports[job_name] = JobReport(job_name,
                                           color_output=color_output,
                                           logfile=logfile,
-                                          stream=stream)
+                                          stream=stream,
+                                          queued=queued)
 
     def report(self, level, msg, *args, **kwargs):
         self.log(level, msg, *args, **kwargs)
 
+    def __reduce__(self):
+        # a report is sent between processes without its handlers
+        return _restore_report, (type(self), self.name, self._pid,
+                                 self._result, self._metrics)
+
+
+def _restore_report(cls, name, pid, result, metrics=None):
+    report = cls.__new__(cls)
+    logging.Logger.__init__(report, name, level=logging.INFO)
+    report._on_finalize = None
+    report._listener = None
+    report._queued = False
+    report.set_pid(pid)
+    report.set_result(result)
+    report.set_metrics(metrics or {})
+    return report
+
 
 get_report = JobReport.get_report
@@ -0,0 +1,141 @@
+from unittest import TestCase, main as run_tests
+
+import operator
+import random
+import statistics
+
+from src.pyetllib.etllib import aggregate, groupby
+from src.pyetllib.etllib import (
+    agg_count,
+    agg_distinct,
+    agg_first,
+    agg_last,
+    agg_max,
+    agg_mean,
+    agg_min,
+    agg_sum,
+    agg_top_k,
+    agg_variance,
+    merge_aggregates,
+    streaming_aggregate,
+)
+
+
+class TestAggregators(TestCase):
+    def setUp(self) -> None:
+        self.values = [3, 1, 4, 1, 5, 9, 2, 6]
+
+    def test_simple_aggregators(self):
+        cases = (
+            (agg_count(), 8),
+            (agg_sum(), 31),
+            (agg_min(), 1),
+            (agg_max(), 9),
+            (agg_first(), 3),
+            (agg_last(), 6),
+            (agg_mean(), 31 / 8),
+            (agg_top_k(3), [9, 6, 5]),
+        )
+        for agg, expected in cases:
+            with self.subTest(aggregator=type(agg).__name__):
+                self.assertEqual(expected, agg(self.values))
+
+    def test_variance(self):
+        self.assertAlmostEqual(statistics.variance(self.values),
+                               agg_variance()(self.values))
+        self.assertAlmostEqual(statistics.pvariance(self.values),
+                               agg_variance(ddof=0)(self.values))
+        self.assertIsNone(agg_variance()([1]))
+
+    def test_empty(self):
+        for agg in (agg_min(), agg_max(), agg_first(), agg_last(),
+                    agg_mean()):
+            with self.subTest(aggregator=type(agg).__name__):
+                self.assertIsNone(agg([]))
+
+    def test_merge(self):
+        head, tail = self.values[:3], self.values[3:]
+        for agg in (agg_count(), agg_sum(), agg_min(), agg_max(),
+                    agg_first(), agg_last(), agg_mean(), agg_top_k(3)):
+            with self.subTest(aggregator=type(agg).__name__):
+                acc_head, acc_tail = agg.init(), agg.init()
+                for v in head:
+                    acc_head = agg.update(acc_head, v)
+                for v in tail:
+                    acc_tail = agg.update(acc_tail, v)
+                self.assertEqual(
+                    agg(self.values),
+                    agg.finalize(agg.merge(acc_head, acc_tail))
+                )
+
+        agg = agg_variance()
+        acc = agg.merge(
+            agg.update(agg.update(agg.init(), 3), 1),
+            agg.update(agg.init(), 4)
+        )
+        self.assertAlmostEqual(statistics.variance([3, 1, 4]),
+                               agg.finalize(acc))
+
+    def test_distinct(self):
+        data = [random.randint(0, 4999) for _ in range(20000)]
+        expected = len(set(data))
+        result = agg_distinct()(data)
+        self.assertLess(abs(result - expected) / expected, 0.05)
+        self.assertEqual(3, agg_distinct()(['a', 'b', 'a', 'c']))
+        with self.assertRaises(ValueError):
+            agg_distinct(precision=2)
+
+    def test_with_aggregate(self):
+        data = [(1, 10), (2, 5), (1, 20)]
+        result = dict(
+            aggregate(agg_sum(operator.itemgetter(1)),
+                      groupby(operator.itemgetter(0), data))
+        )
+        self.assertDictEqual({1: 30, 2: 5}, result)
+
+
+class TestStreamingAggregate(TestCase):
+    def setUp(self) -> None:
+        self.data = [
+            {'customer': 'foo', 'amount': 10},
+            {'customer': 'bar', 'amount': 5},
+            {'customer': 'foo', 'amount': 30},
+        ]
+        self.key = operator.itemgetter('customer')
+        self.aggregators = {
+            'count': agg_count(),
+            'total': agg_sum(operator.itemgetter('amount')),
+            'mean': agg_mean(operator.itemgetter('amount')),
+        }
+
+    def test_single_aggregator(self):
+        result = dict(streaming_aggregate(self.key, agg_count(), self.data))
+        self.assertDictEqual({'foo': 2, 'bar': 1}, result)
+
+    def test_aggregator_mapping(self):
+        result = dict(
+            streaming_aggregate(self.key, self.aggregators, self.data)
+        )
+        self.assertDictEqual(
+            {
+                'foo': {'count': 2, 'total': 40, 'mean': 20.0},
+                'bar': {'count': 1, 'total': 5, 'mean': 5.0},
+            },
+            result
+        )
+
+    def test_merge_partitions(self):
+        partials = [
+            streaming_aggregate(self.key, self.aggregators, partition,
+                                finalize=False)
+            for partition in (self.data[:1], self.data[1:])
+        ]
+        result = dict(merge_aggregates(self.aggregators, *partials))
+        expected = dict(
+            streaming_aggregate(self.key, self.aggregators, self.data)
+        )
+        self.assertDictEqual(expected, result)
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
@@ -0,0 +1,265 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+import asyncio
+import io
+from src.pyetllib.etllib.aio import acollect, ajoin, alookup, amap, \
+    apipeline, apublish_to_stream, areplicate, aselect, asplit, \
+    async_lookup, to_async, to_sync
+from src.pyetllib.etllib import lookup_cache
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def arange(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+class TestAdapters(TestCase):
+    def test_to_async(self):
+        self.assertListEqual(run(acollect(to_async(range(5)))),
+                             [0, 1, 2, 3, 4])
+
+    def test_to_async_in_thread(self):
+        self.assertListEqual(run(acollect(to_async(range(5), True))),
+                             [0, 1, 2, 3, 4])
+
+    def test_to_sync(self):
+        self.assertListEqual(list(to_sync(arange(5))), [0, 1, 2, 3, 4])
+
+    def test_to_sync_partial(self):
+        it = to_sync(arange(5))
+        self.assertEqual(next(it), 0)
+        it.close()
+
+    def test_acollect_iterable(self):
+        self.assertListEqual(run(acollect([1, 2])), [1, 2])
+
+
+class TestAMap(TestCase):
+    def test_amap_sync_func(self):
+        result = run(acollect(amap(lambda x: x * 2)(arange(5))))
+        self.assertListEqual(result, [0, 2, 4, 6, 8])
+
+    def test_amap_ordered(self):
+        async def slow(x):
+            await asyncio.sleep(0.001 * (10 - x))
+            return x
+
+        result = run(acollect(amap(slow, concurrency=10)(range(10))))
+        self.assertListEqual(result, list(range(10)))
+
+    def test_amap_unordered(self):
+        async def slow(x):
+            await asyncio.sleep(0.001 * (10 - x))
+            return x
+
+        result = run(acollect(
+            amap(slow, concurrency=10, ordered=False)(range(10))
+        ))
+        self.assertListEqual(sorted(result), list(range(10)))
+        self.assertNotEqual(result, list(range(10)))
+
+    def test_amap_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def task(x):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return x
+
+        result = run(acollect(amap(task, concurrency=8)(range(100))))
+        self.assertListEqual(result, list(range(100)))
+        self.assertEqual(peak, 8)
+
+    def test_amap_exception(self):
+        async def fail(x):
+            if x == 3:
+                raise KeyError(x)
+            return x
+
+        self.assertRaises(KeyError, run, acollect(amap(fail)(range(10))))
+
+    def test_amap_invalid_concurrency(self):
+        self.assertRaises(ValueError, amap, abs, 0)
+
+
+class TestControllers(TestCase):
+    def test_areplicate(self):
+        async def main():
+            it1, it2, it3 = areplicate(arange(5), 3)
+            return await asyncio.gather(
+                acollect(it1), acollect(it2), acollect(it3)
+            )
+
+        self.assertListEqual(run(main()), [[0, 1, 2, 3, 4]] * 3)
+
+    def test_areplicate_sequential(self):
+        async def main():
+            it1, it2 = areplicate(range(3))
+            return await acollect(it1), await acollect(it2)
+
+        self.assertTupleEqual(run(main()), ([0, 1, 2], [0, 1, 2]))
+
+    def test_asplit(self):
+        async def main():
+            it1, it2 = asplit(lambda x: (x, -x), arange(3), 2)
+            return await asyncio.gather(acollect(it1), acollect(it2))
+
+        self.assertListEqual(run(main()), [[0, 1, 2], [0, -1, -2]])
+
+    def test_asplit_too_long(self):
+        async def main():
+            it1, = asplit(lambda x: (x, x), arange(3), 1)
+            return await acollect(it1)
+
+        self.assertRaises(ValueError, run, main())
+
+    def test_aselect(self):
+        async def main():
+            even, odd, other = aselect(
+                (lambda x: x % 2 == 0, lambda x: x % 2 == 1), arange(6)
+            )
+            return await asyncio.gather(
+                acollect(even), acollect(odd), acollect(other)
+            )
+
+        self.assertListEqual(run(main()), [[0, 2, 4], [1, 3, 5], []])
+
+    def test_alookup(self):
+        lookup_map = {1: 'one', 3: 'three'}
+
+        async def main():
+            found, rejects = alookup(arange(5), lookup_map=lookup_map,
+                                     merge=True, enable_rejects=True)
+            return await asyncio.gather(acollect(found), acollect(rejects))
+
+        self.assertListEqual(
+            run(main()), [[(1, 'one'), (3, 'three')], [0, 2, 4]]
+        )
+
+    def test_ajoin(self):
+        result = run(acollect(ajoin(arange(3), 'ab', fill_value='-')))
+        self.assertListEqual(result, [(0, 'a'), (1, 'b'), (2, '-')])
+
+
+class TestAsyncLookup(TestCase):
+    def setUp(self) -> None:
+        self.reference = {1: 'one', 2: 'two', 3: 'three'}
+        self.calls = []
+
+    async def resolver(self, keys):
+        self.calls.append(keys)
+        await asyncio.sleep(0)
+        return {k: self.reference[k] for k in keys if k in self.reference}
+
+    def test_async_lookup(self):
+        stage = async_lookup(self.resolver, window=3, merge=True)
+        result = run(acollect(stage(arange(5))))
+        self.assertListEqual(result, [(1, 'one'), (2, 'two'), (3, 'three')])
+        self.assertListEqual(self.calls, [[0, 1, 2], [3, 4]])
+
+    def test_async_lookup_sync_resolver(self):
+        def resolver(keys):
+            return {k: self.reference[k] for k in keys}
+
+        stage = async_lookup(resolver, merge=True)
+        self.assertListEqual(run(acollect(stage([2, 2]))),
+                             [(2, 'two'), (2, 'two')])
+
+    def test_async_lookup_cache(self):
+        cache = lookup_cache(negative_ttl=0)
+        stage = async_lookup(self.resolver, window=2, cache=cache,
+                             concurrency=4)
+        result = run(acollect(stage([1, 0, 1, 0, 1, 0])))
+        self.assertListEqual(result, [1, 1, 1])
+        self.assertEqual(len(cache), 1)  # unresolved keys are not cached
+
+
+class TestAPipeline(TestCase):
+    def test_apipeline(self):
+        async def double(x):
+            await asyncio.sleep(0)
+            return 2 * x
+
+        chain = apipeline(amap(double), amap(str))
+        self.assertListEqual(run(acollect(chain(range(3)))),
+                             ['0', '2', '4'])
+
+    def test_apipeline_pipable(self):
+        chain = apipeline(amap(abs)) | to_sync | list
+        self.assertListEqual(chain([-1, -2]), [1, 2])
+
+    def test_apublish_to_stream(self):
+        stream = io.StringIO()
+        stats = run(apublish_to_stream(arange(3), ['x'], stream=stream,
+                                       record_converter=str, batch_size=2))
+        self.assertEqual(stream.getvalue(), '0\n1\n2\nx\n')
+        self.assertTupleEqual(stats, (4, 8))
+
+    def test_apublish_to_stream_async_write(self):
+        class AsyncStream:
+            def __init__(self):
+                self.chunks = []
+
+            async def write(self, chunk):
+                await asyncio.sleep(0)
+                self.chunks.append(chunk)
+
+        stream = AsyncStream()
+        run(apublish_to_stream(arange(3), stream=stream, serializer='jsonl'))
+        self.assertListEqual(stream.chunks, ['0\n1\n2\n'])
+
+    def test_apublish_to_stream_failure(self):
+        async def failing():
+            yield 'a'
+            yield 'b'
+            raise ValueError("Oops!")
+
+        for batch_size in (1, 2, 1000):
+            with self.subTest(batch_size=batch_size):
+                stream = io.StringIO()
+                with self.assertRaises(ValueError):
+                    run(apublish_to_stream(['foo'], failing(), stream=stream,
+                                           batch_size=batch_size))
+                self.assertEqual('foo\na\nb\n', stream.getvalue())
+
+    def test_apublish_to_stream_cancelled(self):
+        stream = io.StringIO()
+
+        async def endless():
+            i = 0
+            while True:
+                yield str(i)
+                i += 1
+                await asyncio.sleep(0.001)
+
+        async def main():
+            task = asyncio.ensure_future(
+                apublish_to_stream(endless(), stream=stream)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        run(main())
+        lines = stream.getvalue().splitlines()
+        self.assertGreater(len(lines), 0)
+        self.assertListEqual(lines, [str(i) for i in range(len(lines))])
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
@@ -0,0 +1,96 @@
+from unittest import TestCase, main as run_tests
+
+import io
+from itertools import islice
+
+from src.pyetllib.etllib import block_generator, write_blocks
+from src.pyetllib.etllib import gen_choices, gen_count, gen_numpy
+from src.pyetllib.etllib import gen_randint, gen_uniform
+from src.pyetllib.etllib import columns_to_stream
+
+
+class TestBlockGenerator(TestCase):
+    def setUp(self) -> None:
+        self.keys = ('id', 'name', 'value', 'score', 'constant')
+        self.factories = (
+            gen_count(1),
+            gen_choices(('foo', 'bar')),
+            gen_randint(0, 9),
+            gen_uniform(0.0, 1.0),
+            42,
+        )
+
+    def test_records(self):
+        blocks = list(block_generator(self.keys, self.factories, 25,
+                                      block_size=10))
+        self.assertListEqual([10, 10, 5], list(map(len, blocks)))
+        records = [r for block in blocks for r in block]
+        self.assertListEqual(list(range(1, 26)), [r['id'] for r in records])
+        for r in records:
+            self.assertIn(r['name'], ('foo', 'bar'))
+            self.assertTrue(0 <= r['value'] <= 9)
+            self.assertTrue(0.0 <= r['score'] < 1.0)
+            self.assertEqual(42, r['constant'])
+
+    def test_columns(self):
+        block, = block_generator(self.keys, self.factories, 5,
+                                 as_columns=True)
+        self.assertListEqual(list(self.keys), list(block.keys()))
+        self.assertEqual(5, len(list(columns_to_stream([block]))))
+
+    def test_missing_factories(self):
+        block, = block_generator(('id', 'other'), (gen_count(), ), 2)
+        self.assertListEqual([{'id': 0, 'other': None},
+                              {'id': 1, 'other': None}], block)
+
+    def test_seeds(self):
+        def generate(keys, factories, seed):
+            return list(block_generator(keys, factories, 20, block_size=7,
+                                        as_columns=True, seed=seed))
+
+        first = generate(self.keys, self.factories, 1)
+        self.assertListEqual(first, generate(self.keys, self.factories, 1))
+        self.assertNotEqual(first, generate(self.keys, self.factories, 2))
+
+        # a column does not depend on the other ones
+        alone = generate(('name', ), (gen_choices(('foo', 'bar')), ), 1)
+        self.assertListEqual([b['name'] for b in first],
+                             [b['name'] for b in alone])
+
+    def test_endless(self):
+        blocks = block_generator(('id', ), (gen_count(), ), -1, block_size=3)
+        self.assertListEqual([[{'id': 6}, {'id': 7}, {'id': 8}]],
+                             list(islice(blocks, 2, 3)))
+
+    def test_numpy(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        block, = block_generator(('x', ), (gen_numpy('normal', 0, 1), ), 8,
+                                 as_columns=True, seed=3)
+        self.assertEqual(8, len(block['x']))
+
+    def test_bad_block_size(self):
+        with self.assertRaises(ValueError):
+            list(block_generator(self.keys, self.factories, 2, block_size=0))
+
+
+class TestWriteBlocks(TestCase):
+    def test_write(self):
+        for as_columns in (False, True):
+            with self.subTest(as_columns=as_columns):
+                stream = io.StringIO()
+                written = write_blocks(
+                    block_generator(('id', 'name'),
+                                    (gen_count(), 'foo'), 3, block_size=2,
+                                    as_columns=as_columns),
+                    stream
+                )
+                self.assertEqual(3, written)
+                self.assertEqual('id,name\n0,foo\n1,foo\n2,foo\n',
+                                 stream.getvalue())
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
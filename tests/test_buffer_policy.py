@@ -0,0 +1,68 @@
+from unittest import TestCase, main as run_tests
+
+from src.pyetllib.etllib import replicate, select, split
+
+
+class TestBufferPolicy(TestCase):
+    def setUp(self) -> None:
+        self.data = list(range(10))
+
+    def test_unbounded_high_water_mark(self):
+        it1, it2 = replicate(self.data)
+        self.assertListEqual(self.data, list(it1))
+        self.assertEqual(it2.buffered, 10)
+        self.assertEqual(it2.high_water_mark, 10)
+        self.assertListEqual(self.data, list(it2))
+        self.assertEqual(it2.buffered, 0)
+        self.assertEqual(it1.high_water_mark, 1)
+
+    def test_raise(self):
+        it1, it2 = replicate(self.data, max_buffer=3)
+        with self.assertRaises(BufferError):
+            _ = list(it1)
+        with self.assertRaises(BufferError):
+            _ = list(it2)
+
+    def test_raise_within_bound(self):
+        it1, it2 = replicate(self.data, max_buffer=3)
+        for a, b in zip(it1, it2):
+            self.assertEqual(a, b)
+        self.assertEqual(it1.high_water_mark, 1)
+
+    def test_drop(self):
+        it1, it2 = replicate(self.data, max_buffer=3, buffer_policy='drop')
+        self.assertListEqual(self.data, list(it1))
+        self.assertEqual(it2.dropped, 7)
+        self.assertEqual(it2.high_water_mark, 3)
+        self.assertListEqual([0, 1, 2], list(it2))
+
+    def test_spill(self):
+        it1, it2 = replicate(self.data, max_buffer=3, buffer_policy='spill')
+        self.assertListEqual(self.data[:5], [next(it1) for _ in range(5)])
+        self.assertListEqual(self.data[:2], [next(it2) for _ in range(2)])
+        self.assertListEqual(self.data[5:], list(it1))
+        self.assertEqual(it2.buffered, 8)
+        self.assertEqual(it2.high_water_mark, 8)
+        self.assertListEqual(self.data[2:], list(it2))
+        self.assertEqual(it2.dropped, 0)
+
+    def test_split_and_select(self):
+        it1, it2 = split(lambda t: t, [(i, -i) for i in self.data],
+                         max_buffer=2, buffer_policy='spill')
+        self.assertListEqual(self.data, list(it1))
+        self.assertListEqual([-i for i in self.data], list(it2))
+
+        even, odd, _ = select((lambda x: x % 2 == 0, lambda x: x % 2),
+                              self.data, max_buffer=2, buffer_policy='spill')
+        self.assertListEqual([0, 2, 4, 6, 8], list(even))
+        self.assertListEqual([1, 3, 5, 7, 9], list(odd))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            replicate(self.data, max_buffer=0)
+        with self.assertRaises(ValueError):
+            replicate(self.data, max_buffer=2, buffer_policy='block')
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
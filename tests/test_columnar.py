@@ -0,0 +1,112 @@
+from unittest import TestCase, main as run_tests
+
+import array
+import functools
+import operator
+
+from src.pyetllib.etllib import stream_to_columns, columns_to_stream
+from src.pyetllib.etllib import cextract, cremove, crename, cmap, clookup
+from src.pyetllib.etllib import fextract, fremove, frename, fmap, flookup
+from src.pyetllib.etllib import curried
+
+
+class TestColumnConversion(TestCase):
+    def setUp(self) -> None:
+        self.data = [{'id': i, 'name': f'n{i}'} for i in range(5)]
+
+    def test_round_trip(self):
+        batches = list(stream_to_columns(self.data, batch_size=2))
+        self.assertEqual(len(batches), 3)
+        self.assertDictEqual({'id': [0, 1], 'name': ['n0', 'n1']},
+                             batches[0])
+        self.assertListEqual(self.data, list(columns_to_stream(batches)))
+
+    def test_heterogeneous_rows(self):
+        batch, = stream_to_columns([{'a': 1}, {'b': 2}])
+        self.assertDictEqual({'a': [1, None], 'b': [None, 2]}, batch)
+        # the round trip adds the missing keys
+        self.assertListEqual([{'a': 1, 'b': None}, {'a': None, 'b': 2}],
+                             list(columns_to_stream([batch])))
+
+    def test_column_factory(self):
+        batch, = stream_to_columns(
+            ({'x': float(i)} for i in range(3)),
+            column_factory=functools.partial(array.array, 'd')
+        )
+        self.assertEqual(batch['x'], array.array('d', [0.0, 1.0, 2.0]))
+        self.assertListEqual([{'x': 0.0}, {'x': 1.0}, {'x': 2.0}],
+                             list(columns_to_stream([batch])))
+
+    def test_bad_batch_size(self):
+        with self.assertRaises(ValueError):
+            list(stream_to_columns(self.data, batch_size=0))
+
+
+class TestColumnFunctions(TestCase):
+    def setUp(self) -> None:
+        self.data = [
+            {'f1': 1, 'f2': 'a', 'f3': (1, 2)},
+            {'f1': 2, 'f2': 'b', 'f3': (3, 4)},
+            {'f1': 3, 'f2': 'z', 'f3': (5, 6)},
+        ]
+        self.batch, = stream_to_columns(self.data)
+
+    def assertSameAsRecords(self, column_func, record_func):
+        result = list(columns_to_stream([column_func(self.batch)]))
+        expected = list(map(record_func, self.data))
+        self.assertListEqual(expected, result)
+
+    def test_extract_remove_rename(self):
+        self.assertSameAsRecords(functools.partial(cextract, ('f1', )),
+                                 functools.partial(fextract, ('f1', )))
+        self.assertSameAsRecords(functools.partial(cremove, ('f1', )),
+                                 functools.partial(fremove, ('f1', )))
+        self.assertSameAsRecords(
+            functools.partial(crename, {'f1': 'e1'}),
+            functools.partial(frename, {'f1': 'e1'})
+        )
+
+    def test_map(self):
+        self.assertSameAsRecords(
+            functools.partial(cmap, ('f1', 'f2'), (str, str.upper)),
+            functools.partial(fmap, ('f1', 'f2'), (str, str.upper))
+        )
+        self.assertSameAsRecords(
+            functools.partial(cmap, ('f3', ), (operator.add, ),
+                              val_as_args=True),
+            functools.partial(fmap, ('f3', ), (operator.add, ),
+                              val_as_args=True)
+        )
+        result = cmap(('f1', ), (lambda col: [sum(col)] * len(col), ),
+                      self.batch, vectorized=True)
+        self.assertListEqual([6, 6, 6], result['f1'])
+
+    def test_lookup(self):
+        lookup_map = {'a': 'A', 'b': 'B'}
+        self.assertSameAsRecords(
+            functools.partial(clookup, lookup_map, ('f2', )),
+            functools.partial(flookup, lookup_map, ('f2', ))
+        )
+
+    def test_column_factory(self):
+        doubles = functools.partial(array.array, 'd')
+        batch, = stream_to_columns(({'x': float(i)} for i in range(3)),
+                                   column_factory=doubles)
+        mapped = cmap(('x', ), (lambda x: x * 2, ), batch,
+                      column_factory=doubles)
+        self.assertEqual(mapped['x'], doubles([0.0, 2.0, 4.0]))
+        looked_up = clookup({0.0: 1.0, 2.0: 3.0, 4.0: 5.0}, ('x', ),
+                            mapped, column_factory=doubles)
+        self.assertEqual(looked_up['x'], doubles([1.0, 3.0, 5.0]))
+        curried_map = curried.cmap(('x', ), (abs, ), column_factory=doubles)
+        self.assertIsInstance(curried_map(batch)['x'], array.array)
+
+    def test_curried(self):
+        self.assertDictEqual(
+            {'f1': [1, 2, 3]},
+            curried.cextract(('f1', ))(self.batch)
+        )
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
@@ -0,0 +1,156 @@
+from unittest import TestCase, main as run_tests
+
+import io
+import time
+from unittest import mock
+
+from src.pyetllib.jobtools import Job, JobGraph
+import src.pyetllib.jobtools.exceptions as errors
+
+
+EVENTS = []
+
+
+def _step(name, delay):
+    EVENTS.append(('start', name))
+    time.sleep(delay)
+    EVENTS.append(('end', name))
+    return name
+
+
+@Job.declare()
+def dag_extract(delay):
+    return _step('dag_extract', delay)
+
+
+@Job.declare()
+def dag_transform_a(delay):
+    return _step('dag_transform_a', delay)
+
+
+@Job.declare()
+def dag_transform_b(delay):
+    return _step('dag_transform_b', delay)
+
+
+@Job.declare()
+def dag_load(delay):
+    return _step('dag_load', delay)
+
+
+@Job.declare()
+def dag_failing(_):
+    raise ValueError("Oops!")
+
+
+class TestJobGraph(TestCase):
+    def setUp(self) -> None:
+        EVENTS.clear()
+        self.graph = JobGraph()
+        self.graph.add(dag_extract, 0.05)
+        self.graph.add(dag_transform_a, 0.05, depends_on='dag_extract')
+        self.graph.add(dag_transform_b, 0.15, depends_on=dag_extract)
+        self.graph.add(dag_load, 0.05,
+                       depends_on=('dag_transform_a', dag_transform_b))
+
+    def test_order(self):
+        order = self.graph.order()
+        self.assertEqual(order[0], 'dag_extract')
+        self.assertEqual(order[-1], 'dag_load')
+
+    def test_run(self):
+        result = self.graph.run(max_workers=4, stream=io.StringIO())
+        self.assertTrue(result.success)
+        self.assertSetEqual(set(result.reports), set(self.graph.order()))
+
+        position = {event: i for i, event in enumerate(EVENTS)}
+        for name, dependencies in (
+                ('dag_transform_a', ('dag_extract', )),
+                ('dag_transform_b', ('dag_extract', )),
+                ('dag_load', ('dag_transform_a', 'dag_transform_b'))):
+            for dependency in dependencies:
+                self.assertLess(position[('end', dependency)],
+                                position[('start', name)])
+        # both transformations run concurrently
+        self.assertLess(position[('start', 'dag_transform_b')],
+                        position[('end', 'dag_transform_a')])
+
+    def test_critical_path(self):
+        result = self.graph.run(max_workers=4, stream=io.StringIO())
+        self.assertListEqual(result.critical_path,
+                             ['dag_extract', 'dag_transform_b', 'dag_load'])
+        self.assertGreaterEqual(result.critical_time, 0.25)
+        self.assertLess(result.summary.wall_time, result.summary.job_time)
+        text = str(result)
+        self.assertIn('dag_extract > dag_transform_b > dag_load', text)
+        self.assertIn('dag_transform_a', text)
+
+    def test_skip_downstream(self):
+        graph = JobGraph()
+        graph.add('dag_failing', None, module_name=__name__)
+        graph.add(dag_extract, 0, depends_on='dag_failing')
+        graph.add(dag_load, 0, depends_on='dag_extract')
+        graph.add(dag_transform_a, 0)
+        result = graph.run(stream=io.StringIO())
+        self.assertFalse(result.success)
+        self.assertListEqual(result.failures, ['dag_failing'])
+        self.assertDictEqual(result.skipped, {
+            'dag_extract': ('dag_failing', ),
+            'dag_load': ('dag_extract', ),
+        })
+        self.assertTrue(result.reports['dag_transform_a'].success)
+        self.assertNotIn(('start', 'dag_extract'), EVENTS)
+        self.assertIn('skipped', str(result))
+
+    def test_dependency_failing_to_load(self):
+        # a job declared locally cannot be sent to a worker process
+        @Job.declare()
+        def dag_local(_):
+            return 'local'
+
+        graph = JobGraph()
+        graph.add(dag_local, None)
+        graph.add('dag_load', 0, depends_on=dag_local, module_name=__name__)
+        graph.add('dag_transform_a', 0, module_name=__name__)
+        result = graph.run(mode='process', stream=io.StringIO())
+        self.assertFalse(result.success)
+        self.assertListEqual(result.failures, ['dag_local'])
+        self.assertDictEqual(result.skipped, {'dag_load': ('dag_local', )})
+        self.assertTrue(result.reports['dag_transform_a'].success)
+
+    def test_dependency_failing_to_submit(self):
+        graph = JobGraph()
+        graph.add('dag_extract', 0, module_name=__name__)
+        graph.add(dag_load, 0, depends_on='dag_extract')
+        graph.add(dag_transform_a, 0)
+        # the job no longer resolves to a callable when it is submitted
+        with mock.patch(f'{__name__}.dag_extract', None):
+            result = graph.run(stream=io.StringIO())
+        self.assertListEqual(result.failures, ['dag_extract'])
+        self.assertIsInstance(result.reports['dag_extract'].get_result(),
+                              errors.JobNotCallable)
+        self.assertDictEqual(result.skipped, {'dag_load': ('dag_extract', )})
+        self.assertTrue(result.reports['dag_transform_a'].success)
+        self.assertIn('1 failures', str(result))
+
+    def test_unknown_dependency(self):
+        self.graph.add('dag_failing', None, module_name=__name__,
+                       depends_on='unknown')
+        self.assertRaises(errors.JobDependencyError, self.graph.run)
+
+    def test_cycle(self):
+        graph = JobGraph()
+        graph.add(dag_extract, 0, depends_on='dag_load')
+        graph.add(dag_load, 0, depends_on='dag_extract')
+        with self.assertRaises(errors.JobDependencyError) as cm:
+            graph.run()
+        self.assertIn('dag_extract, dag_load', str(cm.exception))
+        self.assertListEqual(EVENTS, [])
+
+    def test_duplicate(self):
+        self.assertRaises(errors.JobAlreadyRegistered, self.graph.add,
+                          dag_extract)
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
@@ -4,7 +4,7 @@ from unittest import TestCase, main as run_tests
 from src.pyetllib.etllib.curried import fextract, frename, fmap, fremove
 from src.pyetllib.etllib.curried import flookup, freverse_lookup, fsplit
 
-from src.pyetllib.etllib import pipable
+from src.pyetllib.etllib import pipable, ReverseLookupIndex
 
 
 class TestFExtract(TestCase):
@@ -182,6 +182,40 @@ class TestFReverseLookUp(TestCase):
         self.assertDictEqual(expected, result)
 
 
+class TestReverseLookupIndex(TestCase):
+    def setUp(self) -> None:
+        self.data = {'id': 1, 'name': 3, 'other': 2}
+        self.lookup_map = {
+            'foo': (1, ),
+            'bar': (3, ),
+            'a_spam': (3, 4)
+        }
+
+    def test_1(self):
+        index = ReverseLookupIndex(self.lookup_map)
+        self.assertDictEqual({1: 'foo', 3: 'bar', 4: 'a_spam'}, dict(index))
+        for keys in (('id', 'name'), ('id', 'name', 'other', 'foo')):
+            with self.subTest(keys=keys):
+                self.assertDictEqual(
+                    freverse_lookup(self.lookup_map, keys, self.data),
+                    freverse_lookup(index, keys, self.data)
+                )
+
+    def test_2_collisions(self):
+        index = ReverseLookupIndex(self.lookup_map, on_collision='last')
+        self.assertEqual(index[3], 'a_spam')
+        with self.assertRaises(ValueError):
+            ReverseLookupIndex(self.lookup_map, on_collision='raise')
+        with self.assertRaises(ValueError):
+            ReverseLookupIndex(self.lookup_map, on_collision='ignore')
+
+    def test_3_curried(self):
+        lookup = freverse_lookup(ReverseLookupIndex(self.lookup_map),
+                                 ('name', ))
+        self.assertDictEqual({'id': 1, 'name': 'bar', 'other': 2},
+                             lookup(self.data))
+
+
 class TestComposability(TestCase):
     def test_1(self):
         data = {
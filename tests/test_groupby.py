@@ -1,7 +1,9 @@
 from unittest import TestCase, main as run_tests
 
 from src.pyetllib.etllib import groupby, aggregate, reduce
+from src.pyetllib.etllib import groupby_sorted, external_sort
 import functools
+import random
 
 
 class TestGroupBy(TestCase):
@@ -91,5 +93,65 @@ class TestGroupBy(TestCase):
         self.assertDictEqual(expected, result)
 
 
+class TestSortedGroupBy(TestCase):
+    def setUp(self):
+        self.data = [(1, 'foo'), (2, 'bar'), (1, 'spam'), (2, 'eggs')]
+
+    def test_groupby_sorted_1(self):
+        groups = groupby_sorted(lambda v: v[0], sorted(self.data))
+        self.assertTupleEqual(
+            next(groups),
+            (1, [(1, 'foo'), (1, 'spam')])
+        )
+        self.assertTupleEqual(
+            next(groups),
+            (2, [(2, 'bar'), (2, 'eggs')])
+        )
+        with self.assertRaises(StopIteration):
+            next(groups)
+
+    def test_groupby_sorted_unsorted_input(self):
+        result = list(groupby_sorted(lambda v: v[0], self.data))
+        self.assertListEqual([1, 2, 1, 2], [k for k, _ in result])
+
+    def test_aggregate_streaming(self):
+        expected = [(1, 2), (2, 2)]
+        counts = aggregate(
+            len,
+            groupby_sorted(
+                lambda v: v[0],
+                external_sort(self.data, key=lambda v: v[0], memory_limit=1)
+            )
+        )
+        self.assertListEqual(expected, list(counts))
+
+    def test_external_sort(self):
+        data = [random.randint(0, 100) for _ in range(1000)]
+        for memory_limit in (None, 1, 7, 999, 1000, 5000):
+            with self.subTest(memory_limit=memory_limit):
+                self.assertListEqual(
+                    sorted(data),
+                    list(external_sort(data, memory_limit=memory_limit))
+                )
+        self.assertListEqual(
+            sorted(data, reverse=True),
+            list(external_sort(data, memory_limit=10, reverse=True))
+        )
+
+    def test_external_sort_is_stable(self):
+        result = list(
+            external_sort(self.data, key=lambda v: v[0], memory_limit=1)
+        )
+        self.assertListEqual(
+            [(1, 'foo'), (1, 'spam'), (2, 'bar'), (2, 'eggs')],
+            result
+        )
+
+    def test_external_sort_empty(self):
+        self.assertListEqual([], list(external_sort([], memory_limit=2)))
+        with self.assertRaises(ValueError):
+            list(external_sort(self.data, memory_limit=0))
+
+
 if __name__ == '__main__':
     run_tests(verbosity=2)
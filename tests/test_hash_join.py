@@ -0,0 +1,90 @@
+from unittest import TestCase, main as run_tests
+
+from src.pyetllib.etllib import hash_join
+
+
+class TestHashJoin(TestCase):
+    def setUp(self) -> None:
+        self.left = [(1, 'foo'), (2, 'bar'), (2, 'spam'), (3, 'eggs')]
+        self.right = [(1, 'one'), (2, 'two'), (4, 'four')]
+        self.key = lambda t: t[0]  # noqa: E731
+
+    def join(self, how, **kwargs):
+        return sorted(
+            hash_join(self.left, self.right, self.key, self.key, how=how,
+                      **kwargs),
+            key=repr
+        )
+
+    def test_inner(self):
+        expected = sorted([
+            ((1, 'foo'), (1, 'one')),
+            ((2, 'bar'), (2, 'two')),
+            ((2, 'spam'), (2, 'two')),
+        ], key=repr)
+        self.assertListEqual(expected, self.join('inner'))
+
+    def test_left(self):
+        result = self.join('left')
+        self.assertIn(((3, 'eggs'), None), result)
+        self.assertEqual(len(result), 4)
+
+    def test_right(self):
+        result = self.join('right')
+        self.assertIn((None, (4, 'four')), result)
+        self.assertEqual(len(result), 4)
+
+    def test_full(self):
+        result = self.join('full', fill_value='n/a')
+        self.assertIn(((3, 'eggs'), 'n/a'), result)
+        self.assertIn(('n/a', (4, 'four')), result)
+        self.assertEqual(len(result), 5)
+
+    def test_build_side_does_not_change_result(self):
+        for how in ('inner', 'left', 'right', 'full'):
+            with self.subTest(how=how):
+                self.assertListEqual(
+                    self.join(how, build='left'),
+                    self.join(how, build='right')
+                )
+
+    def test_unsized_iterables(self):
+        result = list(
+            hash_join(iter(self.left), iter(self.right), self.key, self.key)
+        )
+        self.assertEqual(len(result), 3)
+
+    def test_spill_to_disk(self):
+        left = [(i % 50, i) for i in range(1000)]
+        right = [(i, str(i)) for i in range(0, 100, 2)]
+        for how in ('inner', 'left', 'right', 'full'):
+            with self.subTest(how=how):
+                in_memory = sorted(
+                    hash_join(left, right, self.key, self.key, how=how),
+                    key=repr
+                )
+                spilled = sorted(
+                    hash_join(left, right, self.key, self.key, how=how,
+                              memory_limit=5, partitions=4),
+                    key=repr
+                )
+                self.assertListEqual(in_memory, spilled)
+
+    def test_skewed_key_spill(self):
+        left = [(0, i) for i in range(100)]
+        right = [(0, 'zero')] * 20
+        result = list(
+            hash_join(left, right, self.key, self.key, build='right',
+                      memory_limit=5, partitions=2)
+        )
+        self.assertEqual(len(result), 2000)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            hash_join(self.left, self.right, how='outer')
+        with self.assertRaises(ValueError):
+            hash_join(self.left, self.right, build='middle')
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
@@ -1,14 +1,25 @@
 from unittest import TestCase, main as run_tests
+from unittest import skipUnless
 
+import asyncio
 import sys
 import io
+import logging
+import threading
 import os
 import functools
+import gc
+import json
+import pickle
+import pstats
 import pathlib
+import time
 
 from src.pyetllib.jobtools import Job
 from src.pyetllib.jobtools import JobReport
 from src.pyetllib.jobtools import get_report
+from src.pyetllib.jobtools.report import ColoredFormatter
+from src.pyetllib.jobtools.report import _get_shared_listener
 import src.pyetllib.jobtools.exceptions as errors
 
 
@@ -273,6 +284,308 @@ class TestColorOutput(TestCase):
         self.assertIn('colored', output)
         self.assertIn('Bye!', output)
 
+    def test_formatter(self):
+        formatter = ColoredFormatter('%(levelname)s %(message)s')
+        record = logging.LogRecord('colored', logging.INFO, __file__, 0,
+                                   'batch %d', (3, ), None)
+        self.assertEqual(formatter.format(record),
+                         '\033[1;34mINFO\033[0m \033[34mbatch 3\033[0m')
+        # the record is left untouched for the other handlers
+        self.assertEqual(record.levelname, 'INFO')
+        self.assertEqual(record.msg, 'batch %d')
+
+        plain = ColoredFormatter('%(levelname)s %(message)s',
+                                 color_output=False)
+        self.assertEqual(plain.format(record), 'INFO batch 3')
+
+    def test_formatter_exc_info(self):
+        formatter = ColoredFormatter('%(levelname)s %(message)s')
+        try:
+            raise ValueError('Oops!')
+        except ValueError:
+            record = logging.LogRecord('colored', logging.ERROR, __file__,
+                                       0, 'failed', (), sys.exc_info())
+        lines = formatter.format(record).splitlines()
+        self.assertEqual(lines[0], '\033[1;31mERROR\033[0m '
+                                   '\033[31mfailed\033[0m')
+        self.assertEqual(lines[-1], 'ValueError: Oops!')
+
+
+def log_from_helper(msg):
+    Job.info(msg)
+
+
+@Job.declare(use_stream=True)
+def with_helper(msg, stream):
+    log_from_helper(msg)
+
+
+async def log_from_task(msg):
+    Job.info(msg)
+
+
+@Job.declare(use_stream=True)
+def with_tasks(msgs, stream):
+    async def main():
+        await asyncio.gather(*(log_from_task(m) for m in msgs))
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+class TestCurrentJob(TestCase):
+    def test_helper_function(self):
+        stream = io.StringIO()
+        result = Job.execute('with_helper', 'from a helper',
+                             module_name=__name__, stream=stream,
+                             color_output=False)
+        self.assertTrue(result.success)
+        self.assertIn('[with_helper         ]', stream.getvalue())
+        self.assertIn('from a helper', stream.getvalue())
+
+    def test_asyncio_tasks(self):
+        stream = io.StringIO()
+        result = Job.execute('with_tasks', ('spam', 'eggs'),
+                             module_name=__name__, stream=stream)
+        self.assertTrue(result.success)
+        self.assertIn('spam', stream.getvalue())
+        self.assertIn('eggs', stream.getvalue())
+
+    def test_threads(self):
+        streams = {name: io.StringIO() for name in ('thread_a', 'thread_b')}
+
+        def func(msg):
+            for _ in range(50):
+                log_from_helper(msg)
+
+        def run(name):
+            Job(name, func=func, color_output=False).run(
+                name, stream=streams[name]
+            )
+
+        threads = [threading.Thread(target=run, args=(name, ))
+                   for name in streams]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name, stream in streams.items():
+            lines = [line for line in stream.getvalue().splitlines()
+                     if 'INFO' in line]
+            self.assertEqual(len(lines), 50)
+            self.assertTrue(all(line.startswith(f'[{name}') for line in lines))
+            self.assertTrue(all(line.endswith(name) for line in lines))
+
+
+class ThreadRecordingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def write(self, s):
+        self.threads.add(threading.current_thread())
+        return super().write(s)
+
+
+def chatty(n):
+    for i in range(n):
+        Job.info(f'line {i}')
+
+
+class TestQueuedReport(TestCase):
+    def run_chatty(self, queued, n=100, **kwargs):
+        stream = ThreadRecordingStream()
+        report = Job(func=chatty, color_output=False, queued=queued).run(
+            n, stream=stream, **kwargs
+        )
+        self.assertTrue(report.success)
+        return stream
+
+    def test_queued(self):
+        stream = self.run_chatty(True)
+        # the records are written by the listener, and all of them are
+        # flushed once the job has run
+        self.assertNotIn(threading.current_thread(), stream.threads)
+        lines = stream.getvalue().splitlines()
+        self.assertTrue([line for line in lines
+                         if 'line' in line][-1].endswith('line 99'))
+        self.assertIn('Outcome is a success', lines[-1])
+
+    def test_shared(self):
+        first = self.run_chatty('shared', 10)
+        second = self.run_chatty('shared', 20)
+        self.assertEqual(first.threads, second.threads)
+        self.assertNotIn(threading.current_thread(), first.threads)
+        self.assertEqual(first.getvalue().count('line'), 10)
+        self.assertEqual(second.getvalue().count('line'), 20)
+        self.assertIn('Outcome is a success', second.getvalue())
+
+    def test_logfile(self):
+        path = pathlib.Path(__file__).parent / 'chatty.log'
+        try:
+            self.run_chatty(True, logfile=path)
+            with open(path) as logfile:
+                self.assertEqual(logfile.read().count('line'), 100)
+        finally:
+            os.remove(path)
+
+    def test_shared_concurrent(self):
+        class GatedStream(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.entered = threading.Event()
+                self.gate = threading.Event()
+
+            def write(self, s):
+                self.entered.set()
+                self.gate.wait()
+                time.sleep(0.01)
+                return super().write(s)
+
+        slow = GatedStream()
+        chatty_report = JobReport('shared_chatty', color_output=False,
+                                  stream=slow, queued='shared')
+        quiet_report = JobReport('shared_quiet', color_output=False,
+                                 stream=io.StringIO(), queued='shared')
+        listener = _get_shared_listener()
+
+        chatty_report.report(logging.INFO, 'first')
+        slow.entered.wait()  # the listener is blocked on the slow stream
+        quiet_report.report(logging.INFO, 'quiet')
+        finalizer = threading.Thread(target=quiet_report.finalize)
+        finalizer.start()
+        try:
+            deadline = time.monotonic() + 5.0
+            while listener.queue.qsize() < 2:  # the record and the marker
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.001)
+            for i in range(100):  # queued after the quiet report's marker
+                chatty_report.report(logging.INFO, f'line {i}')
+        finally:
+            slow.gate.set()
+        finalizer.join(0.5)
+        # the quiet report does not wait for the 1s of chatty records
+        self.assertFalse(finalizer.is_alive())
+        self.assertNotIn('line 99', slow.getvalue())
+        chatty_report.finalize()
+        self.assertIn('line 99', slow.getvalue())
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, JobReport, 'invalid', queued='fast')
+
+
+def busy(path):
+    total = 0
+    for i in range(200000):
+        total += i * i
+    gc.collect()
+    with open(path, 'wb') as f:
+        f.write(b'x' * 100000)
+    return total
+
+
+class TestJobMetrics(TestCase):
+    def setUp(self):
+        self.path = pathlib.Path(__file__).parent / 'busy.dat'
+
+    def tearDown(self):
+        if self.path.exists():
+            os.remove(self.path)
+
+    def test_metrics(self):
+        report = Job(func=busy).run(self.path, stream=io.StringIO())
+        metrics = report.get_metrics()
+        self.assertGreater(metrics['wall_time'], 0.0)
+        self.assertGreater(metrics['user_time'] + metrics['system_time'],
+                           0.0)
+        self.assertGreater(metrics['max_rss'], 0)
+        self.assertGreaterEqual(metrics['gc_collections'], 1)
+        self.assertGreater(metrics['gc_time'], 0.0)
+        self.assertDictEqual(json.loads(report.metrics_to_json()), metrics)
+        restored = pickle.loads(pickle.dumps(report))
+        self.assertDictEqual(restored.get_metrics(), metrics)
+
+    @skipUnless(os.path.exists('/proc/self/io'), "requires /proc")
+    def test_io(self):
+        report = Job(func=busy).run(self.path, stream=io.StringIO())
+        self.assertGreaterEqual(report.get_metrics()['write_bytes'], 100000)
+
+    def test_log_metrics(self):
+        stream = io.StringIO()
+        Job(func=busy, color_output=False).run(self.path, stream=stream)
+        self.assertNotIn('CPU time', stream.getvalue())
+        Job(func=busy, color_output=False, log_metrics=True).run(
+            self.path, stream=stream
+        )
+        output = stream.getvalue()
+        self.assertIn('CPU time: user', output)
+        self.assertIn('Peak RSS', output)
+        self.assertRegex(output, r'GC: [1-9]\d* collections')
+
+
+def hot_loop(seconds):
+    total = 0
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        total += sum(i * i for i in range(1000))
+    return total
+
+
+class TestProfile(TestCase):
+    def setUp(self):
+        self.logfile = pathlib.Path(__file__).parent / 'profiled.log'
+
+    def tearDown(self):
+        for suffix in ('.log', '.prof', '.collapsed'):
+            path = self.logfile.with_suffix(suffix)
+            if path.exists():
+                os.remove(path)
+
+    def run_profiled(self, profile):
+        stream = io.StringIO()
+        report = Job(func=hot_loop, color_output=False).run(
+            0.2, logfile=self.logfile, stream=stream, profile=profile
+        )
+        self.assertTrue(report.success)
+        return stream.getvalue()
+
+    def test_cprofile(self):
+        output = self.run_profiled('cprofile')
+        path = self.logfile.with_suffix('.prof')
+        self.assertIn(f'Profile written to {path}', output)
+        self.assertIn('<genexpr>', output)
+        functions = {func for _, _, func in pstats.Stats(str(path)).stats}
+        self.assertIn('hot_loop', functions)
+
+    def test_sampling(self):
+        output = self.run_profiled('sampling')
+        self.assertIn('samples in', output)
+        with open(self.logfile.with_suffix('.collapsed')) as collapsed:
+            lines = collapsed.read().splitlines()
+        self.assertTrue(lines)
+        stack, _, count = lines[0].rpartition(' ')
+        self.assertTrue(stack.startswith('_run ('))
+        self.assertIn('hot_loop (', stack)
+        self.assertGreater(int(count), 0)
+
+    def test_sampling_thread(self):
+        outputs = []
+        thread = threading.Thread(
+            target=lambda: outputs.append(self.run_profiled('sampling'))
+        )
+        thread.start()
+        thread.join()
+        self.assertIn('samples in', outputs[0])
+        self.assertTrue(self.logfile.with_suffix('.collapsed').exists())
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, Job(func=hot_loop).run, 0,
+                          profile='perf')
+
 
 if __name__ == '__main__':
     run_tests(verbosity=2)
@@ -0,0 +1,135 @@
+from unittest import TestCase, main as run_tests
+
+import io
+import pickle
+import time
+
+from src.pyetllib.jobtools import Job, JobPool, JobReport
+import src.pyetllib.jobtools.exceptions as errors
+
+
+@Job.declare()
+def region_a(ctx):
+    Job.info('a-start')
+    time.sleep(ctx['delay'])
+    Job.info('a-end')
+    return 'A'
+
+
+@Job.declare()
+def region_b(ctx):
+    Job.info('b-start')
+    time.sleep(ctx['delay'])
+    Job.info('b-end')
+    return 'B'
+
+
+@Job.declare()
+def region_c(ctx):
+    Job.info('c-start')
+    time.sleep(ctx['delay'])
+    Job.info('c-end')
+    return 'C'
+
+
+@Job.declare()
+def region_failing(_):
+    raise ValueError("Oops!")
+
+
+REGIONS = ('region_a', 'region_b', 'region_c')
+
+
+class TestJobPool(TestCase):
+    def test_execute_many(self):
+        stream = io.StringIO()
+        pool = Job.execute_many(REGIONS, {'delay': 0.1}, max_workers=3,
+                                module_name=__name__, stream=stream,
+                                color_output=False)
+        reports = list(pool)
+        self.assertSetEqual({r.name for r in reports}, set(REGIONS))
+        self.assertTrue(all(isinstance(r, JobReport) for r in reports))
+        self.assertSetEqual({r.get_result() for r in reports},
+                            {'A', 'B', 'C'})
+
+        summary = pool.summary
+        self.assertEqual(summary.jobs, 3)
+        self.assertEqual(summary.failures, 0)
+        self.assertGreaterEqual(summary.job_time, 0.3)
+        self.assertLess(summary.wall_time, summary.job_time)
+        self.assertGreater(summary.speedup, 1.0)
+        self.assertIn('3 jobs, 0 failures', str(summary))
+        self.assertSetEqual(set(pool.timings), set(REGIONS))
+
+    def test_isolated_output(self):
+        stream = io.StringIO()
+        pool = Job.execute_many(REGIONS, {'delay': 0.05}, max_workers=3,
+                                module_name=__name__, stream=stream,
+                                color_output=False)
+        list(pool)
+        lines = stream.getvalue().splitlines()
+        for name in REGIONS:
+            # the lines of a job are contiguous
+            indices = [i for i, line in enumerate(lines) if name in line]
+            self.assertEqual(indices, list(range(indices[0],
+                                                 indices[-1] + 1)))
+
+    def test_failure(self):
+        pool = Job.execute_many(('region_a', 'region_failing'),
+                                {'delay': 0}, module_name=__name__,
+                                stream=io.StringIO())
+        reports = {r.name: r for r in pool}
+        self.assertTrue(reports['region_a'].success)
+        self.assertTrue(reports['region_failing'].failure)
+        self.assertEqual(pool.summary.failures, 1)
+
+    def test_failure_to_run(self):
+        pool = JobPool(max_workers=2, mode='process', stream=io.StringIO())
+        with pool:
+            pool.submit('region_a', {'delay': 0}, module_name=__name__)
+            # a lambda cannot be sent to a worker process
+            pool.submit('region_b', {'delay': 0, 'f': lambda: 0},
+                        module_name=__name__)
+            reports = {r.name: r for r in pool}
+        self.assertSetEqual(set(reports), {'region_a', 'region_b'})
+        self.assertEqual(reports['region_a'].get_result(), 'A')
+        self.assertTrue(reports['region_b'].failure)
+        self.assertIsInstance(reports['region_b'], JobReport)
+        self.assertEqual(pool.summary.failures, 1)
+
+    def test_process_mode(self):
+        stream = io.StringIO()
+        pool = Job.execute_many(REGIONS, {'delay': 0}, max_workers=2,
+                                mode='process', module_name=__name__,
+                                stream=stream, color_output=False)
+        reports = {r.name: r for r in pool}
+        self.assertSetEqual(set(reports), set(REGIONS))
+        self.assertEqual(reports['region_b'].get_result(), 'B')
+        self.assertIsNotNone(reports['region_b'].get_pid())
+        self.assertIn('b-end', stream.getvalue())
+
+    def test_submit(self):
+        with JobPool(max_workers=2, stream=io.StringIO()) as pool:
+            future = pool.submit('region_a', {'delay': 0},
+                                 module_name=__name__)
+            with self.assertRaises(errors.JobAlreadyRegistered):
+                pool.submit(region_a, {'delay': 0})
+            self.assertEqual(future.result().get_result(), 'A')
+            self.assertEqual(len(list(pool)), 1)
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, JobPool, mode='fiber')
+
+    def test_pickle_report(self):
+        report = JobReport('pickled', stream=io.StringIO())
+        report.set_pid(42)
+        report.set_result(KeyError('k'))
+        restored = pickle.loads(pickle.dumps(report))
+        self.assertIsInstance(restored, JobReport)
+        self.assertEqual(restored.name, 'pickled')
+        self.assertEqual(restored.get_pid(), 42)
+        self.assertTrue(restored.failure)
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
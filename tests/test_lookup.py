@@ -1,6 +1,8 @@
 from unittest import TestCase, main as run_tests
+from unittest.mock import patch
 
-from src.pyetllib.etllib import lookup
+import sqlite3
+from src.pyetllib.etllib import lookup, batched_lookup, lookup_cache
 
 
 class TestLookUp(TestCase):
@@ -60,5 +62,104 @@ class TestLookUp(TestCase):
         self.assertDictEqual(dict(result), expected)
 
 
+class SQLiteResolver:
+    """Resolves keys with one query per call, and counts the calls"""
+    def __init__(self, rows):
+        self.connection = sqlite3.connect(':memory:')
+        self.connection.execute('CREATE TABLE ref (id INTEGER, name TEXT)')
+        self.connection.executemany('INSERT INTO ref VALUES (?, ?)', rows)
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(list(keys))
+        query = 'SELECT id, name FROM ref WHERE id IN ' \
+            f'({", ".join("?" * len(keys))})'
+        return dict(self.connection.execute(query, keys).fetchall())
+
+
+class TestBatchedLookup(TestCase):
+    def setUp(self) -> None:
+        self.resolver = SQLiteResolver([(1, 'one'), (2, 'two'), (3, 'three')])
+        self.data = [1, 2, 5, 1, 3, 2, 5, 4]
+
+    def test_batched_lookup(self):
+        stage = batched_lookup(self.resolver, window=4, merge=True)
+        self.assertListEqual(
+            list(stage(self.data)),
+            [(1, 'one'), (2, 'two'), (1, 'one'), (3, 'three'), (2, 'two')]
+        )
+        # distinct keys per window, cached keys are not resolved again
+        self.assertListEqual(self.resolver.calls, [[1, 2, 5], [3, 4]])
+
+    def test_batched_lookup_default(self):
+        stage = batched_lookup(self.resolver, window=3, default='?',
+                               merge=lambda a, b: f'{a}:{b}')
+        self.assertListEqual(
+            list(stage(self.data)),
+            ['1:one', '2:two', '5:?', '1:one', '3:three', '2:two', '5:?',
+             '4:?']
+        )
+
+    def test_batched_lookup_key(self):
+        data = [{'id': i} for i in self.data]
+        stage = batched_lookup(self.resolver, key=lambda d: d['id'],
+                               merge=lambda d, v: dict(d, name=v))
+        self.assertListEqual(
+            [d['name'] for d in stage(data)],
+            ['one', 'two', 'one', 'three', 'two']
+        )
+
+    def test_batched_lookup_shared_cache(self):
+        cache = lookup_cache()
+        list(batched_lookup(self.resolver, cache=cache)(self.data))
+        list(batched_lookup(self.resolver, cache=cache)(self.data))
+        self.assertEqual(len(self.resolver.calls), 1)
+        self.assertEqual(len(cache), 5)
+
+    def test_batched_lookup_no_cache(self):
+        stage = batched_lookup(self.resolver, window=2,
+                               cache=lookup_cache(maxsize=0))
+        list(stage(self.data))
+        self.assertListEqual(self.resolver.calls,
+                             [[1, 2], [5, 1], [3, 2], [5, 4]])
+
+    def test_batched_lookup_invalid_window(self):
+        self.assertRaises(ValueError, batched_lookup, self.resolver, window=0)
+
+
+class TestLookupCache(TestCase):
+    def test_lru(self):
+        cache = lookup_cache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)  # evicts 'b', the least recently used
+        self.assertRaises(KeyError, cache.get, 'b')
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_negative(self):
+        cache = lookup_cache()
+        cache.put('a')
+        self.assertIs(cache.get('a'), lookup_cache.unresolved)
+
+    def test_ttl(self):
+        with patch('time.monotonic', return_value=100.0) as clock:
+            cache = lookup_cache(ttl=10, negative_ttl=1)
+            cache.put('a', 1)
+            cache.put('b')
+            clock.return_value = 105.0
+            self.assertEqual(cache.get('a'), 1)
+            self.assertRaises(KeyError, cache.get, 'b')
+            clock.return_value = 110.0
+            self.assertRaises(KeyError, cache.get, 'a')
+            self.assertEqual(len(cache), 0)
+
+    def test_no_negative_caching(self):
+        cache = lookup_cache(negative_ttl=0)
+        cache.put('a')
+        self.assertEqual(len(cache), 0)
+
+
 if __name__ == '__main__':
     run_tests(verbosity=2)
@@ -0,0 +1,63 @@
+from unittest import TestCase, main as run_tests
+
+from src.pyetllib.etllib import parallel_map, pipable, pipeline
+from src.pyetllib.etllib import ParallelMapError
+
+
+def square(x):
+    return x * x
+
+
+def fragile(x):
+    if x == 42:
+        raise ValueError("Oops!")
+    return x
+
+
+class TestParallelMap(TestCase):
+    def setUp(self) -> None:
+        self.data = list(range(100))
+        self.expected = [x * x for x in self.data]
+
+    def test_ordered(self):
+        stage = parallel_map(square, workers=2, chunksize=7)
+        self.assertListEqual(self.expected, list(stage(self.data)))
+
+    def test_unordered(self):
+        stage = parallel_map(square, workers=2, chunksize=7, ordered=False)
+        self.assertListEqual(self.expected, sorted(stage(iter(self.data))))
+
+    def test_threads(self):
+        stage = parallel_map(lambda x: x * x, workers=4, chunksize=3,
+                             mode='thread')
+        self.assertListEqual(self.expected, list(stage(self.data)))
+
+    def test_pipable(self):
+        chain = parallel_map(square, workers=2, chunksize=10) | \
+            pipable(sum)
+        self.assertEqual(sum(self.expected), chain(self.data))
+        func = pipeline(parallel_map(square, workers=2), list)
+        self.assertListEqual(self.expected, func(self.data))
+
+    def test_empty(self):
+        stage = parallel_map(square, workers=2)
+        self.assertListEqual([], list(stage([])))
+
+    def test_exception(self):
+        for ordered in (True, False):
+            with self.subTest(ordered=ordered):
+                stage = parallel_map(fragile, workers=2, chunksize=5,
+                                     ordered=ordered)
+                with self.assertRaises(ParallelMapError) as cm:
+                    list(stage(self.data))
+                self.assertEqual(cm.exception.index, 42)
+                self.assertEqual(cm.exception.record, 42)
+                self.assertIsInstance(cm.exception.__cause__, ValueError)
+
+    def test_bad_mode(self):
+        with self.assertRaises(ValueError):
+            parallel_map(square, mode='cluster')
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
@@ -2,10 +2,14 @@ from unittest import TestCase, main as run_tests
 
 from toolz import curry
 
+import functools
+import io
+import time
 from itertools import repeat
 from src.pyetllib.etllib import compose, mcompose
 from src.pyetllib.etllib import pipeline, pipe_data_through, xargs
-from src.pyetllib.etllib import pipable
+from src.pyetllib.etllib import pipable, stage_profiler
+from src.pyetllib.jobtools import Job
 
 
 def f1(x):
@@ -98,5 +102,72 @@ class TestPipableCurried(TestCase):
         self.assertEqual(9, result)
 
 
+def slow(iterable):
+    for item in iterable:
+        time.sleep(0.002)
+        yield item
+
+
+def evens(iterable):
+    return (item for item in iterable if item % 2 == 0)
+
+
+def profiled(data, interval=None):
+    published = []
+    profiler = stage_profiler(publish=published.append, interval=interval)
+    chain = pipeline(pipable(slow) | evens, functools.partial(map, str),
+                     list, profiler=profiler)
+    return chain(data), published
+
+
+class TestStageProfiler(TestCase):
+    def test_counts(self):
+        result, published = profiled(iter(range(50)))
+        self.assertListEqual(result, [str(i) for i in range(0, 50, 2)])
+        self.assertEqual(len(published), 1)
+        stats = published[0]
+        self.assertListEqual([s.name for s in stats],
+                             ['1:slow', '2:evens', '3:map', '4:list'])
+        self.assertListEqual([(s.records_in, s.records_out) for s in stats],
+                             [(50, 50), (50, 25), (25, 25), (25, 25)])
+
+    def test_self_time(self):
+        _, published = profiled(range(50))
+        stats = published[0]
+        self.assertGreaterEqual(stats[0].self_time, 0.1)
+        # the time spent in `slow` is not attributed downstream
+        for stage in stats[1:]:
+            self.assertLess(stage.self_time, stats[0].self_time / 10)
+        self.assertAlmostEqual(stats[0].items_per_sec,
+                               50 / stats[0].self_time)
+
+    def test_interval(self):
+        _, published = profiled(range(50), interval=0.02)
+        self.assertGreater(len(published), 1)
+        self.assertLess(published[0][0].records_out, 50)
+        self.assertEqual(published[-1][0].records_out, 50)
+
+    def test_lazy_output(self):
+        published = []
+        profiler = stage_profiler(publish=published.append)
+        chain = pipeline(slow, evens, profiler=profiler)
+        output = chain([1, 2, 3, 4])
+        self.assertListEqual(published, [])
+        self.assertListEqual(list(output), [2, 4])
+        self.assertEqual(len(published), 1)
+        self.assertEqual(profiler.stats()[0].records_in, 4)
+
+    def test_job_report(self):
+        def job():
+            chain = pipeline(slow, sum, profiler=stage_profiler())
+            return chain(range(10))
+
+        stream = io.StringIO()
+        report = Job(func=job, color_output=False).run(stream=stream)
+        self.assertEqual(report.get_result(), 45)
+        self.assertIn('1:slow: 10 in, 10 out', stream.getvalue())
+        self.assertIn('2:sum: 10 in, 1 out', stream.getvalue())
+
+
 if __name__ == '__main__':
     run_tests(verbosity=2)
@@ -2,7 +2,11 @@ from unittest import TestCase
 from unittest import main as run_tests
 
 import io
+import json
+import os
+import tempfile
 from src.pyetllib.etllib.streams import publish_to_stream
+from src.pyetllib.etllib import stream_converter, record
 
 
 class TestPublishToStream(TestCase):
@@ -36,6 +40,84 @@ class TestPublishToStream(TestCase):
         s = self.stream.getvalue()
         self.assertEqual(s, '3_3_')
 
+    def test_batches_and_stats(self):
+        for batch_size in (1, 2, 1000):
+            with self.subTest(batch_size=batch_size):
+                stream = io.StringIO()
+                stats = publish_to_stream(iter(['foo', 'bar', 'spam']),
+                                          stream=stream,
+                                          batch_size=batch_size)
+                self.assertEqual(stream.getvalue(), 'foo\nbar\nspam\n')
+                self.assertEqual(stats.records, 3)
+                self.assertEqual(stats.size, 13)
+
+    def test_empty(self):
+        stats = publish_to_stream(iter([]), **self.ctx)
+        self.assertEqual(self.stream.getvalue(), '')
+        self.assertTupleEqual((0, 0), tuple(stats))
+
+    def test_serializers(self):
+        data = [{'id': 1, 'name': 'foo'}, {'id': 2, 'name': 'b,ar'}]
+        expected = {
+            'csv': '1,foo\n2,"b,ar"\n',
+            'tsv': '1\tfoo\n2\tb,ar\n',
+            'jsonl': '{"id": 1, "name": "foo"}\n{"id": 2, "name": "b,ar"}\n',
+        }
+        for serializer, output in expected.items():
+            with self.subTest(serializer=serializer):
+                stream = io.StringIO()
+                publish_to_stream(iter(data), stream=stream,
+                                  serializer=serializer)
+                self.assertEqual(output, stream.getvalue())
+
+        with self.assertRaises(ValueError):
+            publish_to_stream(iter(data), serializer='xml', **self.ctx)
+
+    def test_serializer_with_converter(self):
+        to_record = stream_converter(dict, record)
+        publish_to_stream(iter([{'id': 1}]), serializer='jsonl',
+                          record_converter=to_record, **self.ctx)
+        self.assertDictEqual({'id': 1}, json.loads(self.stream.getvalue()))
+
+        stream = io.StringIO()
+        publish_to_stream(iter([(1, 2)]), stream=stream,
+                          serializer=lambda batch: repr(batch))
+        self.assertEqual('[(1, 2)]', stream.getvalue())
+
+    def test_binary_streams(self):
+        stream = io.BytesIO()
+        stats = publish_to_stream(*self.iterators, stream=stream,
+                                  record_converter=str.upper)
+        self.assertEqual(b'FOO\nBAR\n', stream.getvalue())
+        self.assertEqual(8, stats.size)
+
+    def test_upstream_failure(self):
+        def failing():
+            yield 'a'
+            yield 'b'
+            raise ValueError("Oops!")
+
+        for batch_size in (1, 2, 1000):
+            with self.subTest(batch_size=batch_size):
+                stream = io.StringIO()
+                with self.assertRaises(ValueError):
+                    publish_to_stream(iter(['foo']), failing(),
+                                      stream=stream, batch_size=batch_size)
+                self.assertEqual('foo\na\nb\n', stream.getvalue())
+
+    def test_buffered_raw_stream(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'test_publish.out')
+            raw = io.FileIO(path, mode='w')
+            try:
+                publish_to_stream(iter(['é'] * 10), stream=raw,
+                                  buffer_size=4, batch_size=3)
+                self.assertFalse(raw.closed)
+            finally:
+                raw.close()
+            with io.open(path, encoding='utf-8') as f:
+                self.assertEqual('é\n' * 10, f.read())
+
     def tearDown(self) -> None:
         self.stream.close()
 
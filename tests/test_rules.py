@@ -169,5 +169,54 @@ class TestMappingRule(TestCase):
         self.assertListEqual(result, expected)
 
 
+class TestCompiledRules(TestCase):
+    def setUp(self) -> None:
+        @set_field(None)
+        def concat(_, t):
+            return ':'.join(str(e[1]) for e in t)
+
+        self.rules = (
+            mapping_rule('cpu', default_if_false(bool, 'inconnu')),
+            mapping_rule('ram', default_if_equal("#", 'inconnu')),
+            mapping_rule('serialnumber', default_if_none('inconnu')),
+            mapping_rule('all', concat),
+            mapping_rule('missing', str),
+        )
+        self.data = [
+            {'cpu': '8-core', 'ram': "#", 'serialnumber': None},
+            {'cpu': '', 'ram': "16GB", 'serialnumber': 'X', 'other': 1},
+            {'other': 2},
+        ]
+
+    def test_same_as_apply(self):
+        func = mapping_rule.compile(self.rules)
+        for data in self.data:
+            with self.subTest(data=data):
+                expected = mapping_rule.apply(self.rules, data)
+                result = func(data)
+                self.assertDictEqual(expected, result)
+                self.assertListEqual(list(expected), list(result))
+
+    def test_duplicate_fields(self):
+        rules = (
+            mapping_rule('cpu', str.upper),
+            mapping_rule('cpu', str.lower),
+        )
+        data = self.data[0]
+        self.assertDictEqual(mapping_rule.apply(rules, data),
+                             mapping_rule.compile(rules)(data))
+
+    def test_no_rules(self):
+        func = mapping_rule.compile(())
+        self.assertDictEqual(self.data[1], func(self.data[1]))
+        self.assertIsNot(self.data[1], func(self.data[1]))
+
+    def test_pipable(self):
+        func = mapping_rule.compile(self.rules[:1]) | \
+            mapping_rule.compile(self.rules[1:2])
+        result = func(self.data[0])
+        self.assertEqual(result['ram'], 'inconnu')
+
+
 if __name__ == '__main__':
     run_tests(verbosity=2)
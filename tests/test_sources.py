@@ -0,0 +1,282 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+import functools
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from src.pyetllib.etllib.sources import byte_ranges, read_csv, \
+    read_fixed_width, read_lines, read_partitioned
+from src.pyetllib.etllib import pipable
+
+
+def upper(lines):
+    return [line.upper() for line in lines]
+
+
+def code(row):
+    return row['code']
+
+
+def ids(rows):
+    return [row['id'] for row in rows]
+
+
+class SourceTestCase(TestCase):
+    def write(self, content):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+
+class TestReadLines(SourceTestCase):
+    def setUp(self) -> None:
+        self.path = self.write(b'foo\nbar\nspam\neggs\n')
+
+    def test_read_lines(self):
+        self.assertListEqual(
+            list(read_lines(self.path)),
+            ['foo', 'bar', 'spam', 'eggs']
+        )
+
+    def test_read_lines_no_trailing_delimiter(self):
+        path = self.write(b'foo\nbar')
+        self.assertListEqual(list(read_lines(path)), ['foo', 'bar'])
+
+    def test_read_lines_empty_file(self):
+        path = self.write(b'')
+        self.assertListEqual(list(read_lines(path)), [])
+        self.assertListEqual(byte_ranges(path, 4), [])
+
+    def test_read_lines_bytes(self):
+        self.assertListEqual(
+            list(read_lines(self.path, encoding=None)),
+            [b'foo', b'bar', b'spam', b'eggs']
+        )
+
+    def test_read_lines_memoryview(self):
+        views = list(read_lines(self.path, as_memoryview=True))
+        self.assertTrue(all(isinstance(v, memoryview) for v in views))
+        self.assertListEqual(
+            [v.tobytes() for v in views],
+            [b'foo', b'bar', b'spam', b'eggs']
+        )
+
+    def test_read_lines_delimiter(self):
+        path = self.write(b'foo\r\nbar\r\n')
+        self.assertListEqual(
+            list(read_lines(path, delimiter=b'\r\n')), ['foo', 'bar']
+        )
+
+    def test_read_lines_chunks(self):
+        self.assertListEqual(
+            list(read_lines(self.path, chunk_size=3)),
+            [['foo', 'bar', 'spam'], ['eggs']]
+        )
+
+    def test_read_lines_any_range(self):
+        # whatever the bounds, adjacent ranges read every record once
+        size = os.path.getsize(self.path)
+        for cut in range(size + 1):
+            with self.subTest(cut=cut):
+                self.assertListEqual(
+                    list(read_lines(self.path, 0, cut))
+                    + list(read_lines(self.path, cut)),
+                    ['foo', 'bar', 'spam', 'eggs']
+                )
+
+    def test_read_lines_small_blocks(self):
+        for block_size in (1, 2, 5, 64):
+            with self.subTest(block_size=block_size), \
+                    patch('src.pyetllib.etllib.sources._BLOCK_SIZE',
+                          block_size):
+                self.assertListEqual(
+                    list(read_lines(self.path, 2, 14)),
+                    ['bar', 'spam', 'eggs']
+                )
+
+    def test_read_lines_pipable(self):
+        chain = pipable(read_lines) | (lambda it: [s.upper() for s in it])
+        self.assertListEqual(chain(self.path), ['FOO', 'BAR', 'SPAM', 'EGGS'])
+
+
+class TestByteRanges(SourceTestCase):
+    def test_byte_ranges(self):
+        lines = [f'line {i}' * (i % 7) for i in range(100)]
+        path = self.write('\n'.join(lines).encode())
+        for n in (1, 2, 3, 8, 200):
+            with self.subTest(n=n):
+                ranges = byte_ranges(path, n)
+                self.assertLessEqual(len(ranges), n)
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], os.path.getsize(path))
+                result = []
+                for start, end in ranges:
+                    result.extend(read_lines(path, start, end))
+                self.assertListEqual(result, lines)
+
+    def test_byte_ranges_record_length(self):
+        path = self.write(b'aaabbbcccdddeee')
+        ranges = byte_ranges(path, 2, record_length=3)
+        self.assertListEqual(ranges, [(0, 6), (6, 15)])
+
+    def test_byte_ranges_invalid(self):
+        path = self.write(b'foo\n')
+        self.assertRaises(ValueError, byte_ranges, path, 0)
+
+
+class TestReadCSV(SourceTestCase):
+    def setUp(self) -> None:
+        self.path = self.write(b'id,name\n1,foo\n2,"bar, spam"\n3,eggs\n')
+
+    def test_read_csv(self):
+        self.assertListEqual(
+            list(read_csv(self.path)),
+            [['id', 'name'], ['1', 'foo'], ['2', 'bar, spam'], ['3', 'eggs']]
+        )
+
+    def test_read_csv_header(self):
+        self.assertListEqual(
+            list(read_csv(self.path, header=True)),
+            [
+                {'id': '1', 'name': 'foo'},
+                {'id': '2', 'name': 'bar, spam'},
+                {'id': '3', 'name': 'eggs'},
+            ]
+        )
+
+    def test_read_csv_header_ranges(self):
+        result = []
+        for start, end in byte_ranges(self.path, 3):
+            result.extend(read_csv(self.path, start, end, header=True))
+        self.assertListEqual([r['id'] for r in result], ['1', '2', '3'])
+
+    def test_read_csv_fieldnames(self):
+        path = self.write(b'1;foo\n2;bar\n')
+        self.assertListEqual(
+            list(read_csv(path, fieldnames=('a', 'b'), delimiter=';')),
+            [{'a': '1', 'b': 'foo'}, {'a': '2', 'b': 'bar'}]
+        )
+
+
+class TestReadFixedWidth(SourceTestCase):
+    fields = (('code', 3), ('label', 6), ('qty', 2))
+
+    def test_read_fixed_width(self):
+        path = self.write(b'001foo   12\n002bar    3\n')
+        self.assertListEqual(
+            list(read_fixed_width(path, self.fields)),
+            [
+                {'code': '001', 'label': 'foo', 'qty': '12'},
+                {'code': '002', 'label': 'bar', 'qty': '3'},
+            ]
+        )
+
+    def test_read_fixed_width_short_record(self):
+        path = self.write(b'001foo\n')
+        self.assertListEqual(
+            list(read_fixed_width(path, self.fields, strip=False)),
+            [{'code': '001', 'label': 'foo', 'qty': ''}]
+        )
+
+    def test_read_fixed_width_no_delimiter(self):
+        path = self.write(b'001foo   12002bar    3003spam  45')
+        result = []
+        for start, end in byte_ranges(path, 2, record_length=11):
+            result.extend(
+                read_fixed_width(path, self.fields, start, end,
+                                 delimiter=None, chunk_size=1)
+            )
+        self.assertListEqual(
+            [chunk[0]['code'] for chunk in result], ['001', '002', '003']
+        )
+
+
+class TestReadPartitioned(SourceTestCase):
+    def setUp(self) -> None:
+        self.lines = [f'line {i:04d}' for i in range(1000)]
+        self.path = self.write('\n'.join(self.lines).encode())
+
+    def test_read_partitioned(self):
+        for mode in ('process', 'thread'):
+            with self.subTest(mode=mode):
+                result = list(read_partitioned(self.path, partitions=7,
+                                               workers=2, mode=mode))
+                self.assertListEqual(result, self.lines)
+
+    def test_read_partitioned_transform(self):
+        result = read_partitioned(self.path, transform=upper,
+                                  partitions=5, workers=2)
+        self.assertListEqual(list(result), upper(self.lines))
+
+    def test_read_partitioned_pipable(self):
+        transform = pipable(upper) | sorted
+        result = read_partitioned(self.path, transform=transform,
+                                  partitions=3, workers=2, mode='thread')
+        self.assertListEqual(list(result), upper(self.lines))
+
+    def test_read_partitioned_unordered(self):
+        result = read_partitioned(self.path, partitions=9, workers=3,
+                                  ordered=False)
+        self.assertListEqual(sorted(result), self.lines)
+
+    def test_read_partitioned_reader(self):
+        path = self.write(
+            b'id,name\n' + b''.join(b'%d,foo\n' % i for i in range(100))
+        )
+        result = read_partitioned(path, reader=read_csv, transform=ids,
+                                  partitions=4, workers=2, header=True)
+        self.assertListEqual(list(result), [str(i) for i in range(100)])
+
+    def test_read_partitioned_record_delimiter(self):
+        path = self.write(';'.join(self.lines).encode())
+        result = read_partitioned(path, partitions=6, workers=2,
+                                  mode='thread', record_delimiter=b';',
+                                  delimiter=b';')
+        self.assertListEqual(list(result), self.lines)
+
+    def test_read_partitioned_csv_delimiter(self):
+        # the CSV delimiter does not split the records
+        path = self.write(b''.join(b'%d;foo\n' % i for i in range(100)))
+        result = read_partitioned(path, reader=read_csv, transform=ids,
+                                  partitions=4, workers=2, mode='thread',
+                                  fieldnames=('id', 'name'), delimiter=';')
+        self.assertListEqual(list(result), [str(i) for i in range(100)])
+
+    def test_read_partitioned_record_length(self):
+        path = self.write(b''.join(b'%03dfoo   12' % i for i in range(50)))
+        fields = (('code', 3), ('label', 6), ('qty', 2))
+        result = read_partitioned(path, reader=read_fixed_width,
+                                  transform=functools.partial(map, code),
+                                  partitions=4, workers=2, mode='thread',
+                                  record_length=11, fields=fields,
+                                  delimiter=None)
+        self.assertListEqual(list(result), [f'{i:03d}' for i in range(50)])
+
+    def test_read_partitioned_output(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'part-{index:02d}.txt')
+        result = list(read_partitioned(self.path, transform=upper,
+                                       partitions=4, workers=2,
+                                       output=output))
+        self.assertEqual(len(result), 4)
+        lines = []
+        for index, (path, stats) in enumerate(result):
+            self.assertEqual(path, output.format(index=index))
+            with open(path) as f:
+                content = f.read().splitlines()
+            self.assertEqual(stats.records, len(content))
+            lines.extend(content)
+        self.assertListEqual(lines, upper(self.lines))
+
+    def test_read_partitioned_invalid_mode(self):
+        self.assertRaises(ValueError, read_partitioned, self.path,
+                          mode='fiber')
+
+
+if __name__ == '__main__':
+    run_tests(verbosity=2)
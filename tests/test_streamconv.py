@@ -1,9 +1,13 @@
 from unittest import TestCase, main as run_tests
 
 from collections import namedtuple
+from collections.abc import Mapping
 from itertools import repeat
+import pickle
+import sys
 
-from src.pyetllib.etllib import stream_converter
+from src.pyetllib.etllib import stream_converter, record
+from src.pyetllib.etllib.tools.fieldtools import fextract
 
 
 class TestStreamConverter(TestCase):
@@ -69,6 +73,26 @@ class TestStreamConverter(TestCase):
         expected = self.sample_namedtuple
         self.assertEqual(expected, result)
 
+    def test_dict_to_namedtuple_class_cache(self):
+        stream_converter.cache_clear()
+        converter = stream_converter(dict, namedtuple)
+        other_converter = stream_converter(dict, namedtuple)
+        records = [self.sample_dict] * 3 + [{'spam': 1}, self.sample_dict]
+        results = list(map(converter, records))
+        results.append(other_converter(self.sample_dict))
+
+        self.assertEqual(results[-1], self.sample_namedtuple)
+        self.assertEqual(results[3].spam, 1)
+        self.assertIs(type(results[0]), type(results[2]))
+        self.assertIs(type(results[0]), type(results[-1]))
+        self.assertIsNot(type(results[0]), type(results[3]))
+
+        # the records converted with the class of the previous record
+        # do not query the cache
+        info = stream_converter.schema_switch_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 2)
+
     def test_dict_to_tuple(self):
         converter = stream_converter(dict, tuple)
         result = converter(self.sample_dict)
@@ -140,5 +164,91 @@ class TestStreamConverter(TestCase):
         self.assertDictEqual(expected, result)
 
 
+class TestRecordConverter(TestCase):
+    def setUp(self) -> None:
+        self.sample_dict = {
+            'foo': 0,
+            'bar': 42
+        }
+        self.sample_record = stream_converter(dict, record)(self.sample_dict)
+
+    def test_record_access(self):
+        r = self.sample_record
+        self.assertIsInstance(r, record)
+        self.assertEqual(r.foo, 0)
+        self.assertEqual(r['bar'], 42)
+        self.assertIn('foo', r)
+        self.assertNotIn('spam', r)
+        self.assertListEqual(['foo', 'bar'], list(r))
+        self.assertEqual(2, len(r))
+        self.assertEqual('Record(foo=0, bar=42)', repr(r))
+        with self.assertRaises(KeyError):
+            _ = r['spam']
+        self.assertIsInstance(r, Mapping)
+        self.assertDictEqual({'foo': 0, 'bar': 42}, dict(r))
+        self.assertEqual(42, r.get('bar'))
+        self.assertIsNone(r.get('spam'))
+        self.assertEqual(-1, r.get('spam', -1))
+        self.assertListEqual(['foo', 'bar'], list(r.keys()))
+        self.assertListEqual([0, 42], list(r.values()))
+        self.assertListEqual([('foo', 0), ('bar', 42)], list(r.items()))
+        self.assertDictEqual({'foo': 0}, fextract(['foo'], r))
+        self.assertNotEqual(r, self.sample_dict)
+        with self.assertRaises(AttributeError):
+            r.spam = 1
+        r.foo = 1
+        self.assertEqual(r.foo, 1)
+
+    def test_compact(self):
+        self.assertLess(sys.getsizeof(self.sample_record) * 3,
+                        sys.getsizeof(self.sample_dict))
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.sample_record))
+        self.assertEqual(self.sample_record, result)
+        self.assertIs(type(self.sample_record), type(result))
+
+    def test_all_directions(self):
+        as_tuple = tuple(self.sample_dict.values())
+        keys = tuple(self.sample_dict.keys())
+        as_namedtuple = namedtuple('T', keys)(*as_tuple)
+        r = self.sample_record
+
+        self.assertEqual(r, stream_converter(tuple, record, keys)(as_tuple))
+        self.assertEqual(r, stream_converter(namedtuple, record)(
+            as_namedtuple))
+        self.assertIs(r, stream_converter(record, record)(r))
+        self.assertDictEqual(self.sample_dict,
+                             stream_converter(record, dict)(r))
+        self.assertTupleEqual(as_tuple, stream_converter(record, tuple)(r))
+        self.assertEqual(as_namedtuple,
+                         stream_converter(record, namedtuple)(r))
+
+    def test_schema_changes(self):
+        converter = stream_converter(dict, record, typename='Row')
+        r1, r2, r3 = map(converter, ({'a': 1}, {'b': 2}, {'a': 3}))
+        self.assertIs(type(r1), type(r3))
+        self.assertIsNot(type(r1), type(r2))
+        self.assertEqual('Row', type(r1).__name__)
+
+    def test_self_field(self):
+        r = stream_converter(dict, record)({'self': 1, 'other': 2})
+        self.assertEqual(r.self, 1)
+        self.assertDictEqual(r._asdict(), {'self': 1, 'other': 2})
+        r = stream_converter(tuple, record, ('self', 'other'))((1, 2))
+        self.assertEqual(r['self'], 1)
+        self.assertEqual(r._astuple(), (1, 2))
+
+    def test_invalid_fields(self):
+        converter = stream_converter(dict, record)
+        for data in ({'not valid': 1}, {'_private': 1}, {'class': 1},
+                     {1: 1}):
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    converter(data)
+        with self.assertRaises(ValueError):
+            stream_converter(tuple, record, ())
+
+
 if __name__ == '__main__':
     run_tests(verbosity=2)